@@ -7,10 +7,22 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+from src.ols import ajustar
+from src.data_loader import DataLoader
+from src.density import indices_amostra
+from src.histogram import Histograma
+from src.sql_source import FonteSQL, EXTENSOES_SQL
+
+# Linhas lidas do banco para a prévia e a escolha das colunas
+LINHAS_PREVIA_SQL = 1000
+
 
 def carregar_arquivo(arquivo):
     """
     Carrega arquivos em diferentes formatos.
+
+    Bancos SQL não são lidos inteiros: volta a ``FonteSQL`` da tabela
+    escolhida, consultada depois só com as colunas analisadas.
     """
     try:
         if arquivo.name.endswith(".csv"):
@@ -22,9 +34,15 @@ def carregar_arquivo(arquivo):
         elif arquivo.name.endswith(".json"):
             return pd.read_json(arquivo)
 
-        elif arquivo.name.endswith(".sql"):
-            st.warning("Arquivos SQL ainda não são suportados diretamente.")
-            return None
+        elif arquivo.name.endswith(EXTENSOES_SQL):
+            # Script .sql ou banco SQLite, aberto em memória
+            fonte = FonteSQL(arquivo)
+            tabelas = fonte.tabelas()
+            if not tabelas:
+                st.warning("O banco não tem tabelas.")
+                return None
+            fonte.tabela = st.selectbox("Tabela", tabelas) if len(tabelas) > 1 else tabelas[0]
+            return fonte
 
         else:
             st.error("Formato de arquivo não suportado.")
@@ -49,13 +67,20 @@ def main():
 
     arquivo = st.file_uploader(
         "Selecione o arquivo",
-        type=["xlsx", "csv", "sql", "json"]
+        type=["xlsx", "csv", "json", "sql", "db", "sqlite", "sqlite3"]
     )
 
     if arquivo:
-        df = carregar_arquivo(arquivo)
+        dados = carregar_arquivo(arquivo)
 
-        if df is None:
+        if dados is None:
+            return
+
+        sql = isinstance(dados, FonteSQL)
+        try:
+            df = dados.ler(limite=LINHAS_PREVIA_SQL) if sql else dados
+        except Exception as e:
+            st.error(f"Erro ao carregar arquivo: {e}")
             return
 
         st.subheader("📌 Prévia dos dados")
@@ -73,26 +98,43 @@ def main():
 
         if st.button("Gerar análise"):
 
-            x = df[col_x].dropna()
-            y = df[col_y].dropna()
+            if sql:
+                # Agregados calculados no banco; para os gráficos só X e Y são lidos
+                try:
+                    loader = DataLoader(dados)
+                    acumulador = loader.acumulador(col_x, col_y, exigir_dados=True)
+                    colunas = loader.carregar_colunas(col_x, col_y)
+                except ValueError as e:
+                    st.error(str(e))
+                    return
+                x, y = colunas["x"], colunas["y"]
+                resumo_x = acumulador.resumo("x")
+                pares = np.column_stack([x, y])
+            else:
+                x = df[col_x].dropna()
+                y = df[col_y].dropna()
+                resumo_x = {"media": x.mean(), "minimo": x.min(), "maximo": x.max()}
+                pares = df[[col_x, col_y]].dropna().to_numpy(dtype=float)
 
             # métricas
             st.subheader("📈 Estatísticas")
 
             col1, col2, col3 = st.columns(3)
 
-            col1.metric("Média X", f"{x.mean():.2f}")
-            col2.metric("Mín X", f"{x.min():.2f}")
-            col3.metric("Máx X", f"{x.max():.2f}")
+            col1.metric("Média X", f"{resumo_x['media']:.2f}")
+            col2.metric("Mín X", f"{resumo_x['minimo']:.2f}")
+            col3.metric("Máx X", f"{resumo_x['maximo']:.2f}")
 
-            # gráficos
+            # gráficos: amostra com no máximo MAX_PONTOS_PADRAO pontos (outliers preservados)
             st.subheader("📊 Gráficos")
 
+            amostra = pares[indices_amostra(pares[:, 0], pares[:, 1])]
+
             g1, g2, g3 = st.columns(3)
 
             # dispersão
             fig1, ax1 = plt.subplots()
-            ax1.scatter(x, y)
+            ax1.scatter(amostra[:, 0], amostra[:, 1], s=6)
             ax1.set_title("Dispersão")
             ax1.set_xlabel(col_x)
             ax1.set_ylabel(col_y)
@@ -100,13 +142,13 @@ def main():
 
             # histograma X
             fig2, ax2 = plt.subplots()
-            ax2.hist(x, bins=20)
+            ax2.stairs(*Histograma(x).contagens(20), fill=True)
             ax2.set_title(f"Histograma - {col_x}")
             g2.pyplot(fig2)
 
             # histograma Y
             fig3, ax3 = plt.subplots()
-            ax3.hist(y, bins=20)
+            ax3.stairs(*Histograma(y).contagens(20), fill=True)
             ax3.set_title(f"Histograma - {col_y}")
             g3.pyplot(fig3)
 
@@ -114,16 +156,20 @@ def main():
             st.subheader("📉 Regressão Linear")
 
             try:
-                coef = np.polyfit(x, y, 1)
-                poly1d_fn = np.poly1d(coef)
+                ajuste = acumulador.regressao_linear() if sql else ajustar(df[col_x], df[col_y])
+                b, a = ajuste["coeficiente"], ajuste["intercepto"]
 
                 fig4, ax4 = plt.subplots()
-                ax4.scatter(x, y)
-                ax4.plot(x, poly1d_fn(x))
+                x_linha = np.array([pares[:, 0].min(), pares[:, 0].max()])
+                ax4.scatter(amostra[:, 0], amostra[:, 1], s=6)
+                ax4.plot(x_linha, a + b * x_linha, color="red")
                 ax4.set_title("Regressão Linear")
                 st.pyplot(fig4)
 
-                st.success(f"Equação da reta: y = {coef[0]:.4f}x + {coef[1]:.4f}")
+                st.success(
+                    f"Equação da reta: y = {b:.4f}x + {a:.4f} "
+                    f"(±{ajuste['erro_padrao_coeficiente']:.4f}) | R²={ajuste['r2']:.4f}"
+                )
 
             except Exception as e:
                 st.error(f"Erro ao calcular regressão: {e}")
@@ -1,10 +1,21 @@
+import json
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
-from io import BytesIO
+
+from src.data_loader import DataLoader
+from src.cache import CacheDados
+from src.session import SessaoAnalise
+from src.screening import triagem_pares
+from src.grouping import analisar_grupos
+from src.density import indices_amostra, grade_densidade, MAX_PONTOS_PADRAO
+from src.histogram import Histograma
+from src.bootstrap import bootstrap
+from src.export import exportar, FORMATOS
+from src.profiling import Perfil, trace_chrome
 
 # =============================
 # CONFIG
@@ -45,60 +56,172 @@ arquivo = st.sidebar.file_uploader(
     "📂 Envie o arquivo",
     type=["xlsx", "xls", "csv", "json"]
 )
+perfil = Perfil(
+    ativo=st.sidebar.toggle("⏱️ Perfil de desempenho", help="Tempo, CPU, memória e linhas de cada etapa"),
+    rotulo=arquivo.name if arquivo else None
+)
 
 # =============================
 # FUNÇÕES
 # =============================
-def carregar_arquivo(file):
+@st.cache_resource
+def obter_cache():
+    """Cache em disco compartilhado entre reruns"""
+    return CacheDados()
+
+
+LINHAS_PREVIA = 1000
+
+
+def carregar_arquivo(file, linhas=LINHAS_PREVIA):
+    """Lê as primeiras linhas (prévia e lista de colunas) ou tudo com linhas=None"""
     try:
+        file.seek(0)
         if file.name.endswith(".csv"):
-            return pd.read_csv(file)
+            return pd.read_csv(file, nrows=linhas)
         elif file.name.endswith(".json"):
-            return pd.read_json(file)
+            df = pd.read_json(file)
+            return df if linhas is None else df.head(linhas)
         else:
-            return pd.read_excel(file)
+            return pd.read_excel(file, nrows=linhas)
     except Exception as e:
         st.error(f"Erro ao ler arquivo: {e}")
         return None
 
 
+def carregar_colunas(file, col_x, col_y):
+    """Lê em streaming somente as colunas X e Y selecionadas"""
+    try:
+        dados = DataLoader(file, cache=obter_cache()).carregar_colunas(col_x, col_y)
+    except Exception as e:
+        st.error(f"Erro ao ler arquivo: {e}")
+        return None, None
+
+    df = pd.DataFrame({col_x: dados["x"], col_y: dados["y"]})
+    if dados["owner"] is not None:
+        df["Owner"] = dados["owner"]
+    return df, dados["estatisticas"]
+
+
 def limpar_dados(df, col_x, col_y):
-    df = df[[col_x, col_y]].copy()
+    colunas = [col_x, col_y]
+    if "Owner" in df.columns and "Owner" not in colunas:
+        colunas.append("Owner")
+    df = df[colunas].copy()
 
     df = df.replace("Not Specified", np.nan)
 
     df[col_x] = pd.to_numeric(df[col_x], errors="coerce")
     df[col_y] = pd.to_numeric(df[col_y], errors="coerce")
 
-    df = df.dropna()
+    df = df.dropna(subset=[col_x, col_y])
     df = df[df[col_x] != 0]
 
     return df
 
 
-def calcular_estatisticas(col):
+def calcular_estatisticas(acumulador, coluna):
+    """Estatísticas de 'x', 'y' ou 'k'; a mediana vem do sketch de quantis"""
+    resumo = acumulador.resumo(coluna)
     return {
-        "Min": float(np.min(col)),
-        "Max": float(np.max(col)),
-        "Média": float(np.mean(col)),
-        "Mediana": float(np.median(col))
+        "Min": resumo["minimo"],
+        "Max": resumo["maximo"],
+        "Média": resumo["media"],
+        "Mediana": resumo["mediana"]
     }
 
 
-def gerar_pearson(df, col_x, col_y):
-    x = df[col_x]
-    y = df[col_y]
+@st.cache_resource(max_entries=32)
+def obter_histograma(_valores, arquivo_id, coluna, escala):
+    """
+    Pirâmide de contagens por (arquivo, coluna, escala): mudar bins ou
+    zoom não reprocessa os dados, só re-agrega as contagens.
+    """
+    return Histograma(_valores, escala=escala)
+
+
+MAX_LINHAS_BOOTSTRAP = 20_000  # acima disso, bootstrap m-de-n (resposta em poucos segundos)
+
+
+@st.cache_data(show_spinner="Calculando intervalos (bootstrap)...")
+def calcular_intervalos(_sessao, arquivo_id, replicas, metodo, loglog):
+    """Intervalos por (arquivo, colunas, réplicas, método, espaço); semente fixa"""
+    return bootstrap(
+        _sessao.x, _sessao.y,
+        replicas=replicas,
+        metodo=metodo,
+        loglog=loglog,
+        max_linhas=MAX_LINHAS_BOOTSTRAP
+    )
+
+
+def grafico_histograma(histograma, bins, intervalo):
+    """Barras a partir das contagens pré-agregadas (só elas vão ao navegador)"""
+    contagens, bordas = histograma.contagens(bins, intervalo)
+    if histograma.escala == "log":
+        bordas = np.log10(bordas)
+
+    fig = go.Figure(go.Bar(
+        x=(bordas[:-1] + bordas[1:]) / 2,
+        y=contagens,
+        width=np.diff(bordas),
+        marker_line_width=0
+    ))
+    fig.update_layout(bargap=0, yaxis_title="contagem")
+    return fig
+
 
-    mx = x.mean()
-    my = y.mean()
+def grafico_densidade(x, y, log=False):
+    """Mapa de calor com a contagem por célula (payload fixo, independe de n)"""
+    contagem, bordas_x, bordas_y = grade_densidade(x, y, log=log)
+    centros_x = (bordas_x[:-1] + bordas_x[1:]) / 2
+    centros_y = (bordas_y[:-1] + bordas_y[1:]) / 2
 
-    num = ((x - mx) * (y - my)).sum()
-    dx = ((x - mx) ** 2).sum()
-    dy = ((y - my) ** 2).sum()
+    # escala log de cores; células vazias ficam transparentes
+    with np.errstate(divide="ignore"):
+        z = np.where(contagem > 0, np.log10(contagem), np.nan)
 
-    r = num / np.sqrt(dx * dy)
+    fig = go.Figure(go.Heatmap(
+        x=centros_x, y=centros_y, z=z,
+        colorscale="Viridis",
+        colorbar=dict(title="log10(pontos)")
+    ))
+    return fig
 
-    return mx, my, num, dx, dy, r
+
+def arquivo_exportacao(file, df, col_x, col_y, colunas, formato):
+    """
+    Exportação em cache por (conteúdo do arquivo, X, Y, colunas, formato).
+    Só é gerada, em blocos, quando alguém pede o download.
+    """
+    cache = obter_cache()
+    chave = cache.chave(file, "exportacao", col_x, col_y, formato, *colunas)
+    return cache.obter_arquivo(
+        chave,
+        f"dados_tratados.{formato}",
+        lambda caminho: exportar(df, caminho, colunas=colunas)
+    )
+
+
+def mostrar_perfil(perfil):
+    """Tabela das etapas desta execução e download do trace (Chrome/Perfetto)"""
+    st.subheader("⏱️ Perfil de desempenho")
+    tabela = pd.DataFrame(perfil.registros)
+    st.dataframe(
+        tabela[["etapa", "segundos", "cpu_segundos", "pico_mb", "linhas_entrada", "linhas_saida"]],
+        use_container_width=True
+    )
+    st.download_button(
+        "📥 Baixar trace (chrome://tracing, Perfetto)",
+        data=json.dumps(trace_chrome(perfil.registros), ensure_ascii=False),
+        file_name="perfil.json",
+        mime="application/json"
+    )
+
+
+def gerar_pearson(acumulador):
+    """Termos da fórmula de Pearson a partir das estatísticas suficientes"""
+    return acumulador.termos_pearson()
 
 
 # =============================
@@ -106,7 +229,9 @@ def gerar_pearson(df, col_x, col_y):
 # =============================
 if arquivo:
 
-    df = carregar_arquivo(arquivo)
+    with perfil.etapa("previa") as etapa:
+        df = carregar_arquivo(arquivo)
+        etapa.linhas_saida = None if df is None else len(df)
 
     if df is None or df.empty:
         st.warning("Arquivo inválido ou vazio.")
@@ -116,6 +241,21 @@ if arquivo:
     st.subheader("📋 Prévia dos dados")
     st.dataframe(df.head(), use_container_width=True)
 
+    # TRIAGEM DE PARES
+    if st.sidebar.checkbox("🔎 Triagem de todos os pares"):
+        st.subheader("🔎 Triagem de pares (Pearson, linear e log-log)")
+        ordenar_por = st.selectbox("Ordenar por", ["pearson_abs", "r2", "r2_loglog"])
+        completo = carregar_arquivo(arquivo, linhas=None)
+
+        if completo is not None:
+            try:
+                ranking = triagem_pares(completo, ordenar_por=ordenar_por)
+                st.dataframe(ranking.head(50), use_container_width=True)
+            except ValueError as e:
+                st.warning(str(e))
+
+        st.divider()
+
     colunas = df.columns.tolist()
 
     col_x = st.sidebar.selectbox("Coluna X", colunas)
@@ -125,7 +265,28 @@ if arquivo:
         st.warning("Escolha colunas diferentes.")
         st.stop()
 
-    df = limpar_dados(df, col_x, col_y)
+    with perfil.etapa("carregar") as etapa:
+        df, leitura = carregar_colunas(arquivo, col_x, col_y)
+        etapa.linhas_saida = None if df is None else len(df)
+
+    if df is None:
+        st.stop()
+
+    cache_stats = obter_cache().estatisticas()
+    st.caption(
+        f"Leitura: {leitura.get('linhas_lidas', 0)} linhas lidas, "
+        f"{leitura.get('linhas_descartadas', 0)} descartadas, "
+        f"{leitura.get('bytes_processados', 0) / 1e6:.1f} MB processados"
+        f"{' (cache)' if leitura.get('cache') else ''} | "
+        f"cache: {cache_stats['acertos']} acertos, {cache_stats['falhas']} falhas"
+    )
+
+    if st.sidebar.button("🗑️ Limpar cache"):
+        obter_cache().purgar()
+
+    with perfil.etapa("limpar", linhas_entrada=len(df)) as etapa:
+        df = limpar_dados(df, col_x, col_y)
+        etapa.linhas_saida = len(df)
 
     if df.empty or len(df) < 2:
         st.warning("Dados insuficientes.")
@@ -138,16 +299,22 @@ if arquivo:
     # =============================
     st.subheader("📊 Estatísticas")
 
-    stats_x = calcular_estatisticas(df[col_x])
-    stats_y = calcular_estatisticas(df[col_y])
+    with perfil.etapa("estatisticas", linhas_entrada=len(df)) as etapa:
+        sessao = SessaoAnalise.de_dataframe(df, col_x, col_y)
+        acumulador = sessao.acumulador
 
-    df["k"] = df[col_y] / df[col_x]
+        stats_x = calcular_estatisticas(acumulador, "x")
+        stats_y = calcular_estatisticas(acumulador, "y")
+        stats_k = calcular_estatisticas(acumulador, "k")
 
-    k_min = df["k"].min()
-    k_max = df["k"].max()
-    k_med = df["k"].median()
+        df["k"] = df[col_y] / df[col_x]
+        etapa.linhas_saida = len(sessao)
 
-    pearson = df[col_x].corr(df[col_y])
+    k_min = stats_k["Min"]
+    k_max = stats_k["Max"]
+    k_med = stats_k["Mediana"]
+
+    pearson = acumulador.pearson()
 
     c1, c2, c3 = st.columns(3)
 
@@ -172,12 +339,23 @@ if arquivo:
 
     st.divider()
 
+    # =============================
+    # ANÁLISE POR OWNER
+    # =============================
+    if "Owner" in df.columns and st.sidebar.checkbox("👥 Análise por Owner"):
+        st.subheader("👥 Análise por Owner")
+        with perfil.etapa("grupos", linhas_entrada=len(df)) as etapa:
+            grupos = analisar_grupos(df, col_x, col_y)
+            etapa.linhas_saida = len(grupos)
+        st.dataframe(grupos, use_container_width=True)
+        st.divider()
+
     # =============================
     # PEARSON DETALHADO
     # =============================
     st.subheader("📐 Equação de Pearson")
 
-    mx, my, num, dx, dy, r = gerar_pearson(df, col_x, col_y)
+    mx, my, num, dx, dy, r = gerar_pearson(acumulador)
 
     st.latex(r"""
     r = \frac{\sum (X - \bar{X})(Y - \bar{Y})}
@@ -198,78 +376,177 @@ if arquivo:
     # =============================
     # REGRESSÃO
     # =============================
-    X = df[[col_x]].values
-    y = df[col_y].values
+    # Ajustes por fórmula fechada a partir do mesmo acumulador
+    with perfil.etapa("regressoes", linhas_entrada=len(df)) as etapa:
+        linear = acumulador.regressao_linear()
 
-    modelo = LinearRegression()
-    modelo.fit(X, y)
+        r2 = linear["r2"]
+        a = linear["intercepto"]
+        b = linear["coeficiente"]
 
-    y_pred = modelo.predict(X)
-    r2 = modelo.score(X, y)
+        df_log = df[(df[col_x] > 0) & (df[col_y] > 0)]
 
-    a = modelo.intercept_
-    b = modelo.coef_[0]
+        tem_loglog = len(df_log) >= 2
 
-    df_log = df[(df[col_x] > 0) & (df[col_y] > 0)]
+        if tem_loglog:
+            loglog = acumulador.regressao_loglog()
 
-    if len(df_log) >= 2:
-        log_x = np.log10(df_log[col_x].values.reshape(-1, 1))
-        log_y = np.log10(df_log[col_y].values)
+            r2_log = loglog["r2"]
 
-        modelo_log = LinearRegression()
-        modelo_log.fit(log_x, log_y)
-
-        r2_log = modelo_log.score(log_x, log_y)
-
-        alpha = modelo_log.intercept_
-        beta = modelo_log.coef_[0]
-    else:
-        log_x = None
+            alpha = loglog["intercepto"]
+            beta = loglog["coeficiente"]
+        etapa.linhas_saida = len(df_log)
 
     # =============================
     # GRÁFICOS
     # =============================
     st.subheader("📊 Gráficos")
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        fig1 = px.scatter(df, x=col_x, y=col_y)
-        fig1.add_trace(go.Scatter(x=df[col_x], y=y_pred, mode="lines"))
-
-        fig1.update_layout(title=f"y = {a:.4f} + {b:.4f}x | R²={r2:.4f}")
-        st.plotly_chart(fig1, use_container_width=True)
+    modo_grafico = st.sidebar.radio("Pontos nos gráficos", ["Amostra", "Densidade"])
+    max_pontos = st.sidebar.number_input(
+        "Máximo de pontos (amostra)", min_value=1000, value=MAX_PONTOS_PADRAO, step=5000
+    )
 
-    with col2:
-        if log_x is not None:
-            fig2 = px.scatter(x=df_log[col_x], y=df_log[col_y], log_x=True, log_y=True)
+    # Apenas a amostra (ou a grade) vai para o navegador; as retas usam o
+    # ajuste com todos os dados e só precisam dos extremos de x
+    x_linha = np.array([acumulador.minimo["x"], acumulador.maximo["x"]])
+
+    with perfil.etapa("graficos", linhas_entrada=len(df)):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if modo_grafico == "Densidade":
+                fig1 = grafico_densidade(df[col_x].to_numpy(), df[col_y].to_numpy())
+                fig1.update_layout(xaxis_title=col_x, yaxis_title=col_y)
+            else:
+                amostra = df.iloc[indices_amostra(df[col_x].to_numpy(), df[col_y].to_numpy(), max_pontos)]
+                fig1 = px.scatter(amostra, x=col_x, y=col_y, opacity=0.6)
+
+            fig1.add_trace(go.Scatter(x=x_linha, y=a + b * x_linha, mode="lines", name="ajuste"))
+
+            fig1.update_layout(title=f"y = {a:.4f} + {b:.4f}x | R²={r2:.4f}")
+            if len(df) > max_pontos and modo_grafico == "Amostra":
+                st.caption(f"Exibindo {len(amostra)} de {len(df)} pontos (outliers preservados)")
+            st.plotly_chart(fig1, use_container_width=True)
+
+        with col2:
+            if tem_loglog:
+                x_log = df_log[col_x].to_numpy()
+                y_log = df_log[col_y].to_numpy()
+                x_sorted = np.array([x_log.min(), x_log.max()])
+
+                if modo_grafico == "Densidade":
+                    fig2 = grafico_densidade(x_log, y_log, log=True)
+                    fig2.update_layout(xaxis_title=f"log10({col_x})", yaxis_title=f"log10({col_y})")
+                    fig2.add_trace(go.Scatter(
+                        x=np.log10(x_sorted), y=alpha + beta * np.log10(x_sorted), mode="lines", name="ajuste"
+                    ))
+                else:
+                    indices = indices_amostra(x_log, y_log, max_pontos, log=True)
+                    fig2 = px.scatter(x=x_log[indices], y=y_log[indices], log_x=True, log_y=True, opacity=0.6)
+
+                    y_line = 10 ** (alpha + beta * np.log10(x_sorted))
+                    fig2.add_trace(go.Scatter(x=x_sorted, y=y_line, mode="lines", name="ajuste"))
+
+                fig2.update_layout(
+                    title=f"log10(y) = {alpha:.4f} + {beta:.4f}log10(x) | R²={r2_log:.4f}"
+                )
+
+                st.plotly_chart(fig2, use_container_width=True)
+            else:
+                st.warning("Sem dados positivos suficientes para log-log")
+
+    # INTERVALOS DE CONFIANÇA
+    if st.sidebar.checkbox("📏 Intervalos de confiança (bootstrap)"):
+        st.subheader("📏 Intervalos de confiança 95% (bootstrap)")
+
+        b1, b2 = st.columns(2)
+        replicas = b1.select_slider("Réplicas", [200, 500, 1000, 2000, 5000], value=1000)
+        metodo = b2.radio("Método", ["bca", "percentil"], horizontal=True)
+
+        arquivo_id = (arquivo.name, arquivo.size, col_x, col_y)
+        linhas_ic = []
+        for espaco, loglog in (("Linear", False), ("Log-log", True)):
+            if loglog and not tem_loglog:
+                continue
+            with perfil.etapa(f"bootstrap_{'loglog' if loglog else 'linear'}", linhas_entrada=len(sessao)):
+                ic = calcular_intervalos(sessao, arquivo_id, replicas, metodo, loglog)
+            for nome, rotulo in (("coeficiente", "expoente β" if loglog else "coeficiente b"),
+                                 ("intercepto", "intercepto α" if loglog else "intercepto a"),
+                                 ("pearson", "Pearson r")):
+                linhas_ic.append({
+                    "Modelo": espaco,
+                    "Estatística": rotulo,
+                    "Estimativa": ic[nome]["estimativa"],
+                    "Inferior": ic[nome]["inferior"],
+                    "Superior": ic[nome]["superior"],
+                    "Erro padrão": ic[nome]["erro_padrao"]
+                })
+
+        st.dataframe(pd.DataFrame(linhas_ic), use_container_width=True)
+        if ic["m"] < ic["n"]:
+            st.caption(f"Bootstrap m-de-n: {ic['m']} de {ic['n']} pares por réplica, reescalado por √(m/n)")
+        st.divider()
 
-            x_sorted = np.sort(df_log[col_x])
-            y_line = 10 ** (alpha + beta * np.log10(x_sorted))
+    # HISTOGRAMA
+    st.subheader("📉 Distribuições")
 
-            fig2.add_trace(go.Scatter(x=x_sorted, y=y_line, mode="lines"))
+    h1, h2, h3 = st.columns(3)
+    variavel = h1.selectbox("Variável", ["k", col_x, col_y])
+    escala = h2.radio("Bins", ["log", "linear"], horizontal=True)
+    bins = h3.slider("Número de bins", 5, 200, 30)
 
-            fig2.update_layout(
-                title=f"log10(y) = {alpha:.4f} + {beta:.4f}log10(x) | R²={r2_log:.4f}"
+    arquivo_id = (arquivo.name, arquivo.size, col_x, col_y)
+    try:
+        with perfil.etapa("histograma", linhas_entrada=len(df)):
+            histograma = obter_histograma(df[variavel].to_numpy(), arquivo_id, variavel, escala)
+    except ValueError as e:
+        st.warning(str(e))
+    else:
+        minimo, maximo = histograma.limites()
+        if escala == "log":
+            zoom = st.slider(
+                f"Zoom log10({variavel})",
+                float(np.log10(minimo)), float(np.log10(maximo)),
+                (float(np.log10(minimo)), float(np.log10(maximo)))
             )
-
-            st.plotly_chart(fig2, use_container_width=True)
+            intervalo = (10 ** zoom[0], 10 ** zoom[1])
+            titulo_x = f"log10({variavel})"
         else:
-            st.warning("Sem dados positivos suficientes para log-log")
+            intervalo = st.slider(f"Zoom {variavel}", float(minimo), float(maximo), (float(minimo), float(maximo)))
+            titulo_x = variavel
 
-    # HISTOGRAMA
-    st.subheader("📉 Distribuição de k")
-    fig4 = px.histogram(df, x="k", nbins=30)
-    st.plotly_chart(fig4, use_container_width=True)
+        try:
+            fig4 = grafico_histograma(histograma, bins, intervalo)
+            fig4.update_layout(xaxis_title=titulo_x)
+            st.plotly_chart(fig4, use_container_width=True)
+        except ValueError as e:
+            st.warning(str(e))
+
+        if histograma.descartados:
+            st.caption(f"{histograma.descartados} valores fora da escala ({'<= 0' if escala == 'log' else 'não finitos'}) ignorados")
 
     # EXPORTAÇÃO
     st.subheader("💾 Exportar dados")
 
-    buffer = BytesIO()
-    df.to_excel(buffer, index=False)
-
-    st.download_button(
-        "📥 Baixar Excel Completo",
-        data=buffer.getvalue(),
-        file_name="dados_tratados.xlsx"
-    )
+    e1, e2 = st.columns([3, 1])
+    colunas_exportar = e1.multiselect("Colunas", df.columns.tolist(), default=df.columns.tolist())
+    formato = e2.selectbox("Formato", list(FORMATOS), help="CSV.gz e Parquet são bem mais rápidos que Excel")
+
+    def baixar():
+        # Executado só no clique (fora do rerun); o arquivo fica em cache e
+        # é entregue aberto, pelo caminho, sem uma cópia em bytes aqui
+        return open(arquivo_exportacao(arquivo, df, col_x, col_y, colunas_exportar, formato), "rb")
+
+    if colunas_exportar:
+        st.download_button(
+            f"📥 Baixar dados tratados ({formato})",
+            data=baixar,
+            file_name=f"dados_tratados.{formato}",
+            mime=FORMATOS[formato],
+            on_click="ignore"
+        )
+
+    if perfil:
+        st.divider()
+        mostrar_perfil(perfil)
@@ -0,0 +1,70 @@
+"""
+Atualização incremental de um modelo salvo via terminal.
+Lê só as linhas novas (em blocos), combina as estatísticas delas com as
+guardadas no artefato JSON e grava o modelo atualizado, pronto para a
+próxima execução.
+
+Exemplo:
+    python atualizar.py modelos/vendas_loglog.json novos_do_dia.csv --esquecimento 0.99
+    python atualizar.py modelos/vendas_loglog.json vendas.sqlite \
+        --consulta "SELECT * FROM pedidos WHERE data = date('now')"
+
+Em bancos SQL as estatísticas das linhas novas são calculadas no próprio
+banco (agregados), sem trazer as linhas.
+"""
+
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from src.data_loader import DataLoader, TAMANHO_CHUNK_PADRAO
+from src.models import _ModeloSerializavel
+from src.sql_source import FonteSQL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza um modelo salvo com dados novos.")
+    parser.add_argument("modelo", help="Artefato JSON do modelo (gerado com --salvar-modelos)")
+    parser.add_argument("entrada", help="Arquivo com as linhas novas (CSV, JSON, XLS, XLSX ou SQLite)")
+    parser.add_argument("--tabela", help="Tabela lida quando a entrada é um banco SQLite")
+    parser.add_argument("--consulta", help="SELECT com as linhas novas quando a entrada é um banco SQLite")
+    parser.add_argument(
+        "--esquecimento",
+        type=float,
+        default=1.0,
+        help="Peso mantido pelo histórico nesta atualização (padrão: 1.0, sem esquecimento)"
+    )
+    parser.add_argument("--saida", help="Destino do modelo atualizado (padrão: sobrescreve o modelo)")
+    parser.add_argument("--chunk", type=int, default=TAMANHO_CHUNK_PADRAO, help="Linhas por bloco")
+    args = parser.parse_args()
+
+    try:
+        modelo = _ModeloSerializavel.carregar(args.modelo)
+        if not hasattr(modelo, "atualizar"):
+            raise ValueError(f"Modelo do tipo '{modelo.TIPO}' não suporta atualização incremental.")
+
+        fonte = args.entrada
+        if args.tabela or args.consulta:
+            fonte = FonteSQL(args.entrada, tabela=args.tabela, consulta=args.consulta)
+        loader = DataLoader(fonte)
+        novos = loader.acumulador(modelo.col_x, modelo.col_y, tamanho_chunk=args.chunk)
+
+        anterior = modelo.metricas
+        atual = modelo.atualizar(novos, esquecimento=args.esquecimento)
+        modelo.salvar(args.saida or args.modelo)
+    except (ValueError, OSError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Linhas novas: {novos.n} (descartadas: {loader.estatisticas_leitura['linhas_descartadas']})")
+    print(f"Coeficiente: {anterior['coeficiente']:.6g} -> {atual['coeficiente']:.6g}")
+    print(f"Intercepto: {anterior['intercepto']:.6g} -> {atual['intercepto']:.6g}")
+    print(f"R²: {anterior['r2']:.4f} -> {atual['r2']:.4f} (n efetivo: {atual['n']})")
+    print(f"Modelo salvo em {args.saida or args.modelo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Execução em lote via terminal.
+Analisa em paralelo todos os arquivos de um diretório ou padrão glob.
+
+Exemplo:
+    python batch.py "Data/mensal/*.xlsx" --x Volume --y Custo --processos 8
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from src.batch import analisar_lote, listar_arquivos
+
+
+def _formatar_ajuste(ajuste):
+    if ajuste is None:
+        return "-"
+    return f"coef={ajuste['coeficiente']:.4f} intercepto={ajuste['intercepto']:.4f} R²={ajuste['r2']:.4f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise em lote de vários arquivos.")
+    parser.add_argument("entrada", help="Diretório ou padrão glob (ex.: 'dados/*.xlsx')")
+    parser.add_argument("--x", required=True, help="Coluna X")
+    parser.add_argument("--y", required=True, help="Coluna Y")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: núcleos)")
+    parser.add_argument("--saida", help="Grava o resultado completo em JSON")
+    args = parser.parse_args()
+
+    arquivos = listar_arquivos(args.entrada)
+    if not arquivos:
+        print("Nenhum arquivo encontrado.")
+        return
+
+    print(f"=== Analisando {len(arquivos)} arquivos ===")
+    resultado = analisar_lote(arquivos, args.x, args.y, processos=args.processos)
+
+    for item in resultado["arquivos"]:
+        nome = os.path.basename(item["arquivo"])
+        if "erro" in item:
+            print(f"\n{nome}: ERRO - {item['erro']}")
+            continue
+        print(f"\n{nome}: {item['quantidade']} registros | Pearson={item['pearson']:.4f}")
+        print("  Linear: ", _formatar_ajuste(item["regressao_linear"]))
+        print("  Log-Log:", _formatar_ajuste(item["regressao_loglog"]))
+
+    total = resultado["global"]
+    print("\n=== Global ===")
+    print("Registros:", total["quantidade"])
+    print("X:", total["x"])
+    print("Y:", total["y"])
+    print("Pearson:", total["pearson"])
+    print("Linear: ", _formatar_ajuste(total["regressao_linear"]))
+    print("Log-Log:", _formatar_ajuste(total["regressao_loglog"]))
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Orçamento de tempo de inicialização do CLI (main.py --stats-only).
+
+Executa ``main.py --stats-only`` em um processo novo sobre um CSV
+sintético pequeno, mede o tempo total (melhor de N execuções) e verifica
+que tkinter, matplotlib e sklearn não foram importados. Sai com código
+1 se o orçamento for estourado, para ser usado como verificação de
+regressão.
+
+Uso:
+    python benchmarks/bench_import.py --orcamento 1.0
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ORCAMENTO_SEGUNDOS = 1.0
+MODULOS_PESADOS = ("tkinter", "matplotlib", "sklearn")
+
+# Executado no processo filho: roda o CLI e informa os módulos pesados carregados
+SCRIPT_FILHO = """
+import json, sys
+sys.path.insert(0, {base!r})
+import main
+main.main({argv!r})
+pesados = sorted(m for m in {pesados!r} if m in sys.modules)
+print("@@" + json.dumps(pesados))
+"""
+
+
+def medir(caminho_csv):
+    argv = [caminho_csv, "--x", "X", "--y", "Y", "--stats-only"]
+    codigo = SCRIPT_FILHO.format(base=BASE_DIR, argv=argv, pesados=MODULOS_PESADOS)
+
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BASE_DIR
+    ).stdout
+    duracao = time.perf_counter() - inicio
+
+    linha = next(l for l in saida.splitlines() if l.startswith("@@"))
+    return duracao, json.loads(linha[2:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_SEGUNDOS)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "dados.csv")
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write("X,Y\n")
+            f.writelines(f"{i + 1},{2 * i + 3}\n" for i in range(1000))
+
+        tempos = []
+        for _ in range(args.repeticoes):
+            duracao, pesados = medir(caminho)
+            tempos.append(duracao)
+
+    melhor = min(tempos)
+    print(f"main.py --stats-only: {melhor:.3f}s (orçamento {args.orcamento:.3f}s)")
+    print("módulos pesados importados:", pesados or "nenhum")
+
+    if pesados or melhor > args.orcamento:
+        print("FALHA: orçamento de inicialização estourado.")
+        sys.exit(1)
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
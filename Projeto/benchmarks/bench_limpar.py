@@ -0,0 +1,85 @@
+"""
+Benchmark de DataLoader.limpar: implementação antiga (applymap + replace
+sobre o DataFrame inteiro) contra a limpeza vetorizada por coluna.
+
+Uso:
+    python benchmarks/bench_limpar.py --linhas 200000 --colunas 80
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from src.data_loader import DataLoader, VALORES_INVALIDOS
+
+
+def limpar_antigo(df, col_x, col_y):
+    """Versão original de DataLoader.limpar (referência)"""
+    df = df.copy()
+    aplicar = df.map if hasattr(df, "map") else df.applymap  # applymap saiu no pandas 3
+    df = aplicar(lambda x: x.strip() if isinstance(x, str) else x)
+    df.replace(VALORES_INVALIDOS, np.nan, inplace=True)
+    df[col_x] = pd.to_numeric(df[col_x], errors='coerce')
+    df[col_y] = pd.to_numeric(df[col_y], errors='coerce')
+    df.dropna(subset=[col_x, col_y], inplace=True)
+    return df
+
+
+def gerar_planilha_larga(linhas, colunas, semente=42):
+    """Planilha com X/Y em texto, tokens inválidos e muitas colunas extras"""
+    rng = np.random.default_rng(semente)
+
+    x = rng.lognormal(3, 1, linhas)
+    y = 2.5 * x ** 0.8 * rng.lognormal(0, 0.2, linhas)
+
+    x_txt = np.char.add(" ", x.round(4).astype(str)).astype(object)
+    x_txt[rng.random(linhas) < 0.05] = "Not Specified"
+    y_txt = y.round(4).astype(str).astype(object)
+    y_txt[rng.random(linhas) < 0.05] = "N/A"
+
+    dados = {"X": x_txt, "Y": y_txt, "Owner": rng.choice(["a ", "b", " c"], linhas)}
+    for i in range(colunas - 3):
+        if i % 2:
+            dados[f"extra_{i}"] = rng.choice(["foo", " bar ", "N/A"], linhas)
+        else:
+            dados[f"extra_{i}"] = rng.random(linhas)
+
+    return pd.DataFrame(dados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=200_000)
+    parser.add_argument("--colunas", type=int, default=80)
+    args = parser.parse_args()
+
+    df = gerar_planilha_larga(args.linhas, args.colunas)
+
+    inicio = time.perf_counter()
+    antigo = limpar_antigo(df, "X", "Y")
+    t_antigo = time.perf_counter() - inicio
+
+    loader = DataLoader(None)
+    loader.df = df
+    inicio = time.perf_counter()
+    novo = loader.limpar("X", "Y")
+    t_novo = time.perf_counter() - inicio
+
+    assert len(antigo) == len(novo)
+    assert np.allclose(antigo["X"].to_numpy(), novo["X"].to_numpy())
+
+    print(f"{args.linhas} linhas x {args.colunas} colunas")
+    print(f"antigo: {t_antigo:.3f}s")
+    print(f"novo:   {t_novo:.3f}s")
+    print(f"ganho:  {t_antigo / t_novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Pico de memória da análise completa: fluxo antigo (cópias do DataFrame
+no analisador e no visualizador, ``dropna`` por método, arrays
+reconvertidos em cada modelo) contra a ``SessaoAnalise`` compartilhada.
+
+Parte de um DataFrame já limpo com X e Y float64 e mede, com
+``tracemalloc``, o pico alocado por estatísticas, razão k, Pearson,
+regressões linear e log-log e o preparo dos dados do gráfico, como
+múltiplo do tamanho dos dados (16 bytes por linha).
+
+Uso:
+    python benchmarks/bench_memoria.py --linhas 5000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from src.analyzer import UEVAnalyzer
+from src.models import RegressionModel, LogLogRegressionModel
+from src.ols import ajustar, ajustar_loglog
+from src.session import SessaoAnalise
+
+
+def analise_antiga(df, col_x, col_y):
+    """Versão original: cada componente copia e filtra os dados (referência)"""
+    # UEVAnalyzer.__init__
+    dados = df.copy()
+
+    for col in [col_x, col_y]:
+        serie = dados[col].dropna()
+        serie.count(), serie.min(), serie.max(), serie.mean(), serie.median()
+
+    validos = dados[[col_x, col_y]].dropna()
+    validos[col_x].corr(validos[col_y])
+
+    k = dados[[col_x, col_y]].dropna().copy()
+    k = k[k[col_x] != 0]
+    k["k"] = k[col_y] / k[col_x]
+    k["k"].min(), k["k"].max(), k["k"].median()
+    del k, validos
+
+    # Modelos
+    ajustar(df[[col_x]].values.ravel(), df[col_y].values)
+    ajustar_loglog(df[col_x].values, df[col_y].values)
+
+    # Visualizer.__init__ + preparo do gráfico
+    dados_graf = df.copy()
+    x = dados_graf[col_x].values
+    y = dados_graf[col_y].values
+    ordem = np.argsort(x)
+    x[ordem], y[ordem]
+    mascara = (x > 0) & (y > 0)
+    log_x, log_y = np.log10(x[mascara]), np.log10(y[mascara])
+    np.argsort(log_x)
+
+
+def analise_sessao(df, col_x, col_y):
+    sessao = SessaoAnalise.de_dataframe(df, col_x, col_y)
+
+    analyzer = UEVAnalyzer(sessao, col_x, col_y)
+    analyzer.resumo_estatistico(col_x)
+    analyzer.resumo_estatistico(col_y)
+    analyzer.correlacao()
+    analyzer.calcular_razao_k()
+
+    RegressionModel(sessao, col_x, col_y).treinar()
+    LogLogRegressionModel(sessao, col_x, col_y).treinar()
+
+    # Dados que o Visualizer usa (sem desenhar)
+    sessao.log_x, sessao.log_y
+    return sessao
+
+
+def medir(funcao, df):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao(df, "X", "Y")
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=5_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    x = rng.lognormal(3, 1, args.linhas)
+    df = pd.DataFrame({"X": x, "Y": 2.5 * x ** 0.8 * rng.lognormal(0, 0.2, args.linhas)})
+    tamanho = args.linhas * 16
+
+    print(f"Dados: {args.linhas} linhas, {tamanho / 1e6:.0f} MB (X e Y float64)")
+    for nome, funcao in (("antigo", analise_antiga), ("sessão", analise_sessao)):
+        duracao, pico = medir(funcao, df)
+        print(f"{nome:>7}: pico {pico / 1e6:8.1f} MB ({pico / tamanho:.2f}x dos dados) | {duracao:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Suíte de benchmarks do fluxo completo com dados sintéticos.
+
+Para cada tamanho (10³ a 10⁷ linhas) e layout (estreito: X, Y e Owner;
+largo: mais colunas extras), gera um CSV determinístico com lei de
+potência, tokens inválidos e zeros (benchmarks/sinteticos.py) e mede
+cada etapa: carregar (parse do CSV), limpar, estatísticas (sessão +
+UEVAnalyzer), regressões linear e log-log e o gráfico do Visualizer.
+
+Para cada etapa registra o melhor tempo de ``--repeticoes`` execuções,
+o pico de memória alocado (tracemalloc, em uma execução à parte para
+não distorcer o tempo) e as linhas de entrada e saída. O resultado vai
+para um JSON; com ``--base`` ele é comparado a uma execução anterior e
+etapas mais lentas ou com mais memória que a tolerância são apontadas
+(código de saída 1).
+
+Uso:
+    python benchmarks/bench_pipeline.py --saida base.json
+    python benchmarks/bench_pipeline.py --base base.json --saida atual.json
+    python benchmarks/bench_pipeline.py --linhas 10000000 --layouts estreito
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")  # sem display
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from sinteticos import arquivo_csv
+from src.analyzer import UEVAnalyzer
+from src.data_loader import DataLoader
+from src.models import RegressionModel, LogLogRegressionModel
+from src.session import SessaoAnalise
+from src.visualizer import Visualizer
+
+
+LINHAS_PADRAO = [1_000, 10_000, 100_000, 1_000_000]
+LAYOUTS = {"estreito": 0, "largo": 50}
+ETAPAS = ("carregar", "limpar", "estatisticas", "regressao_linear", "regressao_loglog", "plotar")
+
+# Acima disso cada etapa roda uma vez só
+LINHAS_REPETICAO_UNICA = 1_000_000
+
+# Diferenças de tempo abaixo disso são ruído de medição
+MINIMO_SEGUNDOS = 0.005
+
+
+def medir(funcao, repeticoes):
+    """Melhor tempo de ``repeticoes`` execuções e pico de memória de uma"""
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+        del resultado
+
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return resultado, min(tempos), pico
+
+
+def executar(caminho, repeticoes):
+    """Mede cada etapa do fluxo; devolve {etapa: medidas}"""
+    medidas = {}
+
+    def etapa(nome, funcao, linhas_entrada, linhas_saida):
+        resultado, segundos, pico = medir(funcao, repeticoes)
+        medidas[nome] = {
+            "segundos": segundos,
+            "pico_mb": pico / 1e6,
+            "linhas_entrada": linhas_entrada,
+            "linhas_saida": linhas_saida(resultado)
+        }
+        return resultado
+
+    bruto = etapa("carregar", lambda: DataLoader(caminho).carregar(), None, len)
+
+    def limpar():
+        loader = DataLoader(None)
+        loader.df = bruto
+        return loader.limpar("X", "Y")
+
+    limpo = etapa("limpar", limpar, len(bruto), len)
+
+    def estatisticas():
+        # Sessão nova a cada execução: nada vem de cache
+        sessao = SessaoAnalise.de_dataframe(limpo, "X", "Y")
+        analyzer = UEVAnalyzer(sessao, "X", "Y")
+        analyzer.resumo_estatistico("X")
+        analyzer.resumo_estatistico("Y")
+        analyzer.correlacao()
+        analyzer.calcular_razao_k()
+        return sessao
+
+    etapa("estatisticas", estatisticas, len(limpo), len)
+
+    etapa(
+        "regressao_linear",
+        lambda: RegressionModel(limpo, "X", "Y").treinar(),
+        len(limpo),
+        lambda metricas: metricas["n"]
+    )
+
+    # O log-log exige dados positivos: os zeros saem antes da medida
+    positivos = limpo[(limpo["X"] > 0) & (limpo["Y"] > 0)]
+    etapa(
+        "regressao_loglog",
+        lambda: LogLogRegressionModel(positivos, "X", "Y").treinar(),
+        len(positivos),
+        lambda metricas: metricas["n"]
+    )
+
+    etapa(
+        "plotar",
+        lambda: Visualizer(limpo, "X", "Y").plotar(salvar=False, mostrar=False),
+        len(limpo),
+        lambda _: len(limpo)
+    )
+
+    return medidas
+
+
+def comparar(atual, base, tolerancia):
+    """Etapas em que tempo ou memória pioraram mais que ``tolerancia``"""
+    anteriores = {(r["linhas"], r["layout"], r["etapa"]): r for r in base["resultados"]}
+    regressoes = []
+
+    for r in atual["resultados"]:
+        anterior = anteriores.get((r["linhas"], r["layout"], r["etapa"]))
+        if anterior is None:
+            continue
+
+        for medida, minimo in (("segundos", MINIMO_SEGUNDOS), ("pico_mb", 0.1)):
+            if r[medida] > anterior[medida] * (1 + tolerancia) and r[medida] - anterior[medida] > minimo:
+                regressoes.append({
+                    "linhas": r["linhas"],
+                    "layout": r["layout"],
+                    "etapa": r["etapa"],
+                    "medida": medida,
+                    "base": anterior[medida],
+                    "atual": r[medida],
+                    "razao": r[medida] / anterior[medida] if anterior[medida] else float("inf")
+                })
+
+    return regressoes
+
+
+def ambiente():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO)
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument(
+        "--pasta-dados",
+        default=os.path.join(tempfile.gettempdir(), "sistema_analise_bench"),
+        help="Onde os CSV sintéticos são gerados (e reaproveitados)"
+    )
+    parser.add_argument("--saida", help="Grava os resultados em JSON")
+    parser.add_argument("--base", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    resultado = {"ambiente": ambiente(), "semente": args.semente, "resultados": []}
+
+    print(f"{'linhas':>9} {'layout':>8} {'etapa':>17} | {'tempo':>9} | {'pico':>9} | entrada -> saída")
+    for linhas in args.linhas:
+        for layout in args.layouts:
+            caminho = arquivo_csv(args.pasta_dados, linhas, args.semente, colunas_extras=LAYOUTS[layout])
+            repeticoes = args.repeticoes if linhas < LINHAS_REPETICAO_UNICA else 1
+
+            for nome, m in executar(caminho, repeticoes).items():
+                resultado["resultados"].append({"linhas": linhas, "layout": layout, "etapa": nome, **m})
+                print(
+                    f"{linhas:>9} {layout:>8} {nome:>17} | {m['segundos']:8.3f}s | {m['pico_mb']:6.1f} MB | "
+                    f"{m['linhas_entrada'] if m['linhas_entrada'] is not None else '-'} -> {m['linhas_saida']}"
+                )
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados salvos em {args.saida}")
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if not regressoes:
+            print(f"\nSem regressões em relação a {args.base} (tolerância {args.tolerancia:.0%}).")
+            return 0
+
+        print(f"\nRegressões em relação a {args.base}:")
+        for r in regressoes:
+            print(
+                f"  {r['linhas']} {r['layout']} {r['etapa']}: {r['medida']} "
+                f"{r['base']:.4g} -> {r['atual']:.4g} ({r['razao']:.2f}x)"
+            )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
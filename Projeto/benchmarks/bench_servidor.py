@@ -0,0 +1,131 @@
+"""
+Teste de carga do servidor de previsão (src/server.py).
+
+Abre ``--conexoes`` clientes keep-alive que enviam requisições em
+sequência e mede latência (p50/p95/p99) e vazão do lado do cliente,
+além das métricas do próprio servidor. Sem ``--url``, sobe um servidor
+local em uma porta livre com um modelo sintético; ``--lote 1`` desliga
+o agrupamento para comparação.
+
+Uso:
+    python benchmarks/bench_servidor.py --conexoes 64 --requisicoes 20000
+    python benchmarks/bench_servidor.py --url 127.0.0.1:8000 --modelo vendas_loglog
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from src.models import LogLogRegressionModel
+from src.server import ServidorPrevisao, TAMANHO_LOTE_PADRAO, ESPERA_MAXIMA_PADRAO
+
+
+def modelo_sintetico():
+    modelo = LogLogRegressionModel(None, "X", "Y")
+    modelo.metricas = {"coeficiente": 0.8, "intercepto": 0.4, "r2": 0.9}
+    return modelo
+
+
+async def _requisicao(reader, writer, host, caminho, corpo):
+    writer.write(
+        f"POST {caminho} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b""):
+            break
+        if linha.lower().startswith(b"content-length:"):
+            tamanho = int(linha.split(b":")[1])
+    await reader.readexactly(tamanho)
+    return status
+
+
+async def _cliente(host, porta, caminho, quantidade, valores, latencias, erros, semente):
+    rng = np.random.default_rng(semente)
+    reader, writer = await asyncio.open_connection(host, porta)
+    try:
+        for _ in range(quantidade):
+            corpo = json.dumps({"x": rng.lognormal(3, 1, valores).tolist()}).encode()
+            inicio = time.perf_counter()
+            status = await _requisicao(reader, writer, host, caminho, corpo)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+    finally:
+        writer.close()
+
+
+async def _metricas_remotas(host, porta):
+    reader, writer = await asyncio.open_connection(host, porta)
+    writer.write(f"GET /metricas HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    resposta = await reader.read()
+    writer.close()
+    return json.loads(resposta.split(b"\r\n\r\n", 1)[1])
+
+
+async def executar(args):
+    servidor = None
+    if args.url:
+        host, porta = args.url.rsplit(":", 1)
+        porta = int(porta)
+    else:
+        servidor = ServidorPrevisao(
+            {args.modelo: modelo_sintetico()},
+            tamanho_lote=args.lote,
+            espera_maxima=args.espera / 1000
+        )
+        host = "127.0.0.1"
+        porta = await servidor.iniciar(host, 0)
+
+    por_cliente = max(args.requisicoes // args.conexoes, 1)
+    latencias, erros = [], []
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _cliente(host, porta, f"/prever/{args.modelo}", por_cliente, args.valores, latencias, erros, i)
+        for i in range(args.conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    metricas = await _metricas_remotas(host, porta)
+    if servidor is not None:
+        await servidor.fechar()
+
+    p50, p95, p99 = np.percentile(np.array(latencias) * 1000, [50, 95, 99])
+    print(f"Requisições: {len(latencias)} ({len(erros)} erros) em {duracao:.2f}s")
+    print(f"Vazão: {len(latencias) / duracao:,.0f} req/s | {len(latencias) * args.valores / duracao:,.0f} previsões/s")
+    print(f"Latência cliente (ms): p50={p50:.2f} p95={p95:.2f} p99={p99:.2f}")
+    if metricas["valores_por_lote"]:
+        print(f"Servidor: {metricas['lotes']} lotes, {metricas['valores_por_lote']:.1f} valores/lote")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="host:porta de um servidor já em execução")
+    parser.add_argument("--modelo", default="sintetico", help="Nome do modelo na rota /prever/<modelo>")
+    parser.add_argument("--conexoes", type=int, default=64)
+    parser.add_argument("--requisicoes", type=int, default=20000)
+    parser.add_argument("--valores", type=int, default=1, help="Valores de X por requisição")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO)
+    parser.add_argument("--espera", type=float, default=ESPERA_MAXIMA_PADRAO * 1000, help="ms")
+    args = parser.parse_args()
+
+    asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Tempo da regressão de Theil–Sen por seleção (src/robust.py) contra a
+enumeração de todos os pares, O(n²), e a regressão log-log por mínimos
+quadrados como referência de custo.
+
+Os dados seguem uma lei de potência com ruído log-normal e uma fração
+de outliers; a enumeração só roda até ``--max-bruto`` pontos e, quando
+roda, confere que as duas medianas são iguais.
+
+Uso:
+    python benchmarks/bench_theilsen.py --linhas 1000 10000 100000 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from src.ols import ajustar_loglog
+from src.robust import inclinacao_mediana
+
+
+def gerar(linhas, outliers, semente):
+    rng = np.random.default_rng(semente)
+    x = rng.lognormal(3, 1, linhas)
+    y = 2.5 * x ** 0.8 * rng.lognormal(0, 0.2, linhas)
+
+    fora = rng.random(linhas) < outliers
+    y[fora] *= rng.lognormal(3, 1, fora.sum())
+    return np.log10(x), np.log10(y)
+
+
+def mediana_bruta(x, y, bloco=2_000):
+    """Todas as inclinações, em blocos de linhas do triângulo superior"""
+    inclinacoes = []
+    for inicio in range(0, len(x) - 1, bloco):
+        i = np.arange(inicio, min(inicio + bloco, len(x) - 1))[:, None]
+        j = np.arange(len(x))[None, :]
+        superior = j > i
+        dx = (x[None, :] - x[i])[superior]
+        dy = (y[None, :] - y[i])[superior]
+        inclinacoes.append(dy[dx != 0] / dx[dx != 0])
+    return float(np.median(np.concatenate(inclinacoes)))
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--outliers", type=float, default=0.1, help="Fração de pontos contaminados")
+    parser.add_argument("--max-bruto", type=int, default=20_000, help="Maior n para a enumeração O(n²)")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} | {'MQO':>8} | {'Theil-Sen':>10} | {'rodadas':>7} | {'O(n²)':>8} | coef. MQO / Theil-Sen")
+    for linhas in args.linhas:
+        x, y = gerar(linhas, args.outliers, args.semente)
+
+        mqo, t_mqo = cronometrar(ajustar_loglog, 10 ** x, 10 ** y)
+        (coef, info), t_ts = cronometrar(inclinacao_mediana, x, y)
+
+        bruto = "-"
+        if linhas <= args.max_bruto:
+            referencia, t_bruto = cronometrar(mediana_bruta, x, y)
+            if not np.isclose(referencia, coef, rtol=1e-12):
+                raise AssertionError(f"Medianas diferentes: {referencia} != {coef}")
+            bruto = f"{t_bruto:7.2f}s"
+
+        print(
+            f"{linhas:>10} | {t_mqo:7.2f}s | {t_ts:9.2f}s | {info['rodadas']:>7} | {bruto:>8} | "
+            f"{mqo['coeficiente']:.4f} / {coef:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Geradores de dados sintéticos para os benchmarks (determinísticos pela
+semente).
+
+Y segue uma lei de potência em X (y = a·x^b com ruído log-normal), com
+tokens inválidos ("Not Specified", "N/A") em X e Y, zeros (que saem do
+log-log e da razão k), uma coluna Owner e, no layout largo, colunas
+extras de texto e números que a análise não usa.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+TOKENS_INVALIDOS = ("Not Specified", "N/A")
+OWNERS = ("a ", "b", " c", "d", "Not Specified")
+
+LINHAS_POR_BLOCO = 1_000_000
+
+
+def gerar_dados(linhas, semente=42, expoente=0.8, invalidos=0.05, zeros=0.01, colunas_extras=0):
+    """
+    DataFrame com X e Y em texto (como em planilhas exportadas).
+
+    Parameters
+    ----------
+    linhas : int
+    semente : int or sequence of int
+    expoente : float
+        Expoente b da lei de potência.
+    invalidos : float
+        Fração de células de X e de Y trocadas por tokens inválidos.
+    zeros : float
+        Fração de linhas com X = 0 (e a mesma fração com Y = 0).
+    colunas_extras : int
+        Colunas adicionais (layout largo), alternando texto e números.
+    """
+    rng = np.random.default_rng(semente)
+
+    x = rng.lognormal(3, 1, linhas)
+    y = 2.5 * x ** expoente * rng.lognormal(0, 0.2, linhas)
+    x[rng.random(linhas) < zeros] = 0.0
+    y[rng.random(linhas) < zeros] = 0.0
+
+    x_txt = x.round(4).astype(str).astype(object)
+    y_txt = y.round(4).astype(str).astype(object)
+    for coluna in (x_txt, y_txt):
+        trocar = rng.random(linhas) < invalidos
+        coluna[trocar] = rng.choice(TOKENS_INVALIDOS, int(trocar.sum()))
+
+    dados = {"X": x_txt, "Y": y_txt, "Owner": rng.choice(OWNERS, linhas)}
+    for i in range(colunas_extras):
+        if i % 2:
+            dados[f"extra_{i}"] = rng.choice(["foo", " bar ", "N/A"], linhas)
+        else:
+            dados[f"extra_{i}"] = rng.random(linhas)
+
+    return pd.DataFrame(dados)
+
+
+def arquivo_csv(pasta, linhas, semente=42, colunas_extras=0, **opcoes):
+    """
+    Caminho de um CSV sintético em ``pasta``; gerado só na primeira vez
+    (o nome identifica os parâmetros), em blocos de ``LINHAS_POR_BLOCO``
+    linhas com sementes (semente, bloco) para limitar a memória.
+    """
+    partes = [f"{linhas}", f"s{semente}", f"c{colunas_extras}"]
+    partes += [f"{chave}{valor}" for chave, valor in sorted(opcoes.items())]
+    caminho = os.path.join(pasta, f"sintetico_{'_'.join(partes)}.csv")
+
+    if not os.path.isfile(caminho):
+        os.makedirs(pasta, exist_ok=True)
+        temporario = caminho + ".tmp"
+        for bloco, inicio in enumerate(range(0, linhas, LINHAS_POR_BLOCO)):
+            df = gerar_dados(
+                min(LINHAS_POR_BLOCO, linhas - inicio), [semente, bloco],
+                colunas_extras=colunas_extras, **opcoes
+            )
+            df.to_csv(temporario, mode="w" if bloco == 0 else "a", header=bloco == 0, index=False)
+        os.replace(temporario, caminho)
+
+    return caminho
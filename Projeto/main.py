@@ -1,13 +1,44 @@
 """
 Arquivo principal para execução via terminal.
 Responsável por orquestrar todo o fluxo da aplicação.
+
+Uso:
+    python main.py                              # seleção interativa
+    python main.py dados.xlsx --x Volume --y Custo
+    python main.py dados.xlsx --stats-only      # sem modelos e gráficos
+    python main.py dados.xlsx --grupos          # com a análise por Owner
+    python main.py vendas.sqlite --tabela pedidos --x Volume --y Custo
+
+Modo sem interação (cron, servidores sem tela):
+    python main.py "dados/*.xlsx" --headless --x Volume --y Custo \
+        --modelos linear loglog grupos --saida resultados.json --graficos saida/ \
+        --salvar-modelos modelos/
+    python main.py grande.csv --headless --x Volume --y Custo --column-store colunas/
+    python main.py "dados/*.xlsx" --headless --x Volume --y Custo \
+        --relatorios relatorios/ --formatos-relatorio pdf xlsx --processos 0
+    python main.py --config analise.json
+
+Perfil de desempenho (tempo, CPU, memória e linhas por etapa):
+    python main.py dados.xlsx --x Volume --y Custo --profile perfil.json
+    python main.py "dados/*.xlsx" --headless --x Volume --y Custo --profile \
+        --formato-profile json
+
+Os subsistemas pesados (tkinter, matplotlib, modelos, pipeline,
+relatórios, SQL, cache e perfil) só são importados quando a etapa
+correspondente é executada, para que ``--stats-only`` inicie rápido
+(ver benchmarks/bench_import.py e tests/test_main.py).
 """
 
 # ================================
 # AJUSTE DE PATH (resolve imports)
 # ================================
+import argparse
+import json
 import sys
 import os
+from contextlib import nullcontext
+from functools import partial
+from types import SimpleNamespace
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(BASE_DIR)
@@ -15,109 +46,414 @@ sys.path.append(BASE_DIR)
 # ================================
 # IMPORTS
 # ================================
+# Apenas módulos leves (pandas/numpy); os demais são importados sob
+# demanda na etapa que os usa.
+import pandas as pd
+
 from src.data_loader import DataLoader
 from src.analyzer import UEVAnalyzer
-from src.models import RegressionModel, LogLogRegressionModel
-from src.visualizer import Visualizer
-from src.utils import selecionar_arquivo
+from src.constantes import MODELOS_DISPONIVEIS, MODELOS_PADRAO, FORMATOS_RELATORIO, FORMATOS_PERFIL
+
+ARQUIVO_PERFIL_PADRAO = "perfil.json"
 
 
 # ================================
 # ESCOLHER COLUNA
 # ================================
-def escolher_coluna(df, nome):
+def escolher_coluna(colunas, nome):
     print(f"\nSelecione a coluna para {nome}:")
 
-    for i, col in enumerate(df.columns):
+    for i, col in enumerate(colunas):
         print(f"{i} - {col}")
 
     while True:
         try:
             idx = int(input(f"Digite o número da coluna {nome}: "))
-            if 0 <= idx < len(df.columns):
-                return df.columns[idx]
+            if 0 <= idx < len(colunas):
+                return colunas[idx]
             else:
                 print("Número fora do intervalo.")
         except ValueError:
             print("Entrada inválida. Digite um número.")
 
 
+# ================================
+# ARGUMENTOS
+# ================================
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Sistema de Análise Estatística")
+    parser.add_argument(
+        "arquivos",
+        nargs="*",
+        default=[],
+        help="Arquivo(s) de dados, diretórios ou padrões glob (sem eles, abre a janela de seleção)"
+    )
+    parser.add_argument("--x", help="Coluna X (sem ela, pergunta no terminal)")
+    parser.add_argument("--y", help="Coluna Y (sem ela, pergunta no terminal)")
+    parser.add_argument("--owner", help="Filtra um Owner sem perguntar")
+    parser.add_argument("--tabela", help="Tabela lida em bancos SQLite / scripts .sql")
+    parser.add_argument("--consulta", help="SELECT usado como fonte em bancos SQLite / scripts .sql")
+    parser.add_argument(
+        "--stats-only",
+        action="store_true",
+        help="Apenas estatísticas, correlação e razão k (sem modelos e gráficos)"
+    )
+    parser.add_argument(
+        "--grupos",
+        action="store_true",
+        help="Mostra a análise por Owner (no modo headless, use --modelos grupos)"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=ARQUIVO_PERFIL_PADRAO,
+        metavar="ARQUIVO",
+        help=f"Mede tempo, CPU, memória e linhas de cada etapa e grava o trace (padrão: {ARQUIVO_PERFIL_PADRAO})"
+    )
+    parser.add_argument(
+        "--formato-profile",
+        choices=FORMATOS_PERFIL,
+        default="chrome",
+        help="Formato do trace: chrome (chrome://tracing, Perfetto) ou json (padrão: chrome)"
+    )
+
+    headless = parser.add_argument_group("modo sem interação")
+    headless.add_argument("--headless", action="store_true", help="Executa sem janelas, perguntas ou plt.show()")
+    headless.add_argument("--config", help="Arquivo JSON com os mesmos parâmetros (implica --headless)")
+    headless.add_argument(
+        "--modelos",
+        nargs="+",
+        choices=MODELOS_DISPONIVEIS,
+        help=f"Modelos a executar (padrão: {' '.join(MODELOS_PADRAO)})"
+    )
+    headless.add_argument("--saida", help="Resultado em .json ou .parquet (padrão: JSON na saída padrão)")
+    headless.add_argument("--graficos", help="Pasta para salvar os gráficos em PNG")
+    headless.add_argument(
+        "--salvar-modelos",
+        help="Pasta para gravar os modelos treinados em JSON (usados por prever.py)"
+    )
+    headless.add_argument(
+        "--column-store",
+        metavar="PASTA",
+        help="Converte X e Y para colunas float64 em disco (memmap) e analisa em blocos, sem carregar a planilha"
+    )
+    headless.add_argument(
+        "--relatorios",
+        help="Pasta para gravar um relatório por arquivo (estatísticas, regressões e gráfico)"
+    )
+    headless.add_argument(
+        "--formatos-relatorio",
+        nargs="+",
+        choices=FORMATOS_RELATORIO,
+        default=["pdf"],
+        help="Formatos dos relatórios (padrão: pdf)"
+    )
+    headless.add_argument(
+        "--processos",
+        type=int,
+        default=1,
+        help="Arquivos analisados em paralelo (0 = um por núcleo)"
+    )
+    return parser
+
+
+def aplicar_config(args, parser):
+    """Completa os argumentos não informados com os valores do arquivo --config"""
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+
+    if isinstance(config.get("arquivos"), str):
+        config["arquivos"] = [config["arquivos"]]
+
+    for chave, valor in config.items():
+        chave = chave.replace("-", "_")
+        if not hasattr(args, chave):
+            raise ValueError(f"Parâmetro desconhecido no config: '{chave}'")
+        # Argumentos da linha de comando têm precedência sobre o config
+        if getattr(args, chave) == parser.get_default(chave):
+            setattr(args, chave, valor)
+
+    args.headless = True
+    return args
+
+
+class _SemPerfil:
+    """Faz o papel de ``Perfil(ativo=False)`` sem importar src.profiling"""
+
+    def __bool__(self):
+        return False
+
+    def etapa(self, nome, linhas_entrada=None, linhas_saida=None):
+        return nullcontext(SimpleNamespace())
+
+
+def _tarefa_perfilada(caminho, funcao, **opcoes):
+    """Executa ``funcao`` com um Perfil próprio (funciona em subprocessos)"""
+    from src.profiling import Perfil
+
+    perfil = Perfil(rotulo=caminho)
+    resultado = funcao(caminho, perfil=perfil, **opcoes)
+    resultado["perfil"] = perfil.registros
+    return resultado
+
+
+def gravar_perfil(registros, args):
+    from src.profiling import salvar_perfil
+
+    salvar_perfil(registros, args.profile, args.formato_profile)
+    print(f"Perfil salvo em {args.profile} ({args.formato_profile})", file=sys.stderr)
+
+
+def executar_headless(args):
+    """Analisa todos os arquivos sem interação e grava/imprime o resultado"""
+    if not args.arquivos or not args.x or not args.y:
+        print("Modo headless exige arquivo(s), --x e --y (ou um --config com esses campos).", file=sys.stderr)
+        return 2
+
+    from src.batch import listar_arquivos, mapear_arquivos
+    from src.cache import CacheDados
+    from src.pipeline import executar_analise, salvar_resultados
+
+    caminhos = []
+    for entrada in args.arquivos:
+        if os.path.isfile(entrada):
+            caminhos.append(entrada)
+        else:
+            caminhos.extend(listar_arquivos(entrada))
+
+    if not caminhos:
+        print("Nenhum arquivo encontrado.", file=sys.stderr)
+        return 2
+
+    modelos = () if args.stats_only else tuple(args.modelos or MODELOS_PADRAO)
+    opcoes = {}
+    funcao = executar_analise
+    if args.relatorios:
+        from src.report import relatorio_arquivo
+
+        funcao = relatorio_arquivo
+        opcoes = {"pasta_relatorios": args.relatorios, "formatos": tuple(args.formatos_relatorio)}
+
+    if args.profile:
+        funcao = partial(_tarefa_perfilada, funcao=funcao)
+
+    tarefa = partial(
+        funcao,
+        col_x=args.x,
+        col_y=args.y,
+        owner=args.owner,
+        modelos=modelos,
+        pasta_graficos=args.graficos,
+        cache=CacheDados(),
+        pasta_modelos=args.salvar_modelos,
+        tabela=args.tabela,
+        consulta=args.consulta,
+        pasta_column_store=args.column_store,
+        **opcoes
+    )
+
+    resultados = mapear_arquivos(tarefa, caminhos, args.processos)
+
+    if args.profile:
+        gravar_perfil([etapa for r in resultados for etapa in r.pop("perfil")], args)
+
+    salvar_resultados(resultados, args.saida)
+
+    falhas = [r for r in resultados if "erro" in r]
+    for r in falhas:
+        print(f"Erro em {r['arquivo']}: {r['erro']}", file=sys.stderr)
+
+    return 1 if falhas else 0
+
+
 # ================================
 # MAIN
 # ================================
-def main():
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    if args.config:
+        aplicar_config(args, parser)
+
+    if args.headless:
+        return executar_headless(args)
+
     print("=== Sistema de Análise Estatística ===\n")
 
-    caminho = selecionar_arquivo()
+    caminho = args.arquivos[0] if args.arquivos else None
+    if caminho is None:
+        from src.utils import selecionar_arquivo  # tkinter: só quando necessário
+        caminho = selecionar_arquivo()
 
     if not caminho:
         print("Nenhum arquivo selecionado.")
         return
 
+    if args.profile:
+        from src.profiling import Perfil
+
+        perfil = Perfil(rotulo=caminho)
+    else:
+        perfil = _SemPerfil()
+    try:
+        return _executar_interativo(args, caminho, perfil)
+    finally:
+        if perfil:
+            print("\n=== Perfil ===")
+            print(perfil.resumo())
+            gravar_perfil(perfil.registros, args)
+
+
+def _executar_interativo(args, caminho, perfil):
     # ----------------------------
     # Carregar dados
     # ----------------------------
     try:
-        loader = DataLoader(caminho)
-        df = loader.carregar()
+        fonte = caminho
+        if args.tabela or args.consulta:
+            from src.sql_source import FonteSQL
+
+            fonte = FonteSQL(caminho, tabela=args.tabela, consulta=args.consulta)
+
+        # --stats-only lê direto da fonte, sem hash nem cache em disco
+        cache = None
+        if not args.stats_only:
+            from src.cache import CacheDados
+
+            cache = CacheDados()
+        loader = DataLoader(fonte, cache=cache)
+        sql = loader.e_sql()
+        with perfil.etapa("carregar") as etapa:
+            if sql:
+                # Em bancos só os nomes das colunas: os dados ficam na consulta
+                colunas = loader.colunas()
+            else:
+                df = loader.carregar()
+                colunas = df.columns
+                etapa.linhas_saida = len(df)
     except Exception as e:
         print("Erro ao carregar arquivo:", e)
         return
 
-    if df is None or df.empty:
+    if not sql and (df is None or df.empty):
         print("Arquivo vazio ou inválido.")
         return
 
     # ----------------------------
     # Escolher colunas
     # ----------------------------
-    col_x = escolher_coluna(df, "X")
-    col_y = escolher_coluna(df, "Y")
+    col_x = args.x or escolher_coluna(colunas, "X")
+    col_y = args.y or escolher_coluna(colunas, "Y")
 
     # ----------------------------
     # Limpeza
     # ----------------------------
-    df = loader.limpar(col_x, col_y)
+    owner = args.owner
+    if sql:
+        if owner is None and "Owner" in colunas:
+            if input("\nDeseja filtrar por Owner? (s/n): ").strip().lower() == "s":
+                owner = input("Owner: ").strip() or None
 
-    try:
-        df = loader.filtrar_owner()
-    except Exception:
-        pass
+        # Filtro de Owner, agregados e medianas calculados no banco
+        with perfil.etapa("agregar") as etapa:
+            try:
+                acumulador = loader.acumulador(col_x, col_y, owner=owner, exigir_dados=True)
+                medianas = loader.medianas(col_x, col_y, owner=owner)
+            except ValueError as e:
+                print("Erro ao filtrar Owner:" if owner is not None else "Erro ao carregar arquivo:", e)
+                return
+            etapa.linhas_saida = registros = acumulador.n
+        sessao = None
+    else:
+        with perfil.etapa("limpar", linhas_entrada=len(df)) as etapa:
+            df = loader.limpar(col_x, col_y)
+
+            try:
+                df = loader.filtrar_owner(owner)
+            except ValueError as e:
+                print("Erro ao filtrar Owner:", e)
+                return
+            etapa.linhas_saida = registros = len(df)
+        sessao = loader.sessao(col_x, col_y)
 
-    print(f"\nRegistros válidos: {len(df)}")
+    def linhas():
+        """Sessão com as linhas; em SQL só X, Y e Owner, lidos na primeira vez que um passo precisa"""
+        nonlocal sessao
+        if sessao is None:
+            with perfil.etapa("carregar_colunas") as etapa:
+                sessao = loader.sessao(col_x, col_y, owner=owner)
+                etapa.linhas_saida = len(sessao)
+        return sessao
+
+    print(f"\nRegistros válidos: {registros}")
 
     # ----------------------------
     # Análise
     # ----------------------------
-    analyzer = UEVAnalyzer(df, col_x, col_y)
+    # X e Y limpos uma única vez, compartilhados por análise, modelos e gráficos
+    with perfil.etapa("estatisticas", linhas_entrada=registros) as etapa:
+        if sql:
+            analyzer = UEVAnalyzer(acumulador, col_x, col_y, medianas=medianas)
+        else:
+            analyzer = UEVAnalyzer(sessao, col_x, col_y)
 
-    print("\n=== Estatísticas ===")
-    print("X:", analyzer.resumo_estatistico(col_x))
-    print("Y:", analyzer.resumo_estatistico(col_y))
+        print("\n=== Estatísticas ===")
+        print("X:", analyzer.resumo_estatistico(col_x))
+        print("Y:", analyzer.resumo_estatistico(col_y))
 
-    print("\n=== Correlação ===")
-    print("Pearson:", analyzer.correlacao())
+        print("\n=== Correlação ===")
+        print("Pearson:", analyzer.correlacao())
 
-    print("\n=== Razão k ===")
-    print(analyzer.calcular_razao_k())
+        print("\n=== Razão k ===")
+        print(analyzer.calcular_razao_k())
+        etapa.linhas_saida = registros
 
     print("\n=== Primeiras 10 linhas ===")
-    print(analyzer.primeiras_linhas())
+    if sql:
+        print(loader.primeiras_linhas(col_x, col_y, owner=owner))
+    else:
+        print(analyzer.primeiras_linhas())
+
+    if args.grupos and "Owner" in colunas:
+        owners = linhas().owner if sql else df["Owner"]
+        if owners is not None and pd.Series(owners).nunique() > 1:
+            print("\n=== Análise por Owner (20 maiores) ===")
+            from src.grouping import analisar_grupos
+
+            with perfil.etapa("grupos", linhas_entrada=registros) as etapa:
+                grupos = analisar_grupos(linhas() if sql else df, col_x, col_y)
+                etapa.linhas_saida = len(grupos)
+            print(grupos.head(20).to_string())
+
+    if args.stats_only:
+        return
+
+    from src.models import RegressionModel, LogLogRegressionModel
+
+    # Em SQL os modelos linear e log-log usam os agregados do banco
+    dados_modelos = acumulador if sql else sessao
 
     # ----------------------------
     # Modelos
     # ----------------------------
     print("\n=== Regressão Linear ===")
     try:
-        reg = RegressionModel(df, col_x, col_y)
-        print(reg.treinar())
+        with perfil.etapa("regressao_linear", linhas_entrada=registros) as etapa:
+            reg = RegressionModel(dados_modelos, col_x, col_y)
+            metricas = reg.treinar()
+            etapa.linhas_saida = metricas["n"]
+        print(metricas)
     except Exception as e:
         print("Erro na regressão linear:", e)
 
     print("\n=== Regressão Log-Log ===")
     try:
-        log_model = LogLogRegressionModel(df, col_x, col_y)
-        print(log_model.treinar())
+        with perfil.etapa("regressao_loglog", linhas_entrada=registros) as etapa:
+            log_model = LogLogRegressionModel(dados_modelos, col_x, col_y)
+            metricas = log_model.treinar()
+            etapa.linhas_saida = metricas["n"]
+        print(metricas)
     except Exception as e:
         print("Erro na regressão log-log:", e)
 
@@ -125,8 +461,11 @@ def main():
     # Visualização
     # ----------------------------
     try:
-        viz = Visualizer(df, col_x, col_y)
-        viz.plotar()
+        # Com a janela aberta o tempo de relógio inclui a espera; o de CPU não
+        with perfil.etapa("plotar", linhas_entrada=registros):
+            from src.visualizer import Visualizer  # matplotlib: só quando necessário
+            viz = Visualizer(linhas(), col_x, col_y)
+            viz.plotar()
     except Exception as e:
         print("Erro ao gerar gráficos:", e)
 
@@ -135,4 +474,4 @@ def main():
 # EXECUÇÃO
 # ================================
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Previsão em lote via terminal.
+Aplica um modelo salvo (JSON gerado com --salvar-modelos no main.py) a
+um arquivo de qualquer tamanho, lendo e gravando em blocos.
+
+Exemplo:
+    python prever.py modelos/vendas_loglog.json novos.csv previsoes.parquet --manter Owner
+"""
+
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from src.data_loader import TAMANHO_CHUNK_PADRAO
+from src.scoring import prever_arquivo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Previsão em lote a partir de um modelo salvo.")
+    parser.add_argument("modelo", help="Artefato JSON do modelo")
+    parser.add_argument("entrada", help="Arquivo com a coluna X (CSV, JSON, XLS ou XLSX)")
+    parser.add_argument("saida", help="Destino .csv, .csv.gz, .parquet ou .xlsx")
+    parser.add_argument("--coluna", help="Coluna X na entrada (padrão: a usada no treino)")
+    parser.add_argument("--manter", nargs="+", default=[], help="Colunas copiadas para a saída")
+    parser.add_argument("--chunk", type=int, default=TAMANHO_CHUNK_PADRAO, help="Linhas por bloco")
+    args = parser.parse_args()
+
+    try:
+        relatorio = prever_arquivo(
+            args.modelo,
+            args.entrada,
+            args.saida,
+            coluna=args.coluna,
+            manter=args.manter,
+            tamanho_chunk=args.chunk
+        )
+    except (ValueError, OSError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Linhas: {relatorio['linhas']} em {relatorio['chunks']} blocos")
+    print(f"Previstas: {relatorio['previstas']} | Inválidas: {relatorio['invalidas']}")
+    print(f"Tempo: {relatorio['segundos']:.2f}s ({relatorio['linhas_por_segundo'] or 0:,.0f} linhas/s)")
+    print(f"Previsões salvas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
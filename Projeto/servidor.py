@@ -0,0 +1,63 @@
+"""
+Servidor HTTP de previsão.
+Carrega os modelos salvos com --salvar-modelos (main.py) e atende
+previsões em micro-lotes.
+
+Exemplo:
+    python servidor.py modelos/ --porta 8000
+    curl -X POST localhost:8000/prever/vendas_loglog -d '{"x": [10, 20, 30]}'
+    curl localhost:8000/metricas
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from src.server import (
+    ServidorPrevisao, carregar_modelos, TAMANHO_LOTE_PADRAO, ESPERA_MAXIMA_PADRAO, CORPO_MAXIMO_PADRAO
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP de previsão com micro-lotes.")
+    parser.add_argument("modelos", help="Artefato JSON ou pasta com artefatos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help="Máximo de valores por lote")
+    parser.add_argument(
+        "--espera",
+        type=float,
+        default=ESPERA_MAXIMA_PADRAO * 1000,
+        help="Espera máxima para completar um lote, em ms"
+    )
+    parser.add_argument(
+        "--corpo-maximo",
+        type=int,
+        default=CORPO_MAXIMO_PADRAO,
+        help="Tamanho máximo do corpo de uma requisição, em bytes (acima dele: 413)"
+    )
+    args = parser.parse_args()
+
+    try:
+        modelos = carregar_modelos(args.modelos)
+    except (ValueError, OSError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    servidor = ServidorPrevisao(
+        modelos, tamanho_lote=args.lote, espera_maxima=args.espera / 1000, corpo_maximo=args.corpo_maximo
+    )
+    print(f"Servindo {', '.join(modelos)} em http://{args.host}:{args.porta}")
+
+    try:
+        asyncio.run(servidor.servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Estatísticas suficientes acumuladas em uma única passada.
+
+``StatsAccumulator`` mantém contagens, médias, somas de quadrados
+centradas e co-momentos de (x, y) — no espaço linear e em log10 — além
+de mínimos e máximos de x, y e k = y / x e de sketches de quantis
+(``QuantileSketch``) para medianas e percentis. Os blocos são incorporados
+com a fórmula de combinação de Chan et al. (variante em lote de
+Welford), numericamente estável e associativa: acumuladores parciais
+de chunks, arquivos ou processos diferentes podem ser combinados com
+``combinar``. Pearson e as regressões linear e log-log saem diretamente
+desses momentos, sem percorrer os dados novamente.
+"""
+
+import numpy as np
+
+from .ols import ajuste_momentos
+from .sketch import QuantileSketch, ERRO_RELATIVO_PADRAO, LIMITE_EXATO_PADRAO
+
+
+class _Momentos:
+    """Momentos centrados de um par de séries (n, médias, M2 e co-momento)"""
+
+    __slots__ = ("n", "media_x", "media_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self):
+        self.n = 0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def _juntar(self, n, media_x, media_y, m2_x, m2_y, c_xy):
+        if n == 0:
+            return
+        if self.n == 0:
+            self.n, self.media_x, self.media_y = n, media_x, media_y
+            self.m2_x, self.m2_y, self.c_xy = m2_x, m2_y, c_xy
+            return
+
+        total = self.n + n
+        dx = media_x - self.media_x
+        dy = media_y - self.media_y
+        fator = self.n * n / total
+
+        self.media_x += dx * n / total
+        self.media_y += dy * n / total
+        self.m2_x += m2_x + dx * dx * fator
+        self.m2_y += m2_y + dy * dy * fator
+        self.c_xy += c_xy + dx * dy * fator
+        self.n = total
+
+    def atualizar(self, x, y):
+        """Incorpora um bloco de arrays x, y (já sem nulos)"""
+        n = len(x)
+        if n == 0:
+            return
+
+        media_x = float(np.mean(x))
+        media_y = float(np.mean(y))
+        dx = x - media_x
+        dy = y - media_y
+        self._juntar(n, media_x, media_y, float(np.dot(dx, dx)), float(np.dot(dy, dy)), float(np.dot(dx, dy)))
+
+    def combinar(self, outro):
+        self._juntar(outro.n, outro.media_x, outro.media_y, outro.m2_x, outro.m2_y, outro.c_xy)
+
+    def descontar(self, fator):
+        """
+        Esquecimento exponencial: multiplica o peso dos dados já
+        acumulados por ``fator`` (as médias não mudam).
+        """
+        self.n *= fator
+        self.m2_x *= fator
+        self.m2_y *= fator
+        self.c_xy *= fator
+
+    def estado(self):
+        """Momentos em um dicionário serializável"""
+        return {nome: getattr(self, nome) for nome in self.__slots__}
+
+    @classmethod
+    def de_estado(cls, estado):
+        momentos = cls()
+        for nome in cls.__slots__:
+            setattr(momentos, nome, estado[nome])
+        return momentos
+
+    def copia(self):
+        return _Momentos.de_estado(self.estado())
+
+    def pearson(self):
+        if self.n < 2 or self.m2_x == 0 or self.m2_y == 0:
+            return float("nan")
+        return float(self.c_xy / np.sqrt(self.m2_x * self.m2_y))
+
+    def ajuste(self):
+        """Reta de mínimos quadrados (coeficientes, R², erros padrão)"""
+        return ajuste_momentos(self.n, self.media_x, self.media_y, self.m2_x, self.m2_y, self.c_xy)
+
+
+class StatsAccumulator:
+    """
+    Acumulador mesclável de estatísticas suficientes para (x, y).
+
+    Exemplo
+    -------
+    >>> acc = StatsAccumulator()
+    >>> for x, y in blocos:
+    ...     acc.atualizar(x, y)
+    >>> acc.pearson(), acc.regressao_linear(), acc.regressao_loglog()
+
+    Parameters
+    ----------
+    quantis : bool
+        Mantém sketches de quantis de x, y e k (desligue quando só os
+        ajustes interessam).
+    erro_relativo, limite_exato :
+        Repassados a cada ``QuantileSketch``.
+    """
+
+    def __init__(self, quantis=True, erro_relativo=ERRO_RELATIVO_PADRAO, limite_exato=LIMITE_EXATO_PADRAO):
+        self.linear = _Momentos()
+        self.log = _Momentos()
+
+        self.sketches = None
+        if quantis:
+            self.sketches = {
+                nome: QuantileSketch(erro_relativo, limite_exato) for nome in ("x", "y", "k")
+            }
+
+        # Faixas de x, y e k = y / x
+        self.minimo = {"x": np.inf, "y": np.inf, "k": np.inf}
+        self.maximo = {"x": -np.inf, "y": -np.inf, "k": -np.inf}
+        self.n_k = 0
+        self.media_k = 0.0
+
+    # ----------------------------
+    # Construção
+    # ----------------------------
+    @classmethod
+    def de_arrays(cls, x, y, **opcoes):
+        """Acumulador a partir de arrays completos (nulos são descartados)"""
+        acc = cls(**opcoes)
+        acc.atualizar(x, y)
+        return acc
+
+    @classmethod
+    def de_blocos(cls, blocos, **opcoes):
+        """Acumulador a partir de um iterável de pares (x, y)"""
+        acc = cls(**opcoes)
+        for x, y in blocos:
+            acc.atualizar(x, y)
+        return acc
+
+    def atualizar(self, x, y):
+        """
+        Incorpora um bloco. Pares com NaN são ignorados; o espaço log
+        considera só pares positivos e k só pares com x != 0.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        validos = ~(np.isnan(x) | np.isnan(y))
+        if not validos.all():
+            x, y = x[validos], y[validos]
+
+        if len(x) == 0:
+            return self
+
+        self.linear.atualizar(x, y)
+
+        positivos = (x > 0) & (y > 0)
+        if positivos.all():
+            self.log.atualizar(np.log10(x), np.log10(y))
+        elif positivos.any():
+            self.log.atualizar(np.log10(x[positivos]), np.log10(y[positivos]))
+
+        nao_zero = x != 0
+        k = y[nao_zero] / x[nao_zero]
+
+        for nome, valores in (("x", x), ("y", y), ("k", k)):
+            if len(valores):
+                self.minimo[nome] = min(self.minimo[nome], float(valores.min()))
+                self.maximo[nome] = max(self.maximo[nome], float(valores.max()))
+                if self.sketches is not None:
+                    self.sketches[nome].atualizar(valores)
+
+        if len(k):
+            total = self.n_k + len(k)
+            self.media_k += (float(k.mean()) - self.media_k) * len(k) / total
+            self.n_k = total
+
+        return self
+
+    def combinar(self, outro):
+        """Mescla outro acumulador neste (resultado idêntico a uma passada única)"""
+        self.linear.combinar(outro.linear)
+        self.log.combinar(outro.log)
+
+        for nome in self.minimo:
+            self.minimo[nome] = min(self.minimo[nome], outro.minimo[nome])
+            self.maximo[nome] = max(self.maximo[nome], outro.maximo[nome])
+
+        if self.sketches is not None:
+            if outro.sketches is None:
+                raise ValueError("Não é possível combinar acumulador sem quantis.")
+            for nome, sketch in self.sketches.items():
+                sketch.combinar(outro.sketches[nome])
+
+        if outro.n_k:
+            total = self.n_k + outro.n_k
+            self.media_k += (outro.media_k - self.media_k) * outro.n_k / total
+            self.n_k = total
+
+        return self
+
+    # ----------------------------
+    # Resultados
+    # ----------------------------
+    @property
+    def n(self):
+        return self.linear.n
+
+    def resumo(self, coluna):
+        """Quantidade, mínimo, máximo, média (e mediana) de 'x', 'y' ou 'k'"""
+        if coluna == "k":
+            n, media = self.n_k, self.media_k
+        else:
+            n = self.linear.n
+            media = self.linear.media_x if coluna == "x" else self.linear.media_y
+
+        if n == 0:
+            resumo = {"quantidade": 0, "minimo": np.nan, "maximo": np.nan, "media": np.nan}
+        else:
+            resumo = {
+                "quantidade": int(n),
+                "minimo": float(self.minimo[coluna]),
+                "maximo": float(self.maximo[coluna]),
+                "media": float(media)
+            }
+
+        if self.sketches is not None:
+            resumo["mediana"] = self.sketches[coluna].mediana()
+
+        return resumo
+
+    def quantil(self, coluna, q):
+        """Quantil ``q`` de 'x', 'y' ou 'k' (exato ou aproximado, conforme o sketch)"""
+        if self.sketches is None:
+            raise ValueError("Acumulador criado sem quantis.")
+        return self.sketches[coluna].quantil(q)
+
+    def pearson(self):
+        """Correlação de Pearson entre x e y"""
+        return self.linear.pearson()
+
+    def termos_pearson(self):
+        """Médias, numerador e somas de quadrados da fórmula de Pearson"""
+        m = self.linear
+        return m.media_x, m.media_y, m.c_xy, m.m2_x, m.m2_y, m.pearson()
+
+    def regressao_linear(self):
+        """Ajuste y = a + bx"""
+        return self.linear.ajuste()
+
+    def regressao_loglog(self):
+        """Ajuste log10(y) = α + β log10(x) sobre os pares positivos"""
+        return self.log.ajuste()
+
+    def resultados(self):
+        """
+        Todas as estatísticas em um dicionário serializável: resumos de
+        x, y e k, Pearson e as regressões (None quando não há dados
+        suficientes para o ajuste).
+        """
+        def ajuste_ou_none(momentos):
+            try:
+                return momentos.ajuste()
+            except ValueError:
+                return None
+
+        return {
+            "quantidade": int(self.n),
+            "x": self.resumo("x"),
+            "y": self.resumo("y"),
+            "k": self.resumo("k"),
+            "pearson": self.pearson(),
+            "regressao_linear": ajuste_ou_none(self.linear),
+            "regressao_loglog": ajuste_ou_none(self.log)
+        }
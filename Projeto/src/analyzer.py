@@ -1,27 +1,131 @@
+import numpy as np
 import pandas as pd
 
+from .accumulator import StatsAccumulator
+from .column_store import ColumnStore, quantil_blocos
+from .session import SessaoAnalise
+
 class UEVAnalyzer:
     """
     Classe para análise estatística de duas colunas numéricas de um DataFrame.
+
+    Também aceita um ``ColumnStore``: nesse caso todas as estatísticas são
+    calculadas em blocos sobre as colunas mapeadas em disco. Com uma
+    ``SessaoAnalise`` os arrays e o acumulador da sessão são usados
+    diretamente, sem cópias.
+
+    Um ``StatsAccumulator`` pronto (por exemplo, os agregados calculados
+    no banco por ``DataLoader.acumulador``) dispensa as linhas: as
+    medianas exatas, quando conhecidas, vêm em ``medianas``
+    (``{"x", "y", "k"}``, como em ``DataLoader.medianas``).
     """
 
-    def __init__(self, dataframe, coluna_x, coluna_y):
-        self.df = dataframe.copy()  # evita alterar o original
+    def __init__(self, dataframe, coluna_x, coluna_y, medianas=None):
+        self.store = None
+        self.sessao = None
+        self.df = None
+        self._acumulador = None
+        self.medianas = medianas
+        if isinstance(dataframe, ColumnStore):
+            self.store = dataframe
+        elif isinstance(dataframe, SessaoAnalise):
+            self.sessao = dataframe
+        elif isinstance(dataframe, StatsAccumulator):
+            self._acumulador = dataframe
+        else:
+            self.df = dataframe  # somente leitura: nenhuma etapa altera o DataFrame
         self.coluna_x = coluna_x
         self.coluna_y = coluna_y
 
-        self._validar_colunas()
+        if self._acumulador is None:
+            self._validar_colunas()
+
+    @property
+    def agregado(self):
+        """True quando só há o acumulador (sem linhas)"""
+        return self.store is None and self.sessao is None and self.df is None
 
     def _validar_colunas(self):
         """Verifica se as colunas existem no DataFrame"""
+        # Comparação com None: sessões e stores vazios têm len 0 (falsos)
+        if self.store is not None:
+            colunas = self.store.columns
+        elif self.sessao is not None:
+            colunas = self.sessao.columns
+        else:
+            colunas = self.df.columns
         for col in [self.coluna_x, self.coluna_y]:
-            if col not in self.df.columns:
+            if col not in colunas:
                 raise ValueError(f"A coluna '{col}' não existe no DataFrame.")
 
-    def resumo_estatistico(self, coluna):
+    def acumulador(self):
+        """
+        Estatísticas suficientes de (x, y), calculadas em uma única
+        passada na primeira chamada e reaproveitadas depois.
+        """
+        if self._acumulador is None:
+            if self.sessao is not None:
+                self._acumulador = self.sessao.acumulador
+            elif self.store is not None:
+                self._acumulador = StatsAccumulator.de_blocos(self.store.iterar_blocos())
+            else:
+                self._acumulador = StatsAccumulator.de_arrays(
+                    self.df[self.coluna_x].to_numpy(dtype=float),
+                    self.df[self.coluna_y].to_numpy(dtype=float)
+                )
+        return self._acumulador
+
+    def _blocos_k(self):
+        """Blocos de k = y / x (x != 0) a partir do ColumnStore"""
+        for x, y in self.store.iterar_blocos():
+            mascara = x != 0
+            yield y[mascara] / x[mascara]
+
+    def _nome_acumulado(self, coluna):
+        """Nome da coluna no acumulador: 'x', 'y' ou 'k'"""
+        if coluna == self.coluna_x:
+            return "x"
+        if coluna == self.coluna_y:
+            return "y"
+        if coluna == "k":
+            return "k"
+        raise ValueError(f"A coluna '{coluna}' não faz parte da análise.")
+
+    def resumo_estatistico(self, coluna, exato=False):
         """
         Retorna estatísticas descritivas básicas de uma coluna.
+
+        Com ColumnStore a mediana vem do sketch de quantis (erro relativo
+        limitado); ``exato=True`` força a mediana exata em blocos. Só com
+        o acumulador, a mediana vem de ``medianas`` (ausente sem elas).
         """
+        if self.agregado:
+            nome = self._nome_acumulado(coluna)
+            resumo = self.acumulador().resumo(nome)
+            if self.medianas is not None:
+                resumo["mediana"] = float(self.medianas[nome])
+            return resumo
+
+        if self.sessao is not None:
+            # mediana exata; a cópia temporária do partition é de uma coluna só
+            resumo = self.acumulador().resumo(self._nome_acumulado(coluna))
+            resumo["mediana"] = float(np.median(self.sessao.coluna(coluna)))
+            return resumo
+
+        if self.store is not None:
+            resumo = self.acumulador().resumo(self._nome_acumulado(coluna))
+
+            if exato:
+                array = self.store.coluna(coluna)
+                tamanho = self.store.tamanho_bloco
+
+                def blocos():
+                    for inicio in range(0, len(array), tamanho):
+                        yield array[inicio:inicio + tamanho]
+
+                resumo["mediana"] = float(quantil_blocos(blocos, 0.5, resumo))
+            return resumo
+
         serie = self.df[coluna].dropna()
 
         return {
@@ -36,13 +140,35 @@ class UEVAnalyzer:
         """
         Calcula a correlação de Pearson entre as duas colunas.
         """
-        dados_validos = self.df[[self.coluna_x, self.coluna_y]].dropna()
-        return float(dados_validos[self.coluna_x].corr(dados_validos[self.coluna_y]))
+        return self.acumulador().pearson()
 
-    def calcular_razao_k(self):
+    def calcular_razao_k(self, exato=False):
         """
         Calcula a razão k = y / x e retorna estatísticas.
         """
+        if self.agregado:
+            resumo = self.resumo_estatistico("k")
+            return {chave: resumo[chave] for chave in ("minimo", "maximo", "mediana") if chave in resumo}
+
+        if self.sessao is not None:
+            resumo = self.acumulador().resumo("k")
+            return {
+                "minimo": float(resumo["minimo"]),
+                "maximo": float(resumo["maximo"]),
+                "mediana": float(np.median(self.sessao.k))
+            }
+
+        if self.store is not None:
+            resumo = self.acumulador().resumo("k")
+            mediana = resumo["mediana"]
+            if exato:
+                mediana = quantil_blocos(self._blocos_k, 0.5, resumo)
+            return {
+                "minimo": float(resumo["minimo"]),
+                "maximo": float(resumo["maximo"]),
+                "mediana": float(mediana)
+            }
+
         dados_validos = self.df[[self.coluna_x, self.coluna_y]].dropna().copy()
 
         # Evita divisão por zero
@@ -56,8 +182,28 @@ class UEVAnalyzer:
             "mediana": float(dados_validos["k"].median())
         }
 
+    def percentis(self, coluna, qs=(0.25, 0.5, 0.75)):
+        """
+        Percentis (0 a 1) de X, Y ou 'k' a partir do sketch de quantis:
+        exatos até o limite do sketch, aproximados acima dele.
+        """
+        nome = self._nome_acumulado(coluna)
+        return {q: self.acumulador().quantil(nome, q) for q in qs}
+
     def primeiras_linhas(self, n=10):
         """
         Retorna as primeiras linhas válidas do conjunto de dados.
         """
-        return self.df[[self.coluna_x, self.coluna_y]].dropna().head(n)
\ No newline at end of file
+        if self.agregado:
+            raise ValueError("Sem linhas: a análise tem apenas os agregados (use DataLoader.primeiras_linhas).")
+
+        if self.store is not None:
+            return self.store.head(n)
+
+        if self.sessao is not None:
+            return pd.DataFrame({
+                self.coluna_x: self.sessao.x[:n],
+                self.coluna_y: self.sessao.y[:n]
+            })
+
+        return self.df[[self.coluna_x, self.coluna_y]].dropna().head(n)
@@ -0,0 +1,124 @@
+"""
+Análise em lote de vários arquivos com o mesmo esquema.
+
+Cada arquivo é lido e limpo em um processo separado, que devolve apenas
+um ``StatsAccumulator`` (poucos bytes). Os acumuladores são combinados
+no processo principal, gerando a análise global e o detalhamento por
+arquivo sem transferir os dados entre processos.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .accumulator import StatsAccumulator
+from .data_loader import DataLoader, TAMANHO_CHUNK_PADRAO
+
+
+EXTENSOES_SUPORTADAS = (".xlsx", ".xls", ".csv", ".json")
+
+
+def listar_arquivos(entrada):
+    """
+    Resolve um diretório ou padrão glob na lista ordenada de arquivos
+    suportados.
+    """
+    if os.path.isdir(entrada):
+        padrao = os.path.join(entrada, "*")
+    else:
+        padrao = entrada
+
+    arquivos = [
+        caminho for caminho in glob.glob(padrao, recursive=True)
+        if os.path.isfile(caminho) and caminho.lower().endswith(EXTENSOES_SUPORTADAS)
+    ]
+    return sorted(arquivos)
+
+
+def mapear_arquivos(tarefa, caminhos, processos=None):
+    """
+    Aplica ``tarefa`` a cada caminho, em paralelo entre processos.
+
+    É o executor comum da análise em lote, dos relatórios e do modo
+    headless. Com um só processo (ou um só arquivo) as tarefas rodam no
+    processo atual, sem o custo de criar o pool.
+
+    Parameters
+    ----------
+    tarefa : callable
+        Função de um caminho; precisa ser serializável (``partial`` de
+        uma função de módulo).
+    caminhos : iterable of str
+    processos : int, optional
+        Número de processos (padrão: número de núcleos).
+
+    Returns
+    -------
+    list
+        Um resultado por caminho, na ordem de ``caminhos``.
+    """
+    caminhos = list(caminhos)
+    processos = min(processos or os.cpu_count() or 1, len(caminhos))
+
+    if processos <= 1:
+        return [tarefa(caminho) for caminho in caminhos]
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(tarefa, caminhos))
+
+
+def _analisar_arquivo(caminho, col_x, col_y, tamanho_chunk):
+    """Tarefa executada em cada processo: lê, limpa e acumula um arquivo"""
+    acumulador = StatsAccumulator()
+
+    try:
+        loader = DataLoader(caminho)
+        for bloco in loader.iterar_chunks(col_x, col_y, tamanho_chunk=tamanho_chunk):
+            acumulador.atualizar(bloco["x"], bloco["y"])
+    except Exception as e:
+        return caminho, None, None, str(e)
+
+    return caminho, acumulador, loader.estatisticas_leitura, None
+
+
+def analisar_lote(arquivos, col_x, col_y, processos=None, tamanho_chunk=TAMANHO_CHUNK_PADRAO):
+    """
+    Analisa vários arquivos em paralelo e combina os resultados.
+
+    Parameters
+    ----------
+    arquivos : list of str or str
+        Lista de caminhos, ou um diretório / padrão glob.
+    col_x, col_y : str
+        Colunas analisadas (iguais em todos os arquivos).
+    processos : int, optional
+        Número de processos (padrão: número de núcleos).
+
+    Returns
+    -------
+    dict
+        ``global`` com as estatísticas combinadas e ``arquivos`` com o
+        resultado (ou o erro) de cada arquivo, na ordem da entrada.
+    """
+    if isinstance(arquivos, str):
+        arquivos = listar_arquivos(arquivos)
+
+    if not arquivos:
+        raise ValueError("Nenhum arquivo encontrado para análise.")
+
+    tarefa = partial(_analisar_arquivo, col_x=col_x, col_y=col_y, tamanho_chunk=tamanho_chunk)
+    parciais = mapear_arquivos(tarefa, arquivos, processos)
+
+    total = StatsAccumulator()
+    por_arquivo = []
+
+    for caminho, acumulador, leitura, erro in parciais:
+        if erro is not None:
+            por_arquivo.append({"arquivo": caminho, "erro": erro})
+            continue
+
+        total.combinar(acumulador)
+        por_arquivo.append({"arquivo": caminho, "leitura": leitura, **acumulador.resultados()})
+
+    return {"global": total.resultados(), "arquivos": por_arquivo}
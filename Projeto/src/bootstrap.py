@@ -0,0 +1,225 @@
+"""
+Intervalos de confiança por bootstrap, vetorizados.
+
+As estatísticas (coeficiente, intercepto e Pearson, no espaço linear ou
+log-log) dependem só das somas ponderadas de x, y, x², y² e xy. Cada
+lote de réplicas é uma matriz de índices sorteados (réplicas x n),
+convertida em contagens por réplica com um único ``np.bincount``
+(somas segmentadas) e multiplicada pela matriz de produtos (5 x n): um
+produto de matrizes dá as somas de todas as réplicas do lote, sem
+reajustar modelo algum em laço Python.
+
+Para uso interativo com muitas linhas, ``max_linhas`` ativa o bootstrap
+m-de-n: cada réplica sorteia só m pontos e os desvios em torno da
+estimativa são reescalados por sqrt(m / n), o que vale para estatísticas
+com convergência sqrt(n), como o coeficiente e o Pearson.
+
+Cada lote tem sua própria semente derivada de ``semente``
+(``SeedSequence.spawn``), então o resultado é o mesmo com qualquer
+número de processos. Intervalos percentil ou BCa; a aceleração do BCa
+vem do jackknife, também O(n) a partir das somas.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+
+REPLICAS_PADRAO = 2000
+NIVEL_PADRAO = 0.95
+METODOS = ("percentil", "bca")
+ESTATISTICAS = ("coeficiente", "intercepto", "pearson")
+
+# Elementos da matriz de índices por lote (limita a memória de cada lote)
+ELEMENTOS_POR_LOTE = 4_000_000
+
+_PRODUTOS = None  # matriz 5 x n de cada processo auxiliar
+
+
+def _produtos(x, y):
+    """
+    Linhas x, y, x², y², xy centradas (estabilidade numérica), em uma
+    matriz 5 x n com cada linha contígua.
+    """
+    dx = x - x.mean()
+    dy = y - y.mean()
+    return np.vstack((dx, dy, dx * dx, dy * dy, dx * dy))
+
+
+def _estatisticas(somas, n, centro_x, centro_y):
+    """
+    Coeficiente, intercepto e Pearson a partir das somas
+    (linhas = réplicas; colunas = Σx, Σy, Σx², Σy², Σxy).
+    """
+    sx, sy, sxx, syy, sxy = somas.T
+    media_x = sx / n
+    media_y = sy / n
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m2_x = sxx - sx * media_x
+        m2_y = syy - sy * media_y
+        c_xy = sxy - sx * media_y
+        coef = c_xy / m2_x
+        pearson = c_xy / np.sqrt(m2_x * m2_y)
+
+    intercepto = (media_y + centro_y) - coef * (media_x + centro_x)
+    return {"coeficiente": coef, "intercepto": intercepto, "pearson": pearson}
+
+
+def _iniciar_processo(produtos):
+    global _PRODUTOS
+    _PRODUTOS = produtos
+
+
+def _somas_lote(semente, replicas, tamanho, produtos=None):
+    """
+    Somas de ``replicas`` reamostragens de ``tamanho`` pontos cada
+    (matriz de índices -> contagens -> BLAS).
+    """
+    produtos = _PRODUTOS if produtos is None else produtos
+    n = produtos.shape[1]
+
+    rng = np.random.default_rng(semente)
+    indices = rng.integers(0, n, size=(replicas, tamanho))
+
+    if tamanho < n:
+        # m-de-n: somar os valores sorteados custa menos que contar n posições
+        return np.column_stack([linha[indices].sum(axis=1) for linha in produtos])
+
+    indices += np.arange(replicas)[:, None] * n
+
+    contagens = np.bincount(indices.ravel(), minlength=replicas * n).reshape(replicas, n)
+    return contagens.astype(np.float64) @ produtos.T
+
+
+def _jackknife(produtos, centro_x, centro_y):
+    """Estatísticas deixando cada ponto de fora, a partir das somas totais"""
+    n = produtos.shape[1]
+    somas = produtos.sum(axis=1) - produtos.T
+    return _estatisticas(somas, n - 1, centro_x, centro_y)
+
+
+def _intervalo(replicas, estimativa, nivel, metodo, jackknife):
+    replicas = replicas[np.isfinite(replicas)]
+    if len(replicas) == 0:
+        return np.nan, np.nan
+
+    alfa = (1 - nivel) / 2
+    quantis = np.array([alfa, 1 - alfa])
+
+    if metodo == "bca":
+        normal = NormalDist()
+        proporcao = np.mean(replicas < estimativa)
+        jack = jackknife[np.isfinite(jackknife)]
+        desvio = jack.mean() - jack
+        denominador = 6 * (desvio ** 2).sum() ** 1.5
+
+        if 0 < proporcao < 1 and denominador > 0:
+            z0 = normal.inv_cdf(proporcao)
+            aceleracao = (desvio ** 3).sum() / denominador
+            z = np.array([normal.inv_cdf(alfa), normal.inv_cdf(1 - alfa)])
+            ajustado = z0 + (z0 + z) / (1 - aceleracao * (z0 + z))
+            quantis = np.array([normal.cdf(v) for v in ajustado])
+
+    inferior, superior = np.quantile(replicas, quantis)
+    return float(inferior), float(superior)
+
+
+def bootstrap(x, y, replicas=REPLICAS_PADRAO, nivel=NIVEL_PADRAO, metodo="bca", loglog=False,
+              semente=0, processos=1, estatisticas=ESTATISTICAS, max_linhas=None):
+    """
+    Intervalos de confiança bootstrap (reamostragem de pares).
+
+    Parameters
+    ----------
+    x, y : array-like
+        Dados; pares com NaN são descartados e, com ``loglog=True``,
+        também os não positivos (o ajuste usa log10).
+    replicas : int
+        Número de reamostragens.
+    nivel : float
+        Nível de confiança (0.95 = 95%).
+    metodo : str
+        "percentil" ou "bca" (corrigido para viés e assimetria).
+    semente : int
+        Resultados reproduzíveis, independentes de ``processos``.
+    processos : int
+        Processos para os lotes de réplicas (1 = no processo atual).
+    estatisticas : iterable of str
+        Subconjunto de ``ESTATISTICAS``.
+    max_linhas : int, optional
+        Acima desse número de pares usa o bootstrap m-de-n com
+        m = max_linhas (custo limitado para uso interativo).
+
+    Returns
+    -------
+    dict
+        Para cada estatística: ``estimativa``, ``inferior``, ``superior``,
+        ``erro_padrao``; mais ``replicas``, ``nivel``, ``metodo``, ``n`` e
+        ``m`` (pontos por réplica).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método inválido: '{metodo}'. Use {', '.join(METODOS)}.")
+
+    if not 0 < nivel < 1:
+        raise ValueError("nivel deve estar entre 0 e 1.")
+
+    if replicas < 1:
+        raise ValueError("replicas deve ser positivo.")
+
+    desconhecidas = set(estatisticas) - set(ESTATISTICAS)
+    if desconhecidas:
+        raise ValueError(f"Estatísticas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    if loglog:
+        validos &= (x > 0) & (y > 0)
+    if not validos.all():
+        x, y = x[validos], y[validos]
+    if loglog:
+        x, y = np.log10(x), np.log10(y)
+
+    n = len(x)
+    if n < 3:
+        raise ValueError("Dados insuficientes para bootstrap.")
+
+    centro_x, centro_y = float(x.mean()), float(y.mean())
+    produtos = _produtos(x, y)
+
+    m = n if max_linhas is None else min(n, max_linhas)
+
+    # Lotes de tamanho fixo, cada um com sua semente
+    por_lote = max(1, min(replicas, ELEMENTOS_POR_LOTE // m))
+    tamanhos = [min(por_lote, replicas - inicio) for inicio in range(0, replicas, por_lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+
+    if processos > 1 and len(tamanhos) > 1:
+        with ProcessPoolExecutor(
+            max_workers=processos, initializer=_iniciar_processo, initargs=(produtos,)
+        ) as executor:
+            somas = list(executor.map(_somas_lote, sementes, tamanhos, [m] * len(tamanhos)))
+    else:
+        somas = [_somas_lote(s, t, m, produtos) for s, t in zip(sementes, tamanhos)]
+
+    distribuicao = _estatisticas(np.vstack(somas), m, centro_x, centro_y)
+    pontual = _estatisticas(produtos.sum(axis=1)[None, :], n, centro_x, centro_y)
+    jackknife = _jackknife(produtos, centro_x, centro_y) if metodo == "bca" else {}
+
+    resultado = {"replicas": int(replicas), "nivel": nivel, "metodo": metodo, "n": int(n), "m": int(m)}
+    for nome in estatisticas:
+        estimativa = float(pontual[nome][0])
+        if m < n:
+            distribuicao[nome] = estimativa + (distribuicao[nome] - estimativa) * np.sqrt(m / n)
+        inferior, superior = _intervalo(distribuicao[nome], estimativa, nivel, metodo, jackknife.get(nome))
+        resultado[nome] = {
+            "estimativa": estimativa,
+            "inferior": inferior,
+            "superior": superior,
+            "erro_padrao": float(np.nanstd(distribuicao[nome], ddof=1))
+        }
+
+    return resultado
@@ -0,0 +1,348 @@
+"""
+Cache persistente de dados já carregados e limpos.
+
+Cada entrada é identificada pelo hash do conteúdo do arquivo de origem
+(mais as colunas pedidas) e guardada em disco como arquivos ``.npy``
+(colunas limpas), Parquet (DataFrame completo, quando o pyarrow está
+instalado) ou como o próprio arquivo gerado (exportações). O tamanho
+total é limitado com descarte LRU.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+DIRETORIO_PADRAO = os.environ.get(
+    "ANALISE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "sistema_analise")
+)
+
+LIMITE_PADRAO_BYTES = 1024 ** 3  # 1 GB
+
+# Incrementar quando o formato ou a limpeza mudarem
+VERSAO_CACHE = "2"
+
+# Tipos aceitos nas categorias de Owner com dtype object
+_TIPOS_CATEGORIA = {"str": str, "int": int, "float": float, "bool": bool}
+
+
+@functools.lru_cache(maxsize=256)
+def _hash_caminho(caminho, tamanho, mtime_ns, tamanho_bloco):
+    """Hash do arquivo; tamanho e mtime entram só na chave da memória"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def hash_fonte(fonte, tamanho_bloco=1 << 20):
+    """
+    Calcula o hash (BLAKE2b) do conteúdo de um caminho ou objeto de arquivo.
+
+    O hash de um caminho é memorizado por (caminho, tamanho, mtime): o
+    arquivo só é relido quando muda.
+    """
+    if isinstance(fonte, str):
+        info = os.stat(fonte)
+        return _hash_caminho(os.path.abspath(fonte), info.st_size, info.st_mtime_ns, tamanho_bloco)
+
+    h = hashlib.blake2b(digest_size=20)
+
+    if hasattr(fonte, "getbuffer"):
+        h.update(fonte.getbuffer())
+        return h.hexdigest()
+
+    posicao = fonte.tell()
+    fonte.seek(0)
+    for bloco in iter(lambda: fonte.read(tamanho_bloco), b""):
+        h.update(bloco)
+    fonte.seek(posicao)
+    return h.hexdigest()
+
+
+def _fatorar(valores):
+    """
+    Códigos e categorias de um array object, separando valores iguais de
+    tipos diferentes (1, 1.0 e True; None e NaN), que o factorize junta
+    """
+    codigos, categorias = pd.factorize(valores, use_na_sentinel=False)
+    if pd.api.types.infer_dtype(valores, skipna=False) == "string":
+        return codigos, np.asarray(categorias, dtype=object)
+
+    tipos, _ = pd.factorize(np.frompyfunc(type, 1, 1)(valores))
+    _, primeiros, indices = np.unique(
+        tipos.astype(np.int64) * len(categorias) + codigos, return_index=True, return_inverse=True
+    )
+    return indices, valores[primeiros]
+
+
+def _codificar_categorias(valores):
+    """Categorias de dtype object como pares [tipo, valor] serializáveis em JSON"""
+    codificadas = []
+    for valor in valores:
+        if valor is None:
+            codificadas.append(["none", None])
+        elif isinstance(valor, np.generic) and valor.dtype.kind in "biuf":
+            # Escalares numpy mantêm o dtype (int64, float32, ...)
+            codificadas.append([valor.dtype.name, valor.item()])
+        elif type(valor) in _TIPOS_CATEGORIA.values():
+            codificadas.append([type(valor).__name__, valor])
+        else:
+            raise TypeError(f"Categoria de Owner sem codificação no cache: {type(valor).__name__}")
+    return codificadas
+
+
+def _decodificar_categorias(codificadas):
+    categorias = np.empty(len(codificadas), dtype=object)
+    for i, (tipo, valor) in enumerate(codificadas):
+        if tipo == "none":
+            categorias[i] = None
+        elif tipo in _TIPOS_CATEGORIA:
+            categorias[i] = _TIPOS_CATEGORIA[tipo](valor)
+        else:
+            categorias[i] = np.dtype(tipo).type(valor)
+    return categorias
+
+
+class CacheDados:
+    """
+    Cache em disco com descarte LRU limitado por tamanho.
+
+    Parameters
+    ----------
+    diretorio : str
+        Pasta onde as entradas são gravadas.
+    limite_bytes : int
+        Tamanho máximo ocupado pelo cache; entradas menos usadas
+        recentemente são removidas quando o limite é ultrapassado.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, limite_bytes=LIMITE_PADRAO_BYTES):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self.acertos = 0
+        self.falhas = 0
+
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    # ----------------------------
+    # Chaves e entradas
+    # ----------------------------
+    def chave(self, fonte, *partes):
+        """Chave da entrada: hash do conteúdo + parâmetros de leitura"""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(VERSAO_CACHE.encode())
+        h.update(hash_fonte(fonte).encode())
+        for parte in partes:
+            h.update(b"\0" + str(parte).encode())
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave)
+
+    def _tocar(self, caminho):
+        """Marca a entrada como usada agora (ordem do LRU)"""
+        agora = time.time()
+        os.utime(caminho, (agora, agora))
+
+    def _gravar(self, chave, escrever):
+        """
+        Grava a entrada em pasta temporária e publica de forma atômica.
+        A entrada recém-gravada nunca é descartada na mesma chamada, mesmo
+        que sozinha passe do limite: quem a pediu ainda vai usá-la.
+        """
+        temporario = tempfile.mkdtemp(dir=self.diretorio, prefix=".tmp-")
+        try:
+            escrever(temporario)
+            destino = self._caminho(chave)
+            if os.path.exists(destino):
+                shutil.rmtree(destino, ignore_errors=True)
+            os.replace(temporario, destino)
+        except Exception:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+
+        self._descartar(manter=destino)
+
+    # ----------------------------
+    # Colunas limpas (.npy)
+    # ----------------------------
+    def obter_colunas(self, chave):
+        """Retorna o dicionário de colunas em cache ou None"""
+        caminho = self._caminho(chave)
+
+        if not os.path.isfile(os.path.join(caminho, "x.npy")):
+            self.falhas += 1
+            return None
+
+        dados = {
+            "x": np.load(os.path.join(caminho, "x.npy")),
+            "y": np.load(os.path.join(caminho, "y.npy")),
+            "owner": None
+        }
+
+        nativo = os.path.join(caminho, "owner.npy")
+        codigos = os.path.join(caminho, "owner_codigos.npy")
+        if os.path.isfile(nativo):
+            dados["owner"] = np.load(nativo)
+        elif os.path.isfile(codigos):
+            with open(os.path.join(caminho, "owner_categorias.json"), encoding="utf-8") as f:
+                categorias = _decodificar_categorias(json.load(f))
+            dados["owner"] = categorias[np.load(codigos)]
+
+        estatisticas = os.path.join(caminho, "estatisticas.json")
+        if os.path.isfile(estatisticas):
+            with open(estatisticas, encoding="utf-8") as f:
+                dados["estatisticas"] = json.load(f)
+
+        self._tocar(caminho)
+        self.acertos += 1
+        return dados
+
+    def guardar_colunas(self, chave, dados):
+        """
+        Grava x, y, owner e estatísticas de leitura.
+
+        Owner com dtype numpy nativo (números, datas, texto) vai direto
+        para ``.npy``; com dtype object, é codificado por categorias com o
+        tipo de cada valor, para que uma leitura do cache devolva os
+        mesmos valores que a leitura original. Se alguma categoria não
+        for texto, número, booleano ou nulo, a entrada não é criada.
+        """
+        owner = dados.get("owner")
+        categorias = None
+        if owner is not None and np.asarray(owner).dtype == object:
+            indices, valores = _fatorar(np.asarray(owner))
+            try:
+                categorias = _codificar_categorias(valores)
+            except TypeError:
+                return False
+
+        def escrever(pasta):
+            np.save(os.path.join(pasta, "x.npy"), np.ascontiguousarray(dados["x"], dtype=np.float64))
+            np.save(os.path.join(pasta, "y.npy"), np.ascontiguousarray(dados["y"], dtype=np.float64))
+
+            if categorias is not None:
+                np.save(os.path.join(pasta, "owner_codigos.npy"), indices.astype(np.int32))
+                with open(os.path.join(pasta, "owner_categorias.json"), "w", encoding="utf-8") as f:
+                    json.dump(categorias, f)
+            elif owner is not None:
+                np.save(os.path.join(pasta, "owner.npy"), np.asarray(owner))
+
+            if dados.get("estatisticas") is not None:
+                with open(os.path.join(pasta, "estatisticas.json"), "w", encoding="utf-8") as f:
+                    json.dump(dados["estatisticas"], f)
+
+        self._gravar(chave, escrever)
+        return True
+
+    # ----------------------------
+    # DataFrame completo (Parquet)
+    # ----------------------------
+    def obter_frame(self, chave):
+        """Retorna o DataFrame em cache ou None"""
+        caminho = os.path.join(self._caminho(chave), "dados.parquet")
+
+        if not os.path.isfile(caminho):
+            self.falhas += 1
+            return None
+
+        df = pd.read_parquet(caminho)
+        self._tocar(self._caminho(chave))
+        self.acertos += 1
+        return df
+
+    def guardar_frame(self, chave, df):
+        """
+        Grava o DataFrame em Parquet. Sem pyarrow (dependência opcional)
+        ou com colunas de tipos mistos, a entrada simplesmente não é criada.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+
+        def escrever(pasta):
+            df.to_parquet(os.path.join(pasta, "dados.parquet"), index=False)
+
+        try:
+            self._gravar(chave, escrever)
+        except Exception:
+            return False
+        return True
+
+    # ----------------------------
+    # Arquivos gerados (exportações)
+    # ----------------------------
+    def obter_arquivo(self, chave, nome, gerar):
+        """
+        Caminho do arquivo ``nome`` da entrada ``chave``. Se ainda não
+        existir, é criado por ``gerar(caminho)`` e publicado de forma
+        atômica; depois disso só é reaproveitado.
+        """
+        caminho = os.path.join(self._caminho(chave), nome)
+
+        if os.path.isfile(caminho):
+            self._tocar(self._caminho(chave))
+            self.acertos += 1
+            return caminho
+
+        self.falhas += 1
+        self._gravar(chave, lambda pasta: gerar(os.path.join(pasta, nome)))
+        return caminho
+
+    # ----------------------------
+    # Manutenção
+    # ----------------------------
+    def _entradas(self):
+        """Lista (mtime, bytes, caminho) de cada entrada"""
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            caminho = os.path.join(self.diretorio, nome)
+            if nome.startswith(".") or not os.path.isdir(caminho):
+                continue
+            tamanho = sum(
+                os.path.getsize(os.path.join(caminho, arq))
+                for arq in os.listdir(caminho)
+            )
+            entradas.append((os.path.getmtime(caminho), tamanho, caminho))
+        return entradas
+
+    def _descartar(self, manter=None):
+        """Remove as entradas menos usadas (exceto ``manter``) até caber no limite"""
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+
+        for _, tamanho, caminho in entradas:
+            if total <= self.limite_bytes:
+                break
+            if caminho == manter:
+                continue
+            shutil.rmtree(caminho, ignore_errors=True)
+            total -= tamanho
+
+    def purgar(self):
+        """Remove todas as entradas do cache"""
+        for nome in os.listdir(self.diretorio):
+            caminho = os.path.join(self.diretorio, nome)
+            if os.path.isdir(caminho):
+                shutil.rmtree(caminho, ignore_errors=True)
+
+    def estatisticas(self):
+        """Acertos, falhas, número de entradas e bytes ocupados"""
+        entradas = self._entradas()
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "entradas": len(entradas),
+            "bytes": sum(tamanho for _, tamanho, _ in entradas)
+        }
@@ -0,0 +1,234 @@
+"""
+Armazenamento colunar em disco para conjuntos maiores que a memória.
+
+As colunas X e Y já limpas são gravadas uma única vez como arquivos
+float64 contíguos e reabertas com ``np.memmap``. As funções deste
+módulo percorrem essas colunas em blocos, mantendo o uso de memória
+limitado ao tamanho do bloco independentemente do tamanho do dataset.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+TAMANHO_BLOCO_PADRAO = 1_000_000
+
+
+class ColumnStore:
+    """
+    Colunas X e Y float64 mapeadas em memória a partir de um diretório.
+
+    Use ``ColumnStore.criar`` para converter blocos (por exemplo os de
+    ``DataLoader.iterar_chunks``) e ``ColumnStore.abrir`` para reabrir.
+    """
+
+    ARQUIVO_META = "meta.json"
+
+    def __init__(self, diretorio, coluna_x, coluna_y, n, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+        self.diretorio = diretorio
+        self.coluna_x = coluna_x
+        self.coluna_y = coluna_y
+        self.n = n
+        self.tamanho_bloco = tamanho_bloco
+        self.columns = [coluna_x, coluna_y]
+
+        self._x = self._mapear("x.f64")
+        self._y = self._mapear("y.f64")
+
+    def _mapear(self, nome):
+        if self.n == 0:
+            return np.empty(0, dtype=np.float64)
+        return np.memmap(os.path.join(self.diretorio, nome), dtype=np.float64, mode="r", shape=(self.n,))
+
+    # ----------------------------
+    # Criação / abertura
+    # ----------------------------
+    @classmethod
+    def criar(cls, diretorio, blocos, coluna_x, coluna_y, assinatura=None):
+        """
+        Grava os blocos ``{"x": ..., "y": ...}`` em disco e abre o store.
+
+        Parameters
+        ----------
+        diretorio : str
+            Pasta de destino (criada se não existir).
+        blocos : iterable of dict
+            Blocos com arrays ``x`` e ``y`` já limpos.
+        assinatura : str, optional
+            Identificação da fonte, usada por ``abrir`` para reaproveitar
+            uma conversão anterior.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        meta = os.path.join(diretorio, cls.ARQUIVO_META)
+
+        # Sem meta.json o diretório não é um store válido: uma gravação
+        # interrompida nunca deixa um meta antigo apontando para colunas novas
+        if os.path.exists(meta):
+            os.remove(meta)
+
+        n = 0
+        temporarios = {nome: os.path.join(diretorio, f"{nome}.tmp") for nome in ("x.f64", "y.f64")}
+        try:
+            with open(temporarios["x.f64"], "wb") as fx, open(temporarios["y.f64"], "wb") as fy:
+                for bloco in blocos:
+                    np.ascontiguousarray(bloco["x"], dtype=np.float64).tofile(fx)
+                    np.ascontiguousarray(bloco["y"], dtype=np.float64).tofile(fy)
+                    n += len(bloco["x"])
+
+            # Substituição atômica: mapeamentos já abertos continuam no arquivo antigo
+            for nome, temporario in temporarios.items():
+                os.replace(temporario, os.path.join(diretorio, nome))
+        finally:
+            for temporario in temporarios.values():
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+
+        # meta.json por último: só então o store passa a existir para ``abrir``
+        with open(f"{meta}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"coluna_x": coluna_x, "coluna_y": coluna_y, "n": n, "assinatura": assinatura}, f)
+        os.replace(f"{meta}.tmp", meta)
+
+        return cls(diretorio, coluna_x, coluna_y, n)
+
+    @classmethod
+    def abrir(cls, diretorio, assinatura=None):
+        """
+        Abre um store existente. Retorna None se não houver store no
+        diretório ou se a assinatura informada não corresponder.
+        """
+        caminho = os.path.join(diretorio, cls.ARQUIVO_META)
+        if not os.path.isfile(caminho):
+            return None
+
+        with open(caminho, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if assinatura is not None and meta.get("assinatura") != assinatura:
+            return None
+
+        return cls(diretorio, meta["coluna_x"], meta["coluna_y"], meta["n"])
+
+    # ----------------------------
+    # Acesso
+    # ----------------------------
+    def __len__(self):
+        return self.n
+
+    @property
+    def empty(self):
+        return self.n == 0
+
+    def coluna(self, nome):
+        """Array mapeado (somente leitura) de uma das colunas"""
+        if nome == self.coluna_x:
+            return self._x
+        if nome == self.coluna_y:
+            return self._y
+        raise ValueError(f"A coluna '{nome}' não existe no ColumnStore.")
+
+    def iterar_blocos(self, tamanho_bloco=None):
+        """Gera pares (x, y) de visões do mapeamento, bloco a bloco"""
+        tamanho = tamanho_bloco or self.tamanho_bloco
+        for inicio in range(0, self.n, tamanho):
+            yield self._x[inicio:inicio + tamanho], self._y[inicio:inicio + tamanho]
+
+    def head(self, n=10):
+        """Primeiras linhas como DataFrame"""
+        return pd.DataFrame({
+            self.coluna_x: np.array(self._x[:n]),
+            self.coluna_y: np.array(self._y[:n])
+        })
+
+
+# ================================
+# REDUÇÕES EM BLOCOS
+# ================================
+def resumo_blocos(gerar_blocos):
+    """
+    Quantidade, mínimo, máximo e média de uma sequência de blocos 1D.
+
+    ``gerar_blocos`` é uma função sem argumentos que devolve um iterador
+    novo de arrays a cada chamada.
+    """
+    n = 0
+    soma = 0.0
+    minimo, maximo = np.inf, -np.inf
+
+    for bloco in gerar_blocos():
+        if len(bloco) == 0:
+            continue
+        n += len(bloco)
+        soma += float(np.sum(bloco, dtype=np.float64))
+        minimo = min(minimo, float(np.min(bloco)))
+        maximo = max(maximo, float(np.max(bloco)))
+
+    if n == 0:
+        return {"quantidade": 0, "minimo": np.nan, "maximo": np.nan, "media": np.nan}
+
+    return {"quantidade": n, "minimo": minimo, "maximo": maximo, "media": soma / n}
+
+
+def _valor_na_posicao(gerar_blocos, k, minimo, maximo, bins, limite_memoria):
+    """
+    Valor de posição ``k`` (0-based) na ordem crescente, sem carregar
+    tudo em memória: refina por histogramas até o intervalo caber em
+    ``limite_memoria`` valores e então ordena só esse intervalo.
+    """
+    lo, hi, fechado = minimo, maximo, True
+
+    while True:
+        if lo == hi or (not fechado and hi <= np.nextafter(lo, np.inf)):
+            return lo
+
+        bordas = np.linspace(lo, hi, bins + 1)
+        contagem = np.zeros(bins, dtype=np.int64)
+        abaixo = 0
+
+        for bloco in gerar_blocos():
+            abaixo += int(np.count_nonzero(bloco < lo))
+            dentro = bloco[(bloco >= lo) & ((bloco < hi) | (fechado & (bloco == hi)))]
+            idx = np.clip(np.searchsorted(bordas, dentro, side="right") - 1, 0, bins - 1)
+            contagem += np.bincount(idx, minlength=bins)
+
+        total = int(contagem.sum())
+        if total <= limite_memoria:
+            valores = np.concatenate([
+                bloco[(bloco >= lo) & ((bloco < hi) | (fechado & (bloco == hi)))]
+                for bloco in gerar_blocos()
+            ])
+            valores.sort()
+            return float(valores[k - abaixo])
+
+        acumulado = np.cumsum(contagem)
+        i = int(np.searchsorted(acumulado, k - abaixo, side="right"))
+        lo, hi = float(bordas[i]), float(bordas[i + 1])
+        fechado = i == bins - 1 and fechado
+
+
+def quantil_blocos(gerar_blocos, q=0.5, resumo=None, bins=4096, limite_memoria=TAMANHO_BLOCO_PADRAO):
+    """
+    Quantil exato (interpolação linear, como ``pandas.Series.quantile``)
+    calculado em blocos com memória limitada.
+    """
+    if resumo is None:
+        resumo = resumo_blocos(gerar_blocos)
+
+    n = resumo["quantidade"]
+    if n == 0:
+        return np.nan
+
+    posicao = q * (n - 1)
+    k_baixo = int(np.floor(posicao))
+    k_alto = min(k_baixo + 1, n - 1)
+
+    args = (resumo["minimo"], resumo["maximo"], bins, limite_memoria)
+    baixo = _valor_na_posicao(gerar_blocos, k_baixo, *args)
+
+    if k_alto == k_baixo or posicao == k_baixo:
+        return baixo
+
+    alto = _valor_na_posicao(gerar_blocos, k_alto, *args)
+    return baixo + (alto - baixo) * (posicao - k_baixo)
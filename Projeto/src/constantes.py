@@ -0,0 +1,13 @@
+"""
+Opções do CLI compartilhadas entre módulos.
+
+Só constantes, sem dependências: ``main.py`` monta o parser com elas
+sem importar o pipeline, os relatórios ou o perfil.
+"""
+
+MODELOS_DISPONIVEIS = ("linear", "loglog", "theilsen", "theilsen_loglog", "grupos")
+MODELOS_PADRAO = ("linear", "loglog")
+
+FORMATOS_RELATORIO = ("pdf", "xlsx")
+
+FORMATOS_PERFIL = ("chrome", "json")
@@ -1,71 +1,205 @@
+import os
+
 import pandas as pd
 import numpy as np
 
 
+# Tokens tratados como ausentes em qualquer coluna analisada
+VALORES_INVALIDOS = ["Not Specified", "not specified", "NA", "N/A", "", " "]
+
+TAMANHO_CHUNK_PADRAO = 100_000
+
+
 class DataLoader:
-    def __init__(self, fonte_dados):
+    def __init__(self, fonte_dados, cache=None):
         """
-        fonte_dados: pode ser caminho do arquivo (str) ou objeto BytesIO (Colab)
+        fonte_dados: pode ser caminho do arquivo (str), objeto BytesIO (Colab),
+            banco SQLite (.db, .sqlite, .sqlite3, script .sql) ou FonteSQL
+        cache: instância opcional de CacheDados para reaproveitar leituras
+            (não usado com fontes SQL: o banco pode mudar entre leituras)
         """
         self.fonte = fonte_dados
+        self.cache = cache
         self.df = None
+        self._fonte_sql = None
+
+    def _usa_cache(self):
+        return self.cache is not None and self._formato() != "sql"
+
+    def _sql(self):
+        """FonteSQL da fonte (criada na primeira vez para caminhos e uploads)"""
+        if self._fonte_sql is None:
+            from .sql_source import FonteSQL
+            self._fonte_sql = self.fonte if isinstance(self.fonte, FonteSQL) else FonteSQL(self.fonte)
+        return self._fonte_sql
 
     def carregar(self):
-        """Carrega arquivo Excel"""
-        try:
-            self.df = pd.read_excel(self.fonte)
-        except Exception as e:
-            raise ValueError(f"Erro ao carregar arquivo: {e}")
+        """Carrega a fonte completa (Excel, CSV, JSON ou SQL, pela extensão)"""
+        chave = None
+        if self._usa_cache():
+            chave = self.cache.chave(self.fonte, "frame")
+            self.df = self.cache.obter_frame(chave)
+
+        if self.df is None:
+            try:
+                if hasattr(self.fonte, "seek"):
+                    self.fonte.seek(0)
+                formato = self._formato()
+                if formato == "sql":
+                    self.df = self._sql().ler()
+                elif formato == "csv":
+                    self.df = pd.read_csv(self.fonte)
+                elif formato == "json":
+                    self.df = pd.read_json(self.fonte)
+                else:
+                    self.df = pd.read_excel(self.fonte)
+            except Exception as e:
+                raise ValueError(f"Erro ao carregar arquivo: {e}")
+
+            if chave is not None and not self.df.empty:
+                self.cache.guardar_frame(chave, self.df)
 
         if self.df is None or self.df.empty:
             raise ValueError("Arquivo carregado está vazio.")
 
         return self.df
 
-    def limpar(self, col_x, col_y):
-        """Limpeza e preparação dos dados"""
+    def limpar(self, col_x, col_y, col_owner="Owner"):
+        """
+        Limpeza e preparação dos dados.
+
+        Apenas X, Y e Owner são tratados, com operações vetorizadas
+        (``str.strip`` e ``isin`` sobre os tokens inválidos); as demais
+        colunas permanecem como foram carregadas.
+        """
 
         if self.df is None:
             raise ValueError("Dados não carregados. Execute carregar() primeiro.")
 
-        # Criar cópia para evitar warnings
-        df = self.df.copy()
-
-        # Normalizar strings (remove espaços)
-        df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-
-        # Valores inválidos
-        invalidos = ["Not Specified", "not specified", "NA", "N/A", "", " "]
-        df.replace(invalidos, np.nan, inplace=True)
-
         # Verificar colunas
         for col in [col_x, col_y]:
-            if col not in df.columns:
+            if col not in self.df.columns:
                 raise ValueError(f"Coluna '{col}' não encontrada no dataset.")
 
-        # Converter para numérico
-        df[col_x] = pd.to_numeric(df[col_x], errors='coerce')
-        df[col_y] = pd.to_numeric(df[col_y], errors='coerce')
+        # Converter para numérico (strip + tokens inválidos -> NaN)
+        x = self.para_numerico(self.df[col_x])
+        y = self.para_numerico(self.df[col_y])
 
-        # Remover nulos
-        df.dropna(subset=[col_x, col_y], inplace=True)
+        # Remover nulos (cópia rasa: só as colunas tratadas são substituídas)
+        validos = ~(np.isnan(x) | np.isnan(y))
+        df = self.df.loc[validos].copy(deep=False)
+        df[col_x] = x[validos]
+        df[col_y] = y[validos]
 
         if df.empty:
             raise ValueError("Após limpeza, não restaram dados válidos.")
 
+        if col_owner in df.columns:
+            df[col_owner] = self._limpar_owner(df[col_owner])
+
         self.df = df
         return self.df
 
-    def filtrar_owner(self):
-        """Filtra dados por Owner (se existir)"""
+    @staticmethod
+    def _limpar_owner(serie):
+        """Owner textual sem espaços nas pontas e com os tokens inválidos como NaN"""
+        if pd.api.types.is_numeric_dtype(serie):
+            return serie
+        return DataLoader.normalizar_owner(serie).to_numpy(dtype=object, na_value=np.nan)
+
+    @staticmethod
+    def normalizar_owner(serie):
+        """
+        Owner como texto sem espaços nas pontas e com os tokens inválidos
+        como ``pd.NA``: a forma comparada com o filtro ``owner`` em todos
+        os caminhos (``filtrar_owner``, ``iterar_chunks`` e FonteSQL).
+        """
+        texto = pd.Series(serie).astype("string").str.strip()
+        return texto.mask(texto.isin(VALORES_INVALIDOS))
+
+    @staticmethod
+    def linhas_do_owner(serie, owner):
+        """Máscara booleana das linhas de ``owner``, ambos normalizados"""
+        alvo = DataLoader.normalizar_owner([owner])[0]
+        if pd.isna(alvo):
+            return np.zeros(len(serie), dtype=bool)
+        return (DataLoader.normalizar_owner(serie) == alvo).to_numpy(dtype=bool, na_value=False)
+
+    def sessao(self, col_x, col_y, col_owner="Owner", owner=None):
+        """
+        ``SessaoAnalise`` sobre os dados limpos, compartilhando a memória
+        das colunas X e Y (execute ``limpar`` antes).
+
+        Sem ``carregar`` (fontes SQL ou análises sobre um ColumnStore),
+        lê direto da fonte só X, Y e Owner com ``carregar_colunas``;
+        ``owner`` filtra na leitura.
+        """
+        from .session import SessaoAnalise
+
+        if self.df is not None:
+            return SessaoAnalise.de_dataframe(self.df, col_x, col_y, col_owner)
+
+        dados = self.carregar_colunas(col_x, col_y, col_owner, owner=owner)
+        owner_limpo = None
+        if dados["owner"] is not None:
+            owner_limpo = np.asarray(self._limpar_owner(pd.Series(dados["owner"])))
+        return SessaoAnalise(dados["x"], dados["y"], col_x, col_y, owner=owner_limpo)
+
+    def para_column_store(self, col_x, col_y, diretorio, tamanho_chunk=TAMANHO_CHUNK_PADRAO, owner=None):
+        """
+        Converte X e Y limpos para um ColumnStore em disco (memmap float64),
+        só com as linhas de ``owner`` quando informado.
+
+        A conversão é feita uma única vez: se o diretório já contém um
+        store da mesma fonte, colunas e Owner, ele é apenas reaberto.
+        """
+        from .column_store import ColumnStore
+
+        assinatura = None
+        if isinstance(self.fonte, str):
+            info = os.stat(self.fonte)
+            assinatura = f"{os.path.abspath(self.fonte)}|{info.st_size}|{info.st_mtime_ns}|{col_x}|{col_y}"
+            if owner is not None:
+                assinatura += f"|{owner}"
+
+        if assinatura is not None:
+            store = ColumnStore.abrir(diretorio, assinatura)
+            if store is not None and not store.empty:
+                return store
+
+        blocos = self.iterar_chunks(col_x, col_y, tamanho_chunk=tamanho_chunk, owner=owner)
+        store = ColumnStore.criar(diretorio, blocos, col_x, col_y, assinatura)
+
+        if owner is not None and self.estatisticas_leitura["linhas_lidas"] == 0:
+            raise ValueError(f"Nenhum registro para o Owner '{owner}'.")
+        if store.empty:
+            raise ValueError("Após limpeza, não restaram dados válidos.")
+
+        return store
+
+    def filtrar_owner(self, owner=None):
+        """
+        Filtra dados por Owner (se existir).
+
+        Com ``owner`` informado o filtro é aplicado direto, sem perguntas
+        (modo não interativo); caso contrário o Owner é escolhido no terminal.
+        """
 
         if self.df is None:
             raise ValueError("Dados não carregados.")
 
         if "Owner" not in self.df.columns:
+            if owner is not None:
+                raise ValueError("Coluna 'Owner' não encontrada para aplicar o filtro.")
             print("\nColuna 'Owner' não encontrada. Pulando filtro.")
             return self.df
 
+        if owner is not None:
+            self.df = self.df[self.linhas_do_owner(self.df["Owner"], owner)]
+            if self.df.empty:
+                raise ValueError(f"Nenhum registro para o Owner '{owner}'.")
+            return self.df
+
         escolha = input("\nDeseja filtrar por Owner? (s/n): ").strip().lower()
 
         if escolha == 's':
@@ -83,4 +217,346 @@ class DataLoader:
 
             self.df = self.df[self.df["Owner"] == owner_escolhido]
 
-        return self.df
\ No newline at end of file
+        return self.df
+
+    # ================================
+    # LEITURA EM STREAMING
+    # ================================
+    def e_sql(self):
+        """True quando a fonte é um banco SQL (filtros e agregados vão para a consulta)"""
+        return self._formato() == "sql"
+
+    def colunas(self):
+        """
+        Nomes das colunas: do DataFrame carregado ou, em fontes SQL, da
+        própria consulta (sem ler nenhuma linha).
+        """
+        if self.df is not None:
+            return list(self.df.columns)
+        if self.e_sql():
+            return self._sql().colunas()
+        raise ValueError("Dados não carregados. Execute carregar() primeiro.")
+
+    def _formato(self):
+        """Identifica o formato da fonte pela extensão (padrão: Excel)"""
+        nome = self.fonte if isinstance(self.fonte, str) else getattr(self.fonte, "name", "")
+        extensao = os.path.splitext(str(nome))[1].lower()
+
+        # Caminhos de planilha/CSV/JSON não precisam de src.sql_source (sqlite3)
+        if not (isinstance(self.fonte, str) and extensao in (".csv", ".json", ".xls", ".xlsx")):
+            from .sql_source import e_fonte_sql
+            if e_fonte_sql(self.fonte):
+                return "sql"
+
+        if extensao in (".csv", ".json", ".xls"):
+            return extensao[1:]
+        return "xlsx"
+
+    def _abrir_binario(self):
+        """Retorna (arquivo, deve_fechar) posicionado no início da fonte"""
+        if isinstance(self.fonte, str):
+            return open(self.fonte, "rb"), True
+
+        if hasattr(self.fonte, "seek"):
+            self.fonte.seek(0)
+        return self.fonte, False
+
+    def _tamanho_fonte(self):
+        """Tamanho total da fonte em bytes (quando disponível)"""
+        if isinstance(self.fonte, str):
+            return os.path.getsize(self.fonte)
+
+        if hasattr(self.fonte, "getbuffer"):
+            return self.fonte.getbuffer().nbytes
+
+        if hasattr(self.fonte, "size"):
+            return int(self.fonte.size)
+
+        return 0
+
+    def iterar_brutos(self, colunas, tamanho_chunk=TAMANHO_CHUNK_PADRAO):
+        """
+        Lê a fonte em blocos de DataFrames brutos, sem limpeza.
+
+        Cada bloco traz só as ``colunas`` pedidas que existem na fonte
+        (texto como lido; converta com ``para_numerico``). Usado por
+        quem precisa de outras colunas além de X, Y e Owner, como a
+        previsão em lote.
+        """
+        if tamanho_chunk <= 0:
+            raise ValueError("tamanho_chunk deve ser positivo.")
+        return self._chunks_brutos(set(colunas), tamanho_chunk, {})
+
+    def _chunks_brutos(self, colunas, tamanho_chunk, contador, owner=None, col_owner="Owner"):
+        """
+        Gera DataFrames brutos apenas com as colunas pedidas. ``owner``
+        só é aplicado aqui em fontes SQL (filtro no banco).
+        """
+        formato = self._formato()
+
+        if formato == "sql":
+            yield from self._sql().lotes(colunas, tamanho_chunk, owner=owner, col_owner=col_owner)
+
+        elif formato == "csv":
+            arquivo, fechar = self._abrir_binario()
+            contador["arquivo"] = arquivo
+            try:
+                yield from pd.read_csv(
+                    arquivo,
+                    usecols=lambda c: c in colunas,
+                    dtype=object,
+                    keep_default_na=False,
+                    chunksize=tamanho_chunk
+                )
+            finally:
+                if fechar:
+                    arquivo.close()
+
+        elif formato == "json":
+            arquivo, fechar = self._abrir_binario()
+            contador["arquivo"] = arquivo
+            try:
+                primeiro = arquivo.read(1)
+                arquivo.seek(0)
+
+                if primeiro == b"[":
+                    # JSON em array não permite leitura incremental
+                    df = pd.read_json(arquivo, dtype=False)
+                    df = df[[c for c in df.columns if c in colunas]]
+                    for inicio in range(0, len(df), tamanho_chunk):
+                        yield df.iloc[inicio:inicio + tamanho_chunk]
+                else:
+                    for chunk in pd.read_json(arquivo, lines=True, dtype=False, chunksize=tamanho_chunk):
+                        yield chunk[[c for c in chunk.columns if c in colunas]]
+            finally:
+                if fechar:
+                    arquivo.close()
+
+        elif formato == "xls":
+            df = pd.read_excel(self.fonte, usecols=lambda c: c in colunas, dtype=object)
+            contador["bytes"] = self._tamanho_fonte()
+            for inicio in range(0, len(df), tamanho_chunk):
+                yield df.iloc[inicio:inicio + tamanho_chunk]
+
+        else:
+            from openpyxl import load_workbook
+
+            if hasattr(self.fonte, "seek"):
+                self.fonte.seek(0)
+
+            livro = load_workbook(self.fonte, read_only=True, data_only=True)
+            try:
+                linhas = livro.active.iter_rows(values_only=True)
+                cabecalho = next(linhas, None)
+
+                if cabecalho is None:
+                    return
+
+                indices = [i for i, c in enumerate(cabecalho) if c in colunas]
+                nomes = [cabecalho[i] for i in indices]
+                contador["bytes"] = self._tamanho_fonte()
+
+                buffer = []
+                for linha in linhas:
+                    buffer.append([linha[i] if i < len(linha) else None for i in indices])
+                    if len(buffer) >= tamanho_chunk:
+                        yield pd.DataFrame(buffer, columns=nomes, dtype=object)
+                        buffer = []
+
+                if buffer:
+                    yield pd.DataFrame(buffer, columns=nomes, dtype=object)
+            finally:
+                livro.close()
+
+    @staticmethod
+    def para_numerico(serie):
+        """Converte uma série bruta em float64 (tokens inválidos viram NaN)"""
+        if pd.api.types.is_numeric_dtype(serie):
+            return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        texto = serie.astype("string").str.strip()
+        texto = texto.mask(texto.isin(VALORES_INVALIDOS))
+        return pd.to_numeric(texto, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def iterar_chunks(self, col_x, col_y, col_owner="Owner", tamanho_chunk=TAMANHO_CHUNK_PADRAO, owner=None):
+        """
+        Lê a fonte em blocos contendo apenas as colunas X, Y e Owner.
+
+        Cada bloco é um dicionário com arrays NumPy compactos:
+        ``x`` e ``y`` (float64, sem nulos) e ``owner`` (ou None se a
+        coluna não existir). As estatísticas de leitura ficam em
+        ``self.estatisticas_leitura`` e são atualizadas a cada bloco.
+
+        Com ``owner``, só as linhas desse Owner (mesma comparação de
+        ``filtrar_owner``); em fontes SQL o filtro vai para a consulta.
+        """
+        if tamanho_chunk <= 0:
+            raise ValueError("tamanho_chunk deve ser positivo.")
+
+        colunas = {col_x, col_y, col_owner}
+        contador = {}
+        self.estatisticas_leitura = {
+            "linhas_lidas": 0,
+            "linhas_descartadas": 0,
+            "bytes_processados": 0,
+            "chunks": 0
+        }
+        estat = self.estatisticas_leitura
+
+        sql = self._formato() == "sql"
+
+        try:
+            for chunk in self._chunks_brutos(colunas, tamanho_chunk, contador, owner, col_owner):
+                for col in [col_x, col_y]:
+                    if col not in chunk.columns:
+                        raise ValueError(f"Coluna '{col}' não encontrada no dataset.")
+
+                if owner is not None and not sql:
+                    if col_owner not in chunk.columns:
+                        raise ValueError(f"Coluna '{col_owner}' não encontrada para aplicar o filtro.")
+                    chunk = chunk[self.linhas_do_owner(chunk[col_owner], owner)]
+
+                x = self.para_numerico(chunk[col_x])
+                y = self.para_numerico(chunk[col_y])
+                validos = ~(np.isnan(x) | np.isnan(y))
+
+                owner_bloco = None
+                if col_owner in chunk.columns:
+                    owner_bloco = chunk[col_owner].to_numpy()[validos]
+
+                estat["linhas_lidas"] += len(chunk)
+                estat["linhas_descartadas"] += int(len(chunk) - validos.sum())
+                estat["chunks"] += 1
+                if "arquivo" in contador:
+                    # posição no arquivo = bytes já consumidos pelo parser
+                    estat["bytes_processados"] = contador["arquivo"].tell()
+                else:
+                    estat["bytes_processados"] = contador.get("bytes", 0)
+
+                yield {"x": x[validos], "y": y[validos], "owner": owner_bloco}
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro ao carregar arquivo: {e}")
+
+    def carregar_colunas(self, col_x, col_y, col_owner="Owner", tamanho_chunk=TAMANHO_CHUNK_PADRAO, owner=None):
+        """
+        Carrega em modo streaming apenas X, Y e Owner como arrays NumPy
+        (só as linhas de ``owner``, quando informado; ver ``iterar_chunks``).
+
+        Returns
+        -------
+        dict
+            ``x``, ``y`` (float64), ``owner`` (ou None) e ``estatisticas``
+            com linhas lidas, linhas descartadas e bytes processados.
+        """
+        chave = None
+        if self._usa_cache():
+            chave = self.cache.chave(self.fonte, "colunas", col_x, col_y, col_owner, owner)
+            dados = self.cache.obter_colunas(chave)
+            if dados is not None:
+                self.estatisticas_leitura = dados.get("estatisticas", {})
+                dados["estatisticas"] = dict(self.estatisticas_leitura, cache=True)
+                return dados
+
+        partes_x, partes_y, partes_owner = [], [], []
+
+        for bloco in self.iterar_chunks(col_x, col_y, col_owner, tamanho_chunk, owner=owner):
+            partes_x.append(bloco["x"])
+            partes_y.append(bloco["y"])
+            if bloco["owner"] is not None:
+                partes_owner.append(bloco["owner"])
+
+        if owner is not None and self.estatisticas_leitura["linhas_lidas"] == 0:
+            raise ValueError(f"Nenhum registro para o Owner '{owner}'.")
+        if not partes_x or sum(len(p) for p in partes_x) == 0:
+            raise ValueError("Após limpeza, não restaram dados válidos.")
+
+        dados = {
+            "x": np.concatenate(partes_x),
+            "y": np.concatenate(partes_y),
+            "owner": np.concatenate(partes_owner) if partes_owner else None,
+            "estatisticas": dict(self.estatisticas_leitura)
+        }
+
+        if chave is not None:
+            self.cache.guardar_colunas(chave, dados)
+
+        return dados
+
+    def primeiras_linhas(self, col_x, col_y, n=10, col_owner="Owner", owner=None):
+        """
+        Primeiros ``n`` pares válidos de X e Y, lendo só o início da
+        fonte (em SQL, ``fetchmany`` de ``n`` linhas por vez).
+        """
+        blocos = self.iterar_chunks(col_x, col_y, col_owner, tamanho_chunk=n, owner=owner)
+        partes_x, partes_y = [], []
+        try:
+            for bloco in blocos:
+                partes_x.append(bloco["x"])
+                partes_y.append(bloco["y"])
+                if sum(len(p) for p in partes_x) >= n:
+                    break
+        finally:
+            blocos.close()
+
+        return pd.DataFrame({
+            col_x: np.concatenate(partes_x)[:n] if partes_x else np.empty(0),
+            col_y: np.concatenate(partes_y)[:n] if partes_y else np.empty(0)
+        })
+
+    def acumulador(self, col_x, col_y, col_owner="Owner", owner=None, tamanho_chunk=TAMANHO_CHUNK_PADRAO,
+                   exigir_dados=False):
+        """
+        ``StatsAccumulator`` sem quantis de X e Y, sem montar os dados na
+        memória: em fontes SQL os agregados são calculados no próprio
+        banco (``FonteSQL.acumulador``); nas demais, bloco a bloco.
+        As estatísticas de leitura ficam em ``self.estatisticas_leitura``;
+        sem pares válidos o acumulador volta vazio (``n == 0``), ou, com
+        ``exigir_dados``, gera o mesmo erro de ``limpar``/``filtrar_owner``.
+        """
+        from .accumulator import StatsAccumulator
+
+        if self._formato() == "sql":
+            try:
+                acumulador, leitura = self._sql().acumulador(col_x, col_y, owner=owner, col_owner=col_owner)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Erro ao carregar arquivo: {e}")
+            self.estatisticas_leitura = dict(leitura, bytes_processados=0, chunks=0)
+        else:
+            acumulador = StatsAccumulator(quantis=False)
+            for bloco in self.iterar_chunks(col_x, col_y, col_owner, tamanho_chunk, owner=owner):
+                acumulador.atualizar(bloco["x"], bloco["y"])
+
+        if exigir_dados:
+            if owner is not None and self.estatisticas_leitura["linhas_lidas"] == 0:
+                raise ValueError(f"Nenhum registro para o Owner '{owner}'.")
+            if acumulador.n == 0:
+                raise ValueError("Após limpeza, não restaram dados válidos.")
+
+        return acumulador
+
+    def medianas(self, col_x, col_y, col_owner="Owner", owner=None, tamanho_chunk=TAMANHO_CHUNK_PADRAO):
+        """
+        Medianas exatas de X, Y e k = y / x (os valores ausentes de
+        ``acumulador``). Em fontes SQL a ordenação é feita no banco
+        (``FonteSQL.medianas``); nas demais, só X e Y são lidos.
+        """
+        if self._formato() == "sql":
+            try:
+                return self._sql().medianas(col_x, col_y, owner=owner, col_owner=col_owner)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Erro ao carregar arquivo: {e}")
+
+        partes_x, partes_y = [np.empty(0)], [np.empty(0)]
+        for bloco in self.iterar_chunks(col_x, col_y, col_owner, tamanho_chunk, owner=owner):
+            partes_x.append(bloco["x"])
+            partes_y.append(bloco["y"])
+        x, y = np.concatenate(partes_x), np.concatenate(partes_y)
+        k = y[x != 0] / x[x != 0]
+
+        return {nome: float(np.median(v)) if len(v) else np.nan for nome, v in (("x", x), ("y", y), ("k", k))}
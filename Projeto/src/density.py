@@ -0,0 +1,102 @@
+"""
+Redução de pontos para gráficos de dispersão com milhões de linhas.
+
+Duas estratégias com custo O(n) e saída de tamanho limitado:
+
+- ``indices_amostra``: amostragem estratificada por uma grade 2D. Cada
+  célula mantém no máximo ``limite`` pontos, com ``limite`` escolhido para
+  que o total fique perto de ``max_pontos``. Células esparsas (outliers,
+  caudas) são mantidas inteiras e só as regiões densas são afinadas, o
+  que preserva a forma da nuvem.
+- ``grade_densidade``: contagem por célula (histograma 2D) para desenhar
+  um mapa de calor no lugar dos pontos.
+
+Com ``log=True`` a grade é montada em log10, adequada ao gráfico log-log.
+"""
+
+import numpy as np
+
+
+MAX_PONTOS_PADRAO = 20_000
+BINS_AMOSTRA = 128
+BINS_DENSIDADE = 200
+
+
+def _discretizar(valores, bins):
+    minimo, maximo = valores.min(), valores.max()
+    escala = bins / (maximo - minimo) if maximo > minimo else 0.0
+    return np.minimum(((valores - minimo) * escala).astype(np.int64), bins - 1)
+
+
+def _preparar(x, y, log):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    if len(x) != len(y):
+        raise ValueError("x e y devem ter o mesmo tamanho.")
+
+    if log:
+        if (x <= 0).any() or (y <= 0).any():
+            raise ValueError("Valores devem ser positivos para grade log-log.")
+        x, y = np.log10(x), np.log10(y)
+
+    return x, y
+
+
+def indices_amostra(x, y, max_pontos=MAX_PONTOS_PADRAO, bins=BINS_AMOSTRA, log=False, semente=0):
+    """
+    Índices de uma amostra de ~``max_pontos`` pontos que preserva
+    outliers e o formato da distribuição.
+
+    Returns
+    -------
+    numpy.ndarray
+        Índices ordenados; ``arange(n)`` quando n <= max_pontos.
+    """
+    x, y = _preparar(x, y, log)
+    n = len(x)
+
+    if n <= max_pontos:
+        return np.arange(n)
+
+    celulas = _discretizar(x, bins) * bins + _discretizar(y, bins)
+    contagem = np.bincount(celulas, minlength=bins * bins)
+
+    # Maior limite por célula cujo total cabe em max_pontos (busca binária)
+    baixo, alto = 1, int(contagem.max())
+    while baixo < alto:
+        meio = (baixo + alto + 1) // 2
+        if np.minimum(contagem, meio).sum() <= max_pontos:
+            baixo = meio
+        else:
+            alto = meio - 1
+
+    # Cada ponto fica com probabilidade limite / contagem da sua célula:
+    # células com até ``limite`` pontos são mantidas inteiras
+    rng = np.random.default_rng(semente)
+    manter = rng.random(n) * contagem[celulas] < baixo
+
+    # Extremos sempre aparecem no gráfico
+    manter[[x.argmin(), x.argmax(), y.argmin(), y.argmax()]] = True
+
+    return np.flatnonzero(manter)
+
+
+def grade_densidade(x, y, bins=BINS_DENSIDADE, log=False):
+    """
+    Histograma 2D para mapas de calor.
+
+    Returns
+    -------
+    tuple
+        ``(contagem, bordas_x, bordas_y)``, com ``contagem`` no formato
+        (bins_y, bins_x), pronto para ``pcolormesh``/``go.Heatmap``.
+        Com ``log=True`` as bordas estão em log10.
+    """
+    x, y = _preparar(x, y, log)
+
+    if len(x) == 0:
+        raise ValueError("Sem dados para a grade de densidade.")
+
+    contagem, bordas_x, bordas_y = np.histogram2d(x, y, bins=bins)
+    return contagem.T, bordas_x, bordas_y
@@ -0,0 +1,169 @@
+"""
+Exportação de DataFrames em blocos, com memória constante.
+
+Cada formato tem um escritor que recebe blocos de linhas e grava no
+destino assim que os recebe: CSV (opcionalmente .csv.gz), Parquet
+(``pyarrow``, um row group por bloco) e Excel (``xlsxwriter`` no modo
+``constant_memory``, que descarrega cada linha no disco em vez de montar
+a planilha inteira na memória). Os mesmos escritores são usados pela
+previsão em lote (``src.scoring``).
+"""
+
+import gzip
+import os
+
+TAMANHO_BLOCO_PADRAO = 100_000
+
+# Linhas de dados por planilha (o cabeçalho ocupa a primeira)
+LIMITE_LINHAS_EXCEL = 1_048_575
+
+FORMATOS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "csv.gz": "application/gzip",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+class _EscritorCSV:
+    def __init__(self, caminho):
+        compressao = "gzip" if caminho.lower().endswith(".gz") else None
+        self.caminho = caminho
+        self.compressao = compressao
+        self.primeiro = True
+
+    def escrever(self, df):
+        df.to_csv(
+            self.caminho,
+            mode="w" if self.primeiro else "a",
+            header=self.primeiro,
+            index=False,
+            compression=self.compressao
+        )
+        self.primeiro = False
+
+    def fechar(self):
+        if not self.primeiro:
+            return
+        # entrada sem linhas: deixa um arquivo vazio no destino (em .gz,
+        # um membro gzip vazio, que os leitores de gzip aceitam)
+        if self.compressao == "gzip":
+            gzip.open(self.caminho, "wb").close()
+        else:
+            open(self.caminho, "w").close()
+
+
+class _EscritorParquet:
+    def __init__(self, caminho):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Saída Parquet requer o pacote pyarrow.")
+
+        self.caminho = caminho
+        self.escritor = None
+
+    def escrever(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        if self.escritor is None:
+            self.escritor = pq.ParquetWriter(self.caminho, tabela.schema)
+        self.escritor.write_table(tabela)
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+class _EscritorExcel:
+    def __init__(self, caminho):
+        try:
+            import xlsxwriter
+        except ImportError:
+            raise ValueError("Saída Excel requer o pacote xlsxwriter.")
+
+        # NaN/inf viram células de erro em vez de abortar a gravação
+        self.arquivo = xlsxwriter.Workbook(
+            caminho, {"constant_memory": True, "nan_inf_to_errors": True}
+        )
+        self.planilha = self.arquivo.add_worksheet()
+        self.linha = 0
+
+    def escrever(self, df):
+        if self.linha + len(df) > LIMITE_LINHAS_EXCEL:
+            raise ValueError(
+                f"Excel suporta no máximo {LIMITE_LINHAS_EXCEL} linhas; use CSV ou Parquet."
+            )
+
+        if self.linha == 0:
+            self.planilha.write_row(0, 0, [str(col) for col in df.columns])
+
+        # constant_memory exige linhas em ordem crescente
+        for valores in df.itertuples(index=False, name=None):
+            self.linha += 1
+            self.planilha.write_row(self.linha, 0, valores)
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+def abrir_escritor(caminho):
+    """
+    Escritor em blocos para ``caminho`` (formato pela extensão).
+
+    O escritor tem ``escrever(df)``, chamado uma vez por bloco (todos
+    com as mesmas colunas), e ``fechar()``, que deve ser chamado ao fim,
+    mesmo em caso de erro.
+    """
+    nome = caminho.lower()
+    if nome.endswith(".parquet"):
+        return _EscritorParquet(caminho)
+    if nome.endswith((".csv", ".csv.gz")):
+        return _EscritorCSV(caminho)
+    if nome.endswith(".xlsx"):
+        return _EscritorExcel(caminho)
+    raise ValueError("Formato de saída não suportado. Use .csv, .csv.gz, .parquet ou .xlsx.")
+
+
+def exportar(df, caminho, colunas=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Grava ``df`` em ``caminho`` (formato pela extensão), bloco a bloco.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+    caminho : str
+        Destino ``.xlsx``, ``.csv``, ``.csv.gz`` ou ``.parquet``.
+    colunas : list of str, optional
+        Colunas exportadas (padrão: todas).
+    tamanho_bloco : int
+        Linhas por bloco; limita os temporários de cada escrita.
+
+    Returns
+    -------
+    str
+        O próprio ``caminho``.
+    """
+    if tamanho_bloco <= 0:
+        raise ValueError("tamanho_bloco deve ser positivo.")
+
+    if colunas is not None:
+        faltando = [col for col in colunas if col not in df.columns]
+        if faltando:
+            raise ValueError(f"Colunas não encontradas: {', '.join(map(str, faltando))}")
+
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    escritor = abrir_escritor(caminho)
+    try:
+        for inicio in range(0, len(df), tamanho_bloco):
+            bloco = df.iloc[inicio:inicio + tamanho_bloco]
+            escritor.escrever(bloco if colunas is None else bloco[colunas])
+    finally:
+        escritor.fechar()
+
+    return caminho
@@ -0,0 +1,157 @@
+"""
+Análise agrupada (por Owner ou qualquer coluna categórica).
+
+Todas as estatísticas de todos os grupos saem de operações vetorizadas
+sobre os códigos dos grupos: somas segmentadas com ``np.bincount`` (em
+duas passadas, centradas na média de cada grupo, para estabilidade) e
+uma ordenação ``np.lexsort`` por (grupo, valor) para mínimos, máximos e
+medianas exatas. Não há laço Python por grupo, então o custo é
+O(n log n) mesmo com centenas de milhares de grupos.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .session import SessaoAnalise
+
+
+def _momentos_grupos(codigos, x, y, n_grupos):
+    """n, médias, Sxx, Syy e Sxy por grupo (segment sums centradas)"""
+    n = np.bincount(codigos, minlength=n_grupos).astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media_x = np.bincount(codigos, weights=x, minlength=n_grupos) / n
+        media_y = np.bincount(codigos, weights=y, minlength=n_grupos) / n
+
+    dx = x - media_x[codigos]
+    dy = y - media_y[codigos]
+
+    sxx = np.bincount(codigos, weights=dx * dx, minlength=n_grupos)
+    syy = np.bincount(codigos, weights=dy * dy, minlength=n_grupos)
+    sxy = np.bincount(codigos, weights=dx * dy, minlength=n_grupos)
+
+    return n, media_x, media_y, sxx, syy, sxy
+
+
+def _ajuste_grupos(n, media_x, media_y, sxx, syy, sxy):
+    """Pearson, coeficiente, intercepto e R² de cada grupo"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pearson = sxy / np.sqrt(sxx * syy)
+        coef = sxy / sxx
+        intercept = media_y - coef * media_x
+        r2 = np.where(syy == 0, 1.0, pearson ** 2)
+
+    insuficiente = (n < 2) | (sxx <= 0)
+    for valores in (coef, intercept, r2):
+        valores[insuficiente] = np.nan
+
+    return pearson, coef, intercept, r2
+
+
+def _ordem_grupos(codigos, valores, n_grupos):
+    """
+    Mínimo, máximo e mediana exata por grupo a partir de uma única
+    ordenação por (grupo, valor).
+    """
+    ordem = np.lexsort((valores, codigos))
+    ordenados = valores[ordem]
+
+    contagem = np.bincount(codigos, minlength=n_grupos)
+    fim = np.cumsum(contagem)
+    inicio = fim - contagem
+
+    minimo = np.full(n_grupos, np.nan)
+    maximo = np.full(n_grupos, np.nan)
+    mediana = np.full(n_grupos, np.nan)
+
+    tem = contagem > 0
+    minimo[tem] = ordenados[inicio[tem]]
+    maximo[tem] = ordenados[fim[tem] - 1]
+
+    baixo = inicio[tem] + (contagem[tem] - 1) // 2
+    alto = inicio[tem] + contagem[tem] // 2
+    mediana[tem] = (ordenados[baixo] + ordenados[alto]) / 2
+
+    return minimo, maximo, mediana
+
+
+def analisar_grupos(df, col_x, col_y, col_grupo="Owner", minimo_linhas=1):
+    """
+    Estatísticas descritivas, Pearson, razão k e regressões linear e
+    log-log de cada grupo em uma única tabela.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame ou SessaoAnalise
+        Dados já limpos (X e Y numéricos). Na sessão os grupos são a
+        coluna ``owner``.
+    col_grupo : str
+        Coluna categórica que define os grupos (padrão: Owner).
+    minimo_linhas : int
+        Grupos com menos linhas válidas são descartados do resultado.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por grupo, ordenada pelo número de registros.
+    """
+    if isinstance(df, SessaoAnalise):
+        if df.owner is None:
+            raise ValueError(f"Coluna '{col_grupo}' não encontrada no dataset.")
+        x, y = df.coluna(col_x), df.coluna(col_y)
+        codigos, grupos = pd.factorize(pd.Series(df.owner))
+    else:
+        for col in [col_x, col_y, col_grupo]:
+            if col not in df.columns:
+                raise ValueError(f"Coluna '{col}' não encontrada no dataset.")
+
+        x = df[col_x].to_numpy(dtype=np.float64)
+        y = df[col_y].to_numpy(dtype=np.float64)
+        codigos, grupos = pd.factorize(df[col_grupo])
+
+    validos = (codigos >= 0) & ~np.isnan(x) & ~np.isnan(y)
+    codigos, x, y = codigos[validos], x[validos], y[validos]
+    n_grupos = len(grupos)
+
+    resultado = {col_grupo: np.asarray(grupos, dtype=object)}
+
+    # Descritivas de X e Y
+    n, media_x, media_y, sxx, syy, sxy = _momentos_grupos(codigos, x, y, n_grupos)
+    resultado["quantidade"] = n.astype(np.int64)
+
+    for nome, valores, media in ((col_x, x, media_x), (col_y, y, media_y)):
+        minimo, maximo, mediana = _ordem_grupos(codigos, valores, n_grupos)
+        resultado[f"{nome}_minimo"] = minimo
+        resultado[f"{nome}_maximo"] = maximo
+        resultado[f"{nome}_media"] = media
+        resultado[f"{nome}_mediana"] = mediana
+
+    # Pearson e regressão linear
+    pearson, coef, intercept, r2 = _ajuste_grupos(n, media_x, media_y, sxx, syy, sxy)
+    resultado["pearson"] = pearson
+    resultado["coeficiente"] = coef
+    resultado["intercepto"] = intercept
+    resultado["r2"] = r2
+
+    # Razão k = y / x (x != 0)
+    nao_zero = x != 0
+    k_minimo, k_maximo, k_mediana = _ordem_grupos(codigos[nao_zero], y[nao_zero] / x[nao_zero], n_grupos)
+    resultado["k_minimo"] = k_minimo
+    resultado["k_maximo"] = k_maximo
+    resultado["k_mediana"] = k_mediana
+
+    # Regressão log-log (pares positivos)
+    positivos = (x > 0) & (y > 0)
+    momentos_log = _momentos_grupos(
+        codigos[positivos], np.log10(x[positivos]), np.log10(y[positivos]), n_grupos
+    )
+    _, coef_log, intercept_log, r2_log = _ajuste_grupos(*momentos_log)
+    resultado["n_loglog"] = momentos_log[0].astype(np.int64)
+    resultado["coeficiente_loglog"] = coef_log
+    resultado["intercepto_loglog"] = intercept_log
+    resultado["r2_loglog"] = r2_log
+
+    tabela = pd.DataFrame(resultado)
+    tabela = tabela[tabela["quantidade"] >= max(minimo_linhas, 1)]
+
+    return tabela.sort_values("quantidade", ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,134 @@
+"""
+Histogramas pré-agregados no servidor.
+
+``Histograma`` conta os valores em uma única passada vetorizada
+(``np.bincount``) sobre uma grade fina de ``bins_base`` intervalos, em
+escala linear ou log10 (caudas pesadas, como a razão k), e monta uma
+pirâmide de resoluções somando intervalos vizinhos dois a dois. Cada
+consulta (número de bins, zoom) reaproveita as contagens: escolhe o
+nível mais grosso com resolução suficiente e agrega por somas
+acumuladas, em O(bins). Só as contagens e as bordas vão para o gráfico.
+"""
+
+import numpy as np
+
+
+BINS_BASE_PADRAO = 4096
+ESCALAS = ("linear", "log")
+
+# Intervalos do nível escolhido por bin pedido: limita a diferença de
+# largura entre bins, que são alinhados à grade do nível
+_FATOR_RESOLUCAO = 8
+_MENOR_NIVEL = 8
+
+
+class Histograma:
+    """
+    Pirâmide de contagens de uma coluna.
+
+    Parameters
+    ----------
+    valores : array-like
+        Dados; NaN e infinitos são ignorados (e, na escala log, valores <= 0).
+    escala : str
+        "linear" ou "log" (intervalos igualmente espaçados em log10).
+    bins_base : int
+        Resolução do nível mais fino (arredondada para potência de 2).
+    """
+
+    def __init__(self, valores, escala="linear", bins_base=BINS_BASE_PADRAO):
+        if escala not in ESCALAS:
+            raise ValueError(f"Escala inválida: '{escala}'. Use {', '.join(ESCALAS)}.")
+
+        valores = np.asarray(valores, dtype=np.float64)
+        validos = np.isfinite(valores)
+        if escala == "log":
+            validos &= valores > 0
+
+        self.escala = escala
+        self.total = int(validos.sum())
+        self.descartados = int(len(valores) - self.total)
+
+        if self.total == 0:
+            raise ValueError("Sem valores válidos para o histograma.")
+
+        dados = valores[validos] if not validos.all() else valores
+        if escala == "log":
+            dados = np.log10(dados)
+
+        inicio, fim = float(dados.min()), float(dados.max())
+        if fim <= inicio:
+            inicio, fim = inicio - 0.5, fim + 0.5
+
+        bins_base = 1 << max(int(np.ceil(np.log2(max(bins_base, _MENOR_NIVEL)))), 3)
+        indices = ((dados - inicio) * (bins_base / (fim - inicio))).astype(np.int64)
+        np.minimum(indices, bins_base - 1, out=indices)
+
+        contagem = np.bincount(indices, minlength=bins_base)
+
+        self.inicio = inicio
+        self.fim = fim
+        self.niveis = [contagem]
+        while len(contagem) > _MENOR_NIVEL:
+            contagem = contagem.reshape(-1, 2).sum(axis=1)
+            self.niveis.append(contagem)
+
+        # Somas acumuladas por nível: cada consulta sai de diferenças
+        self._acumulados = [np.concatenate(([0], np.cumsum(c))) for c in self.niveis]
+
+    def _transformar(self, valor):
+        return np.log10(valor) if self.escala == "log" else float(valor)
+
+    def limites(self):
+        """Menor e maior valor (unidades dos dados)"""
+        if self.escala == "log":
+            return 10 ** self.inicio, 10 ** self.fim
+        return self.inicio, self.fim
+
+    def contagens(self, bins=30, intervalo=None):
+        """
+        Contagens para ``bins`` intervalos dentro de ``intervalo``.
+
+        Parameters
+        ----------
+        bins : int
+            Número de intervalos desejado. Em zooms além da resolução do
+            nível mais fino o resultado pode ter menos intervalos.
+        intervalo : tuple, optional
+            (mínimo, máximo) em unidades dos dados; padrão: todos os dados.
+
+        Returns
+        -------
+        tuple
+            ``(contagens, bordas)``; ``bordas`` tem len(contagens) + 1
+            valores em unidades dos dados (potências de 10 na escala log).
+        """
+        if bins < 1:
+            raise ValueError("bins deve ser positivo.")
+
+        baixo, alto = self.inicio, self.fim
+        if intervalo is not None:
+            baixo = max(self._transformar(intervalo[0]), self.inicio)
+            alto = min(self._transformar(intervalo[1]), self.fim)
+            if alto <= baixo:
+                raise ValueError("Intervalo fora dos dados.")
+
+        # Nível mais grosso que ainda tem resolução suficiente no intervalo
+        for nivel in range(len(self.niveis) - 1, -1, -1):
+            largura = (self.fim - self.inicio) / len(self.niveis[nivel])
+            if (alto - baixo) / largura >= _FATOR_RESOLUCAO * bins or nivel == 0:
+                break
+
+        tamanho = len(self.niveis[nivel])
+        i0 = min(int(np.floor((baixo - self.inicio) / largura)), tamanho - 1)
+        i1 = max(int(np.ceil((alto - self.inicio) / largura)), i0 + 1)
+        i1 = min(i1, tamanho)
+
+        cortes = np.unique(np.round(np.linspace(i0, i1, min(bins, i1 - i0) + 1)).astype(np.int64))
+        contagens = np.diff(self._acumulados[nivel][cortes])
+        bordas = self.inicio + cortes * largura
+
+        if self.escala == "log":
+            bordas = 10 ** bordas
+
+        return contagens, bordas
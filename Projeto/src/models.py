@@ -1,16 +1,134 @@
+import json
+from datetime import datetime, timezone
+
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+from .accumulator import StatsAccumulator, _Momentos
+from .bootstrap import bootstrap
+from .column_store import ColumnStore
+from .robust import inclinacao_mediana
+from .session import SessaoAnalise
+
+
+def _acumular(df, col_x, col_y):
+    """Estatísticas suficientes de (x, y) em uma passada (DataFrame, ColumnStore ou sessão)"""
+    if isinstance(df, StatsAccumulator):
+        return df  # já acumulado (ex.: arquivo lido em blocos)
+
+    if isinstance(df, SessaoAnalise):
+        return df.acumulador  # compartilhado com o analisador
+
+    if isinstance(df, ColumnStore):
+        return StatsAccumulator.de_blocos(df.iterar_blocos(), quantis=False)
+
+    return StatsAccumulator.de_arrays(
+        df[col_x].to_numpy(dtype=float),
+        df[col_y].to_numpy(dtype=float),
+        quantis=False
+    )
+
+
+def _arrays(df, col_x, col_y):
+    """Colunas x e y como arrays (visões quando possível)"""
+    if isinstance(df, SessaoAnalise):
+        return df.x, df.y
+
+    if isinstance(df, ColumnStore):
+        return df.coluna(col_x), df.coluna(col_y)
+
+    return df[col_x].to_numpy(dtype=float), df[col_y].to_numpy(dtype=float)
+
+
+class _ModeloSerializavel:
+    """
+    Persistência dos coeficientes e metadados de treino em um JSON pequeno.
+    Modelos com ``momentos`` (estatísticas suficientes) também gravam esse
+    estado, para que ``atualizar`` continue de onde o treino parou.
+    """
+
+    TIPO = None
+
+    def salvar(self, caminho):
+        """Grava o modelo treinado (coeficientes + metadados) em JSON"""
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        artefato = {
+            "tipo": self.TIPO,
+            "col_x": self.col_x,
+            "col_y": self.col_y,
+            "metricas": self.metricas,
+            "treinado_em": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }
+        if getattr(self, "momentos", None) is not None:
+            artefato["estado"] = self.momentos.estado()
+
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(artefato, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Recria um modelo treinado a partir do JSON gravado por salvar()"""
+        with open(caminho, encoding="utf-8") as f:
+            artefato = json.load(f)
+
+        classe = {c.TIPO: c for c in _ModeloSerializavel.__subclasses__()}.get(artefato.get("tipo"))
+        if classe is None or not issubclass(classe, cls):
+            raise ValueError(f"Artefato de modelo inválido: '{artefato.get('tipo')}'.")
+
+        modelo = classe(None, artefato["col_x"], artefato["col_y"])
+        modelo.metricas = artefato["metricas"]
+        modelo.treinado_em = artefato.get("treinado_em")
+        if "estado" in artefato:
+            modelo.momentos = _Momentos.de_estado(artefato["estado"])
+        return modelo
+
+    def _incorporar(self, novos_dados, espaco, esquecimento):
+        """
+        Combina os momentos salvos (``espaco``: "linear" ou "log") com os
+        dos novos dados e recalcula as métricas.
+        """
+        if getattr(self, "momentos", None) is None:
+            raise ValueError("Modelo sem estatísticas suficientes. Execute treinar() primeiro.")
+
+        if not 0 < esquecimento <= 1:
+            raise ValueError("esquecimento deve estar entre 0 (exclusivo) e 1.")
+
+        if not isinstance(novos_dados, StatsAccumulator):
+            for col in [self.col_x, self.col_y]:
+                if col not in novos_dados.columns:
+                    raise ValueError(f"Coluna '{col}' não encontrada.")
+
+        acumulador = _acumular(novos_dados, self.col_x, self.col_y)
+        if espaco == "log" and acumulador.n and (acumulador.minimo["x"] <= 0 or acumulador.minimo["y"] <= 0):
+            raise ValueError("Dados devem ser positivos para modelo log-log.")
+
+        momentos = self.momentos.copia()
+        momentos.descontar(esquecimento)
+        momentos.combinar(acumulador.log if espaco == "log" else acumulador.linear)
+
+        self.metricas = momentos.ajuste()
+        self.momentos = momentos
+        return self.metricas
+
+
+class RegressionModel(_ModeloSerializavel):
+    TIPO = "linear"
 
-class RegressionModel:
     def __init__(self, df, col_x, col_y):
         self.df = df
         self.col_x = col_x
         self.col_y = col_y
-        self.model = LinearRegression()
         self.metricas = None
+        self.momentos = None
 
     def _validar(self):
+        if isinstance(self.df, StatsAccumulator):
+            # Estatísticas já agregadas (ex.: FonteSQL.acumulador)
+            if self.df.n == 0:
+                raise ValueError("DataFrame vazio.")
+            return
+
         if self.df is None or self.df.empty:
             raise ValueError("DataFrame vazio.")
 
@@ -22,38 +140,74 @@ class RegressionModel:
         """Treina regressão linear simples"""
         self._validar()
 
-        X = self.df[[self.col_x]].values
-        y = self.df[self.col_y].values
+        acumulador = _acumular(self.df, self.col_x, self.col_y)
+        self.metricas = acumulador.regressao_linear()
+        self.momentos = acumulador.linear.copia()
 
-        self.model.fit(X, y)
+        return self.metricas
 
-        coef = float(self.model.coef_[0])
-        intercept = float(self.model.intercept_)
-        r2 = float(self.model.score(X, y))
+    def atualizar(self, novos_dados, esquecimento=1.0):
+        """
+        Atualiza coeficientes e R² com linhas novas sem revisitar o
+        histórico: os momentos salvos no treino são combinados com os dos
+        novos dados (custo proporcional só às linhas novas).
 
-        self.metricas = {
-            "coeficiente": coef,
-            "intercepto": intercept,
-            "r2": r2
-        }
+        Parameters
+        ----------
+        novos_dados : DataFrame, ColumnStore, SessaoAnalise ou StatsAccumulator
+            Linhas novas com as colunas do treino.
+        esquecimento : float
+            Peso mantido pelo histórico a cada atualização (0 < fator <= 1);
+            1.0 equivale a treinar com todos os dados.
+        """
+        return self._incorporar(novos_dados, "linear", esquecimento)
 
-        return self.metricas
+    def intervalos(self, **opcoes):
+        """
+        Intervalos de confiança bootstrap do coeficiente, intercepto e
+        Pearson (ver ``src.bootstrap.bootstrap`` para as opções).
+        """
+        self._validar()
+        return bootstrap(*_arrays(self.df, self.col_x, self.col_y), **opcoes)
 
     def prever(self, valores):
         """Realiza previsões"""
-        valores = np.array(valores).reshape(-1, 1)
-        return self.model.predict(valores)
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        valores = np.asarray(valores, dtype=float)
+        return self.metricas["intercepto"] + self.metricas["coeficiente"] * valores
+
+    def prever_inplace(self, valores):
+        """
+        Previsão vetorizada sobrescrevendo ``valores`` (array float64),
+        sem alocar arrays intermediários. NaN permanece NaN.
+        """
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        valores *= self.metricas["coeficiente"]
+        valores += self.metricas["intercepto"]
+        return valores
 
 
-class LogLogRegressionModel:
+class LogLogRegressionModel(_ModeloSerializavel):
+    TIPO = "loglog"
+
     def __init__(self, df, col_x, col_y):
         self.df = df
         self.col_x = col_x
         self.col_y = col_y
-        self.model = LinearRegression()
         self.metricas = None
+        self.momentos = None
 
     def _validar(self):
+        if isinstance(self.df, StatsAccumulator):
+            # Estatísticas já agregadas (ex.: FonteSQL.acumulador)
+            if self.df.n == 0:
+                raise ValueError("DataFrame vazio.")
+            return
+
         if self.df is None or self.df.empty:
             raise ValueError("DataFrame vazio.")
 
@@ -61,45 +215,167 @@ class LogLogRegressionModel:
             if col not in self.df.columns:
                 raise ValueError(f"Coluna '{col}' não encontrada.")
 
+    def treinar(self):
+        """Treina regressão log-log"""
+        self._validar()
+
+        acumulador = _acumular(self.df, self.col_x, self.col_y)
+
         # log não aceita valores <= 0
-        if (self.df[self.col_x] <= 0).any() or (self.df[self.col_y] <= 0).any():
+        if acumulador.minimo["x"] <= 0 or acumulador.minimo["y"] <= 0:
             raise ValueError("Dados devem ser positivos para modelo log-log.")
 
-    def treinar(self):
-        """Treina regressão log-log"""
+        self.metricas = acumulador.regressao_loglog()
+        self.momentos = acumulador.log.copia()
+
+        return self.metricas
+
+    def atualizar(self, novos_dados, esquecimento=1.0):
+        """
+        Atualiza o ajuste log-log com linhas novas (ver
+        ``RegressionModel.atualizar``).
+        """
+        return self._incorporar(novos_dados, "log", esquecimento)
+
+    def intervalos(self, **opcoes):
+        """
+        Intervalos de confiança bootstrap do expoente (coeficiente
+        log-log), intercepto e Pearson em log10.
+        """
         self._validar()
+        return bootstrap(*_arrays(self.df, self.col_x, self.col_y), loglog=True, **opcoes)
 
-        log_x = np.log10(self.df[self.col_x].values).reshape(-1, 1)
-        log_y = np.log10(self.df[self.col_y].values)
+    def prever(self, valores):
+        """Previsão convertendo de volta do log"""
+        valores = np.asarray(valores, dtype=float)
 
-        self.model.fit(log_x, log_y)
+        if (valores <= 0).any():
+            raise ValueError("Valores devem ser positivos para previsão log-log.")
 
-        y_pred = self.model.predict(log_x)
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
 
-        # cálculo manual do R²
-        ss_res = np.sum((log_y - y_pred) ** 2)
-        ss_tot = np.sum((log_y - np.mean(log_y)) ** 2)
-        r2 = 1 - (ss_res / ss_tot)
+        log_pred = self.metricas["intercepto"] + self.metricas["coeficiente"] * np.log10(valores)
 
-        coef = float(self.model.coef_[0])
-        intercept = float(self.model.intercept_)
+        return 10 ** log_pred
+
+    def prever_inplace(self, valores):
+        """
+        Previsão vetorizada sobrescrevendo ``valores`` (array float64):
+        log10, reta e 10** no próprio array. Valores <= 0 viram NaN.
+        """
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        valores[~(valores > 0)] = np.nan
+        np.log10(valores, out=valores)
+        valores *= self.metricas["coeficiente"]
+        valores += self.metricas["intercepto"]
+        np.power(10.0, valores, out=valores)
+        return valores
+
+
+class TheilSenRegressionModel(_ModeloSerializavel):
+    """
+    Regressão robusta de Theil–Sen: o coeficiente é a mediana exata das
+    inclinações entre todos os pares de pontos (``src.robust``) e o
+    intercepto, a mediana de y - coeficiente·x. Pouco sensível a
+    outliers. Com ``loglog=True`` o ajuste é feito em log10, como no
+    LogLogRegressionModel (registrado em ``metricas["loglog"]``).
+    """
+    TIPO = "theilsen"
+
+    def __init__(self, df, col_x, col_y, loglog=False, semente=0):
+        self.df = df
+        self.col_x = col_x
+        self.col_y = col_y
+        self.loglog = loglog
+        self.semente = semente
+        self.metricas = None
+
+    def _validar(self):
+        if self.df is None or self.df.empty:
+            raise ValueError("DataFrame vazio.")
+
+        for col in [self.col_x, self.col_y]:
+            if col not in self.df.columns:
+                raise ValueError(f"Coluna '{col}' não encontrada.")
+
+    def _dados(self):
+        """Pares válidos no espaço do ajuste"""
+        if isinstance(self.df, SessaoAnalise) and self.loglog:
+            if not self.df.positivos.all():
+                raise ValueError("Dados devem ser positivos para modelo log-log.")
+            return self.df.log_x, self.df.log_y
+
+        x, y = _arrays(self.df, self.col_x, self.col_y)
+        validos = ~(np.isnan(x) | np.isnan(y))
+        if not validos.all():
+            x, y = x[validos], y[validos]
+
+        if self.loglog:
+            if (x <= 0).any() or (y <= 0).any():
+                raise ValueError("Dados devem ser positivos para modelo log-log.")
+            x, y = np.log10(x), np.log10(y)
+
+        return x, y
+
+    def treinar(self):
+        """Treina regressão de Theil–Sen (linear ou log-log)"""
+        self._validar()
+
+        x, y = self._dados()
+        coef, info = inclinacao_mediana(x, y, semente=self.semente)
+
+        residuos = y - coef * x
+        intercept = float(np.median(residuos))
+        residuos -= intercept
+
+        desvios = y - y.mean()
+        ss_res = float(residuos @ residuos)
+        ss_tot = float(desvios @ desvios)
 
         self.metricas = {
             "coeficiente": coef,
             "intercepto": intercept,
-            "r2": float(r2)
+            "r2": 1.0 if ss_tot == 0 else 1.0 - ss_res / ss_tot,
+            "n": info["n"],
+            "pares": info["pares"],
+            "loglog": bool(self.loglog)
         }
 
         return self.metricas
 
     def prever(self, valores):
-        """Previsão convertendo de volta do log"""
-        valores = np.array(valores)
+        """Realiza previsões (convertendo de volta do log no modo log-log)"""
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        valores = np.asarray(valores, dtype=float)
+
+        if not self.metricas["loglog"]:
+            return self.metricas["intercepto"] + self.metricas["coeficiente"] * valores
 
         if (valores <= 0).any():
             raise ValueError("Valores devem ser positivos para previsão log-log.")
 
-        log_valores = np.log10(valores).reshape(-1, 1)
-        log_pred = self.model.predict(log_valores)
+        return 10 ** (self.metricas["intercepto"] + self.metricas["coeficiente"] * np.log10(valores))
+
+    def prever_inplace(self, valores):
+        """
+        Previsão vetorizada sobrescrevendo ``valores`` (array float64). No
+        modo log-log, valores <= 0 viram NaN.
+        """
+        if self.metricas is None:
+            raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+        if self.metricas["loglog"]:
+            valores[~(valores > 0)] = np.nan
+            np.log10(valores, out=valores)
+
+        valores *= self.metricas["coeficiente"]
+        valores += self.metricas["intercepto"]
 
-        return 10 ** log_pred
\ No newline at end of file
+        if self.metricas["loglog"]:
+            np.power(10.0, valores, out=valores)
+        return valores
@@ -0,0 +1,84 @@
+"""
+Regressão linear simples (uma variável) por fórmula fechada.
+
+Tudo é derivado de n, médias e dos momentos centrados Sxx, Syy e Sxy,
+que podem vir de uma única passada sobre arrays ou de um
+``StatsAccumulator``. Substitui o ``LinearRegression`` do sklearn e o
+``np.polyfit`` nos modelos, no visualizador e nas aplicações web.
+"""
+
+import numpy as np
+
+
+def ajuste_momentos(n, media_x, media_y, sxx, syy, sxy):
+    """
+    Coeficientes, R², erros padrão e estatísticas dos resíduos.
+
+    Returns
+    -------
+    dict
+        ``coeficiente``, ``intercepto``, ``r2``, ``erro_padrao_coeficiente``,
+        ``erro_padrao_intercepto``, ``erro_padrao_residual``, ``rmse``,
+        ``soma_quadrados_residuos`` e ``n``.
+    """
+    if n < 2 or sxx <= 0:
+        raise ValueError("Dados insuficientes para regressão.")
+
+    coef = sxy / sxx
+    intercept = media_y - coef * media_x
+
+    # Soma dos quadrados dos resíduos sem recalcular as previsões
+    ss_res = max(syy - coef * sxy, 0.0)
+    r2 = 1.0 if syy == 0 else 1.0 - ss_res / syy
+
+    if n > 2:
+        variancia = ss_res / (n - 2)
+        erro_coef = np.sqrt(variancia / sxx)
+        erro_intercept = np.sqrt(variancia * (1.0 / n + media_x ** 2 / sxx))
+        erro_residual = np.sqrt(variancia)
+    else:
+        erro_coef = erro_intercept = erro_residual = float("nan")
+
+    return {
+        "coeficiente": float(coef),
+        "intercepto": float(intercept),
+        "r2": float(r2),
+        "erro_padrao_coeficiente": float(erro_coef),
+        "erro_padrao_intercepto": float(erro_intercept),
+        "erro_padrao_residual": float(erro_residual),
+        "rmse": float(np.sqrt(ss_res / n)),
+        "soma_quadrados_residuos": float(ss_res),
+        "n": int(n)
+    }
+
+
+def ajustar(x, y):
+    """
+    Ajuste y = a + bx sobre arrays (pares com NaN são descartados).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    if not validos.all():
+        x, y = x[validos], y[validos]
+
+    n = len(x)
+    if n == 0:
+        raise ValueError("Dados insuficientes para regressão.")
+
+    media_x, media_y = float(x.mean()), float(y.mean())
+    dx, dy = x - media_x, y - media_y
+
+    return ajuste_momentos(n, media_x, media_y, float(dx @ dx), float(dy @ dy), float(dx @ dy))
+
+
+def ajustar_loglog(x, y):
+    """
+    Ajuste log10(y) = α + β log10(x) sobre os pares positivos.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    positivos = (x > 0) & (y > 0)
+    return ajustar(np.log10(x[positivos]), np.log10(y[positivos]))
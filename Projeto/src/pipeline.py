@@ -0,0 +1,264 @@
+"""
+Fluxo de análise não interativo.
+
+Executa as mesmas etapas de ``main.py`` (carregar, limpar, filtrar,
+estatísticas, modelos e gráficos) a partir de parâmetros, sem janelas,
+``input()`` ou ``plt.show()``, e devolve um dicionário serializável.
+É a base do modo ``--headless`` do CLI.
+
+Em fontes SQL o filtro de Owner, as estatísticas e os modelos linear e
+log-log são calculados no banco (``DataLoader.acumulador``); só Theil-Sen,
+grupos e gráficos leem linhas, e apenas X, Y e Owner. Com uma pasta de
+``ColumnStore``, X e Y dos demais formatos são convertidos uma única vez
+para float64 em disco e todas as etapas percorrem o mapeamento em blocos,
+sem montar o DataFrame.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .analyzer import UEVAnalyzer
+from .constantes import MODELOS_DISPONIVEIS, MODELOS_PADRAO
+from .data_loader import DataLoader
+from .grouping import analisar_grupos
+from .models import RegressionModel, LogLogRegressionModel, TheilSenRegressionModel
+from .profiling import Perfil
+from .session import SessaoAnalise
+from .sql_source import FonteSQL
+
+
+# Incrementar quando o desenho do Visualizer mudar (invalida os PNG em cache)
+VERSAO_GRAFICO = "1"
+
+
+def executar_analise(caminho, col_x, col_y, owner=None, modelos=MODELOS_PADRAO,
+                     pasta_graficos=None, cache=None, pasta_modelos=None, perfil=None,
+                     tabela=None, consulta=None, pasta_column_store=None):
+    """
+    Analisa um arquivo sem interação com o usuário.
+
+    Parameters
+    ----------
+    caminho : str
+        Arquivo de dados (Excel, CSV, JSON ou banco SQLite/script .sql).
+    col_x, col_y : str
+        Colunas analisadas.
+    owner : str, optional
+        Filtra um único Owner antes da análise.
+    modelos : iterable of str
+        Subconjunto de ``MODELOS_DISPONIVEIS``.
+    pasta_graficos : str, optional
+        Se informada, salva os gráficos em PNG (backend sem tela).
+    cache : CacheDados, optional
+        Cache dos dados limpos e dos PNG (chave: conteúdo do arquivo,
+        colunas e Owner).
+    pasta_modelos : str, optional
+        Se informada, grava cada modelo treinado como artefato JSON
+        (``<arquivo>_<modelo>.json``) para uso em ``prever_arquivo``.
+    perfil : Perfil, optional
+        Recebe o tempo, a memória e as linhas de cada etapa.
+    tabela, consulta : str, optional
+        Em bancos SQL, a tabela ou o ``SELECT`` analisado (ver ``FonteSQL``).
+    pasta_column_store : str, optional
+        Se informada (e a fonte não for SQL), X e Y limpos vão para um
+        ``ColumnStore`` em ``<pasta>/<arquivo>-<hash do caminho>``,
+        reaproveitado enquanto o arquivo, as colunas e o Owner não mudarem.
+
+    Returns
+    -------
+    dict
+        Resultado da análise; em caso de falha, ``erro`` com a mensagem.
+    """
+    resultado = {"arquivo": caminho, "col_x": col_x, "col_y": col_y, "owner": owner}
+
+    invalidos = set(modelos) - set(MODELOS_DISPONIVEIS)
+    if invalidos:
+        raise ValueError(f"Modelos desconhecidos: {', '.join(sorted(invalidos))}")
+
+    if perfil is None:
+        perfil = Perfil(ativo=False)
+
+    try:
+        fonte = caminho
+        if tabela is not None or consulta is not None:
+            fonte = FonteSQL(caminho, tabela=tabela, consulta=consulta)
+        loader = DataLoader(fonte, cache=cache)
+        sql = loader.e_sql()
+
+        if sql:
+            # Filtro de Owner, agregados e medianas calculados no banco:
+            # nenhuma linha é lida para as estatísticas e os modelos linear/log-log
+            with perfil.etapa("agregar") as etapa:
+                acumulador = loader.acumulador(col_x, col_y, owner=owner, exigir_dados=True)
+                medianas = loader.medianas(col_x, col_y, owner=owner)
+                etapa.linhas_saida = registros = acumulador.n
+            sessao = store = None
+        elif pasta_column_store is not None:
+            pasta = _pasta_store(pasta_column_store, caminho)
+            with perfil.etapa("column_store") as etapa:
+                store = loader.para_column_store(col_x, col_y, pasta, owner=owner)
+                etapa.linhas_saida = registros = len(store)
+            sessao = None
+        else:
+            with perfil.etapa("carregar") as etapa:
+                etapa.linhas_saida = len(loader.carregar())
+            with perfil.etapa("limpar", linhas_entrada=len(loader.df)) as etapa:
+                df = loader.limpar(col_x, col_y)
+                if owner is not None:
+                    df = loader.filtrar_owner(owner)
+                etapa.linhas_saida = registros = len(df)
+            sessao = loader.sessao(col_x, col_y)
+            store = None
+    except Exception as e:
+        resultado["erro"] = str(e)
+        return resultado
+
+    def linhas():
+        """
+        Sessão com as linhas, criada quando algum passo precisa delas: em
+        SQL só X, Y e Owner são lidos; no ColumnStore, as colunas mapeadas.
+        """
+        nonlocal sessao
+        if sessao is None:
+            if store is not None:
+                sessao = SessaoAnalise.de_column_store(store)
+            else:
+                with perfil.etapa("carregar_colunas") as etapa:
+                    sessao = loader.sessao(col_x, col_y, owner=owner)
+                    etapa.linhas_saida = len(sessao)
+        return sessao
+
+    # Estatísticas e modelos linear/log-log: agregados do banco, blocos do
+    # ColumnStore ou a sessão em memória
+    agregados = acumulador if sql else store if store is not None else sessao
+
+    with perfil.etapa("estatisticas", linhas_entrada=registros) as etapa:
+        analyzer = UEVAnalyzer(agregados, col_x, col_y, medianas=medianas if sql else None)
+
+        resultado["registros"] = int(registros)
+        resultado["x"] = analyzer.resumo_estatistico(col_x, exato=True)
+        resultado["y"] = analyzer.resumo_estatistico(col_y, exato=True)
+        resultado["pearson"] = analyzer.correlacao()
+        resultado["razao_k"] = analyzer.calcular_razao_k(exato=True)
+        etapa.linhas_saida = registros
+
+    base = os.path.splitext(os.path.basename(caminho))[0]
+
+    treinos = (
+        ("linear", RegressionModel, {}),
+        ("loglog", LogLogRegressionModel, {}),
+        ("theilsen", TheilSenRegressionModel, {}),
+        ("theilsen_loglog", TheilSenRegressionModel, {"loglog": True})
+    )
+
+    for nome, classe, opcoes in treinos:
+        if nome not in modelos:
+            continue
+        # Linear e log-log só precisam das estatísticas suficientes
+        dados = agregados if nome in ("linear", "loglog") else linhas()
+        with perfil.etapa(f"regressao_{nome}", linhas_entrada=registros) as etapa:
+            modelo = classe(dados, col_x, col_y, **opcoes)
+            try:
+                resultado[f"regressao_{nome}"] = metricas = modelo.treinar()
+            except ValueError as e:
+                resultado[f"regressao_{nome}"] = {"erro": str(e)}
+                continue
+            etapa.linhas_saida = metricas["n"]
+
+        if pasta_modelos is not None:
+            os.makedirs(pasta_modelos, exist_ok=True)
+            destino = os.path.join(pasta_modelos, f"{base}_{nome}.json")
+            modelo.salvar(destino)
+            resultado.setdefault("modelos_salvos", {})[nome] = destino
+
+    if "grupos" in modelos:
+        # O ColumnStore guarda só X e Y: o Owner vem de uma leitura das três colunas
+        por_owner = loader.sessao(col_x, col_y, owner=owner) if store is not None else linhas()
+        if por_owner.owner is not None:
+            with perfil.etapa("grupos", linhas_entrada=registros) as etapa:
+                resultado["grupos"] = analisar_grupos(por_owner, col_x, col_y).to_dict("records")
+                etapa.linhas_saida = len(resultado["grupos"])
+
+    if pasta_graficos is not None:
+        import matplotlib
+        matplotlib.use("Agg")  # sem display
+        from .visualizer import Visualizer
+
+        os.makedirs(pasta_graficos, exist_ok=True)
+        destino = os.path.join(pasta_graficos, f"{base}_{col_x}_{col_y}.png")
+
+        def desenhar(caminho_png):
+            Visualizer(linhas(), col_x, col_y).plotar(salvar=True, mostrar=False, caminho=caminho_png)
+
+        try:
+            with perfil.etapa("grafico", linhas_entrada=registros):
+                if cache is None:
+                    desenhar(destino)
+                else:
+                    # Mesmo conteúdo e colunas -> mesma imagem: renderiza uma vez só
+                    chave = cache.chave(caminho, "grafico", VERSAO_GRAFICO, col_x, col_y, owner, tabela, consulta)
+                    shutil.copyfile(cache.obter_arquivo(chave, "grafico.png", desenhar), destino)
+            resultado["grafico"] = destino
+        except Exception as e:
+            resultado["grafico"] = {"erro": str(e)}
+
+    return resultado
+
+
+def _pasta_store(pasta, caminho):
+    """Subpasta do ColumnStore de um arquivo (o hash separa arquivos homônimos)"""
+    base = os.path.splitext(os.path.basename(caminho))[0]
+    resumo = hashlib.blake2b(os.path.abspath(caminho).encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(pasta, f"{base}-{resumo}")
+
+
+def _serializavel(valor):
+    """Conversão de tipos NumPy/pandas para json.dump"""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return str(valor)
+
+
+def salvar_resultados(resultados, caminho=None):
+    """
+    Grava a lista de resultados em JSON ou Parquet (pela extensão), ou
+    em JSON na saída padrão quando ``caminho`` é None.
+
+    No Parquet cada arquivo analisado vira uma linha (campos aninhados
+    achatados); a tabela de grupos, quando existir, vai para
+    ``<nome>.grupos.parquet``.
+    """
+    if caminho is None:
+        json.dump(resultados, sys.stdout, ensure_ascii=False, indent=2, default=_serializavel)
+        print()
+        return
+
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    if caminho.lower().endswith(".parquet"):
+        grupos = []
+        linhas = []
+        for item in resultados:
+            item = dict(item)
+            for grupo in item.pop("grupos", []) or []:
+                grupos.append({"arquivo": item["arquivo"], **grupo})
+            linhas.append(item)
+
+        pd.json_normalize(linhas).to_parquet(caminho, index=False)
+        if grupos:
+            raiz = caminho[:-len(".parquet")]
+            pd.DataFrame(grupos).to_parquet(f"{raiz}.grupos.parquet", index=False)
+        return
+
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2, default=_serializavel)
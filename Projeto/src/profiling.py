@@ -0,0 +1,287 @@
+"""
+Instrumentação por etapa (carregar, limpar, estatísticas, modelos,
+gráficos).
+
+Cada etapa registra o tempo de relógio, o tempo de CPU do processo, o
+pico de memória alocado durante a etapa (``tracemalloc``, acima do que
+já estava alocado no início) e as linhas de entrada e saída. Etapas
+podem ser aninhadas; o pico de uma etapa inclui o das etapas internas.
+
+Com ``Perfil(ativo=False)`` (padrão do CLI e do Streamlit) ``etapa``
+devolve sempre o mesmo contexto vazio: nenhum relógio é lido e o
+``tracemalloc`` não é ligado, então o custo é o de um ``with``. Com o
+perfil ativo o ``tracemalloc`` deixa as etapas bem mais lentas (2 a 3x
+em código com muitas alocações pequenas); os tempos servem para
+comparar etapas entre si, não para medir o fluxo sem instrumentação.
+
+O ``tracemalloc`` é global ao processo, e as sessões do Streamlit são
+threads do mesmo processo: só um Perfil por vez mede memória. Enquanto
+as etapas de um Perfil medem, as de outro Perfil que começarem ficam com
+``pico_mb`` None (tempo, CPU e linhas continuam medidos).
+
+Os registros podem ser gravados em JSON ou no formato Chrome trace
+(``chrome://tracing``, https://ui.perfetto.dev).
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from .constantes import FORMATOS_PERFIL
+
+
+class _Etapa:
+    """Medidas de uma etapa; ``linhas_entrada``/``linhas_saida`` podem ser definidas dentro do ``with``"""
+
+    __slots__ = ("nome", "linhas_entrada", "linhas_saida", "_inicio", "_cpu", "_memoria_inicial", "_pico")
+
+    def __init__(self, nome, linhas_entrada=None, linhas_saida=None):
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = linhas_saida
+
+
+class _EtapaInativa:
+    """Contexto reaproveitado quando o perfil está desligado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass
+
+
+_INATIVA = _EtapaInativa()
+
+# Dono do tracemalloc: o Perfil com etapas medindo memória no momento
+_MEMORIA = threading.Lock()
+
+
+class Perfil:
+    """
+    Parameters
+    ----------
+    ativo : bool
+        Se False, nada é medido (custo desprezível).
+    memoria : bool
+        Mede o pico de memória com ``tracemalloc`` (ligado só enquanto
+        houver uma etapa em andamento, se já não estava). Se outro Perfil
+        já estiver medindo, as etapas ficam sem ``pico_mb``.
+    rotulo : str, optional
+        Identifica a execução (por exemplo, o arquivo) nos registros.
+
+    Exemplo
+    -------
+    >>> perfil = Perfil()
+    >>> with perfil.etapa("limpar", linhas_entrada=len(df)) as e:
+    ...     limpo = loader.limpar("X", "Y")
+    ...     e.linhas_saida = len(limpo)
+    >>> perfil.salvar("perfil.json")
+    """
+
+    def __init__(self, ativo=True, memoria=True, rotulo=None):
+        self.ativo = ativo
+        self.memoria = memoria
+        self.rotulo = rotulo
+        self.registros = []
+        self._pilha = []
+        self._ligou_tracemalloc = False
+        self._medindo = False
+
+        # Relógio de parede para alinhar execuções de processos diferentes
+        self._origem = time.time() - time.perf_counter()
+
+    def __bool__(self):
+        return self.ativo
+
+    def etapa(self, nome, linhas_entrada=None, linhas_saida=None):
+        """
+        Contexto que mede uma etapa.
+
+        Parameters
+        ----------
+        nome : str
+        linhas_entrada, linhas_saida : int, optional
+            Também podem ser atribuídas ao objeto devolvido pelo ``with``.
+        """
+        if not self.ativo:
+            return _INATIVA
+        return _Medicao(self, _Etapa(nome, linhas_entrada, linhas_saida))
+
+    def _iniciar(self, etapa):
+        if self.memoria and not self._pilha:
+            # Só a etapa mais externa disputa o tracemalloc; as internas
+            # seguem a decisão dela
+            self._medindo = _MEMORIA.acquire(blocking=False)
+            if self._medindo and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._ligou_tracemalloc = True
+
+        if self._medindo:
+            atual, pico = tracemalloc.get_traced_memory()
+            # O pico até aqui pertence à etapa externa, antes de zerá-lo
+            if self._pilha:
+                externa = self._pilha[-1]
+                externa._pico = max(externa._pico, pico)
+            tracemalloc.reset_peak()
+            etapa._memoria_inicial = atual
+            etapa._pico = atual
+
+        self._pilha.append(etapa)
+        etapa._cpu = time.process_time()
+        etapa._inicio = time.perf_counter()
+
+    def _encerrar(self, etapa, erro):
+        fim = time.perf_counter()
+        cpu = time.process_time()
+        self._pilha.pop()
+
+        registro = {
+            "etapa": etapa.nome,
+            "inicio": self._origem + etapa._inicio,
+            "segundos": fim - etapa._inicio,
+            "cpu_segundos": cpu - etapa._cpu,
+            "pico_mb": None,
+            "linhas_entrada": _inteiro(etapa.linhas_entrada),
+            "linhas_saida": _inteiro(etapa.linhas_saida),
+            "profundidade": len(self._pilha),
+            "processo": os.getpid()
+        }
+        if self.rotulo is not None:
+            registro["rotulo"] = self.rotulo
+        if erro is not None:
+            registro["erro"] = f"{type(erro).__name__}: {erro}"
+
+        if self._medindo:
+            _, pico = tracemalloc.get_traced_memory()
+            pico = max(pico, etapa._pico)
+            registro["pico_mb"] = (pico - etapa._memoria_inicial) / 1e6
+
+            if self._pilha:
+                externa = self._pilha[-1]
+                externa._pico = max(externa._pico, pico)
+                tracemalloc.reset_peak()
+            else:
+                if self._ligou_tracemalloc:
+                    tracemalloc.stop()
+                    self._ligou_tracemalloc = False
+                self._medindo = False
+                _MEMORIA.release()
+
+        self.registros.append(registro)
+
+    def resumo(self):
+        """Tabela em texto com uma linha por etapa, na ordem de início"""
+        linhas = [f"{'etapa':<28} {'tempo':>9} {'cpu':>9} {'pico':>10}  entrada -> saída"]
+        for r in sorted(self.registros, key=lambda r: r["inicio"]):
+            nome = "  " * r["profundidade"] + r["etapa"]
+            pico = "-" if r["pico_mb"] is None else f"{r['pico_mb']:.1f} MB"
+            entrada = "-" if r["linhas_entrada"] is None else r["linhas_entrada"]
+            saida = "-" if r["linhas_saida"] is None else r["linhas_saida"]
+            linhas.append(
+                f"{nome:<28} {r['segundos']:8.3f}s {r['cpu_segundos']:8.3f}s {pico:>10}  {entrada} -> {saida}"
+            )
+        return "\n".join(linhas)
+
+    def salvar(self, caminho, formato="chrome"):
+        """Grava os registros (ver ``salvar_perfil``)"""
+        salvar_perfil(self.registros, caminho, formato)
+
+
+class _Medicao:
+    __slots__ = ("perfil", "etapa")
+
+    def __init__(self, perfil, etapa):
+        self.perfil = perfil
+        self.etapa = etapa
+
+    def __enter__(self):
+        self.perfil._iniciar(self.etapa)
+        return self.etapa
+
+    def __exit__(self, tipo, erro, rastro):
+        self.perfil._encerrar(self.etapa, erro)
+        return False
+
+
+def _inteiro(valor):
+    return None if valor is None else int(valor)
+
+
+def trace_chrome(registros):
+    """
+    Registros no formato Chrome trace (eventos completos, ``ph="X"``).
+
+    Cada processo vira um ``pid`` e cada rótulo (arquivo) uma linha
+    (``tid``); os tempos ficam relativos ao primeiro início.
+    """
+    if not registros:
+        return {"traceEvents": [], "displayTimeUnit": "ms"}
+
+    origem = min(r["inicio"] for r in registros)
+    linhas = {}
+    eventos = []
+
+    for r in registros:
+        rotulo = r.get("rotulo")
+        tid = linhas.setdefault((r["processo"], rotulo), len(linhas) + 1)
+        args = {
+            "cpu_ms": r["cpu_segundos"] * 1e3,
+            "pico_mb": r["pico_mb"],
+            "linhas_entrada": r["linhas_entrada"],
+            "linhas_saida": r["linhas_saida"]
+        }
+        if "erro" in r:
+            args["erro"] = r["erro"]
+
+        eventos.append({
+            "name": r["etapa"],
+            "cat": "etapa",
+            "ph": "X",
+            "ts": (r["inicio"] - origem) * 1e6,
+            "dur": r["segundos"] * 1e6,
+            "pid": r["processo"],
+            "tid": tid,
+            "args": args
+        })
+
+    # Nomes das linhas no visualizador
+    for (processo, rotulo), tid in linhas.items():
+        if rotulo is not None:
+            eventos.append({
+                "name": "thread_name", "ph": "M", "pid": processo, "tid": tid,
+                "args": {"name": str(rotulo)}
+            })
+
+    return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+
+def salvar_perfil(registros, caminho, formato="chrome"):
+    """
+    Grava registros de ``Perfil`` em ``caminho``.
+
+    Parameters
+    ----------
+    registros : list of dict
+        ``Perfil.registros`` (de uma ou mais execuções).
+    caminho : str
+    formato : str
+        ``"chrome"`` (Chrome trace) ou ``"json"`` (lista de etapas).
+    """
+    if formato not in FORMATOS_PERFIL:
+        raise ValueError(f"Formato de perfil inválido: '{formato}'. Use {', '.join(FORMATOS_PERFIL)}.")
+
+    dados = trace_chrome(registros) if formato == "chrome" else {"etapas": registros}
+
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
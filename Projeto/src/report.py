@@ -0,0 +1,243 @@
+"""
+Relatórios em PDF e XLSX a partir da análise de cada arquivo.
+
+``relatorio_arquivo`` executa ``executar_analise`` (estatísticas do
+``UEVAnalyzer``, regressões, grupos e o gráfico do ``Visualizer``) e
+monta os relatórios com o resultado: PDF com ``reportlab`` e planilha
+com ``xlsxwriter`` (ambos importados só quando usados).
+
+``gerar_relatorios`` distribui os arquivos entre processos (um por
+núcleo por padrão), então o tempo de um lote grande fica limitado pelos
+núcleos e não pela renderização em série. Com um ``CacheDados``, o PNG
+de cada gráfico fica em cache pelo hash do conteúdo do arquivo e das
+colunas: uma nova rodada sobre os mesmos dados não redesenha nada.
+"""
+
+import os
+from functools import partial
+
+from .batch import mapear_arquivos
+from .constantes import FORMATOS_RELATORIO
+from .pipeline import executar_analise, MODELOS_PADRAO
+from .profiling import Perfil
+
+
+_CAMPOS_RESUMO = ("quantidade", "minimo", "maximo", "media", "mediana")
+_CAMPOS_REGRESSAO = ("coeficiente", "intercepto", "r2", "n")
+_GRUPOS_NO_RELATORIO = 20
+
+
+def _regressoes(resultado):
+    """Linhas (modelo, métricas) das regressões que foram ajustadas"""
+    linhas = []
+    for chave, metricas in resultado.items():
+        if chave.startswith("regressao_") and "erro" not in metricas:
+            linhas.append((chave[len("regressao_"):], metricas))
+    return linhas
+
+
+def _formatar(valor):
+    if isinstance(valor, float):
+        return f"{valor:.6g}"
+    return "" if valor is None else str(valor)
+
+
+def _titulo(resultado):
+    titulo = f"{os.path.basename(resultado['arquivo'])}: {resultado['col_y']} x {resultado['col_x']}"
+    if resultado.get("owner") is not None:
+        titulo += f" (Owner: {resultado['owner']})"
+    return titulo
+
+
+def _pdf(resultado, destino):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    estilos = getSampleStyleSheet()
+    estilo_tabela = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("ALIGN", (1, 1), (-1, -1), "RIGHT")
+    ])
+
+    def tabela(linhas):
+        t = Table([[_formatar(v) for v in linha] for linha in linhas], repeatRows=1)
+        t.setStyle(estilo_tabela)
+        return t
+
+    doc = SimpleDocTemplate(destino, pagesize=landscape(A4), title=_titulo(resultado))
+    largura = doc.width
+
+    partes = [
+        Paragraph(_titulo(resultado), estilos["Title"]),
+        Paragraph(f"Registros: {resultado['registros']} | Pearson: {_formatar(resultado['pearson'])}", estilos["Normal"]),
+        Spacer(1, 0.4 * cm),
+        Paragraph("Estatísticas", estilos["Heading2"]),
+        tabela(
+            [("", *_CAMPOS_RESUMO)]
+            + [(resultado[c], *(resultado[e].get(campo) for campo in _CAMPOS_RESUMO))
+               for c, e in (("col_x", "x"), ("col_y", "y"))]
+            + [("k", "", *(resultado["razao_k"].get(campo) for campo in ("minimo", "maximo")), "",
+                resultado["razao_k"].get("mediana"))]
+        )
+    ]
+
+    regressoes = _regressoes(resultado)
+    if regressoes:
+        partes += [
+            Paragraph("Regressões", estilos["Heading2"]),
+            tabela([("modelo", *_CAMPOS_REGRESSAO)]
+                   + [(nome, *(m.get(campo) for campo in _CAMPOS_REGRESSAO)) for nome, m in regressoes])
+        ]
+
+    grafico = resultado.get("grafico")
+    if isinstance(grafico, str) and os.path.isfile(grafico):
+        # Figura do Visualizer: 18 x 5 polegadas
+        partes += [Spacer(1, 0.4 * cm), Image(grafico, width=largura, height=largura * 5 / 18)]
+
+    grupos = resultado.get("grupos")
+    if grupos:
+        campos = ["Owner", "quantidade", "pearson", "coeficiente", "r2", "coeficiente_loglog", "r2_loglog"]
+        partes += [
+            Paragraph(f"Grupos por Owner ({min(len(grupos), _GRUPOS_NO_RELATORIO)} maiores)", estilos["Heading2"]),
+            tabela([campos] + [[g.get(c) for c in campos] for g in grupos[:_GRUPOS_NO_RELATORIO]])
+        ]
+
+    doc.build(partes)
+
+
+def _xlsx(resultado, destino):
+    import xlsxwriter
+
+    livro = xlsxwriter.Workbook(destino, {"nan_inf_to_errors": True})
+    negrito = livro.add_format({"bold": True})
+
+    resumo = livro.add_worksheet("Resumo")
+    resumo.set_column(0, 0, 22)
+    resumo.set_column(1, len(_CAMPOS_RESUMO), 14)
+    resumo.write(0, 0, _titulo(resultado), negrito)
+    resumo.write_row(1, 0, ["Registros", resultado["registros"]])
+    resumo.write_row(2, 0, ["Pearson", resultado["pearson"]])
+
+    resumo.write_row(4, 0, ["", *_CAMPOS_RESUMO], negrito)
+    for linha, (coluna, chave) in enumerate((("col_x", "x"), ("col_y", "y")), start=5):
+        resumo.write_row(linha, 0, [resultado[coluna], *(resultado[chave].get(c) for c in _CAMPOS_RESUMO)])
+    k = resultado["razao_k"]
+    resumo.write_row(7, 0, ["k", None, k.get("minimo"), k.get("maximo"), None, k.get("mediana")])
+
+    linha = 9
+    regressoes = _regressoes(resultado)
+    if regressoes:
+        resumo.write_row(linha, 0, ["modelo", *_CAMPOS_REGRESSAO], negrito)
+        for nome, metricas in regressoes:
+            linha += 1
+            resumo.write_row(linha, 0, [nome, *(metricas.get(c) for c in _CAMPOS_REGRESSAO)])
+        linha += 2
+
+    grafico = resultado.get("grafico")
+    if isinstance(grafico, str) and os.path.isfile(grafico):
+        # PNG de 300 dpi reduzido para caber na tela
+        resumo.insert_image(linha, 0, grafico, {"x_scale": 0.2, "y_scale": 0.2})
+
+    grupos = resultado.get("grupos")
+    if grupos:
+        planilha = livro.add_worksheet("Grupos")
+        campos = list(grupos[0])
+        planilha.write_row(0, 0, campos, negrito)
+        for i, grupo in enumerate(grupos, start=1):
+            planilha.write_row(i, 0, [grupo.get(c) for c in campos])
+
+    livro.close()
+
+
+_GERADORES = {"pdf": _pdf, "xlsx": _xlsx}
+
+
+def relatorio_arquivo(caminho, col_x, col_y, pasta_relatorios, formatos=("pdf",), owner=None,
+                      modelos=MODELOS_PADRAO, pasta_graficos=None, cache=None, perfil=None, **opcoes):
+    """
+    Analisa um arquivo e grava seus relatórios.
+
+    Parameters
+    ----------
+    caminho : str
+        Arquivo de dados.
+    col_x, col_y : str
+        Colunas analisadas.
+    pasta_relatorios : str
+        Destino dos relatórios (``<arquivo>_<X>_<Y>.pdf``/``.xlsx``).
+    formatos : iterable of str
+        Subconjunto de ``FORMATOS_RELATORIO``.
+    pasta_graficos : str, optional
+        Onde guardar os PNG (padrão: ``<pasta_relatorios>/graficos``).
+    cache : CacheDados, optional
+        Cache dos dados limpos e dos gráficos.
+    perfil : Perfil, optional
+        Recebe as etapas da análise e uma etapa ``relatorio_<formato>``
+        por relatório.
+    **opcoes
+        Repassadas a ``executar_analise``.
+
+    Returns
+    -------
+    dict
+        Resultado de ``executar_analise`` com ``relatorios`` (formato ->
+        caminho); em caso de falha, ``erro`` com a mensagem.
+    """
+    invalidos = set(formatos) - set(FORMATOS_RELATORIO)
+    if invalidos:
+        raise ValueError(f"Formatos de relatório desconhecidos: {', '.join(sorted(invalidos))}")
+
+    if pasta_graficos is None:
+        pasta_graficos = os.path.join(pasta_relatorios, "graficos")
+    if perfil is None:
+        perfil = Perfil(ativo=False)
+
+    resultado = executar_analise(
+        caminho, col_x, col_y, owner=owner, modelos=modelos,
+        pasta_graficos=pasta_graficos, cache=cache, perfil=perfil, **opcoes
+    )
+    if "erro" in resultado:
+        return resultado
+
+    os.makedirs(pasta_relatorios, exist_ok=True)
+    base = os.path.splitext(os.path.basename(caminho))[0]
+    sufixo = f"_{owner}" if owner is not None else ""
+
+    resultado["relatorios"] = {}
+    for formato in formatos:
+        destino = os.path.join(pasta_relatorios, f"{base}_{col_x}_{col_y}{sufixo}.{formato}")
+        try:
+            with perfil.etapa(f"relatorio_{formato}"):
+                _GERADORES[formato](resultado, destino)
+        except Exception as e:
+            resultado["erro"] = f"Erro ao gerar relatório {formato}: {e}"
+            break
+        resultado["relatorios"][formato] = destino
+
+    return resultado
+
+
+def gerar_relatorios(caminhos, col_x, col_y, pasta_relatorios, processos=None, **opcoes):
+    """
+    Relatórios de vários arquivos em paralelo.
+
+    Parameters
+    ----------
+    caminhos : iterable of str
+    processos : int, optional
+        Processos de trabalho (padrão: número de núcleos).
+    **opcoes
+        Repassadas a ``relatorio_arquivo``.
+
+    Returns
+    -------
+    list of dict
+        Um resultado por arquivo, na ordem de ``caminhos``.
+    """
+    tarefa = partial(relatorio_arquivo, col_x=col_x, col_y=col_y, pasta_relatorios=pasta_relatorios, **opcoes)
+    return mapear_arquivos(tarefa, caminhos, processos)
@@ -0,0 +1,366 @@
+"""
+Regressão robusta de Theil–Sen com seleção exata da inclinação mediana.
+
+O estimador de Theil–Sen usa a mediana das n(n-1)/2 inclinações entre
+pares de pontos, o que tolera até ~29% de outliers. Enumerar os pares
+custa O(n²) em tempo e memória; aqui a mediana exata sai sem enumerá-los:
+
+- com os pontos ordenados por x, o número de inclinações menores que t é
+  o número de inversões da ordem de y - t·x, contado em O(n log n) por um
+  merge sort vetorizado (um ``argsort`` estável por nível);
+- uma amostra aleatória de pares dá um intervalo [baixo, alto] que contém
+  a mediana com alta probabilidade, confirmado pela contagem exata;
+- os pares com inclinação dentro do intervalo são as inversões entre as
+  ordens por y - baixo·x e y - alto·x. Enquanto forem muitos, uma nova
+  amostra é sorteada entre eles e o intervalo estreita; quando cabem na
+  memória são enumerados e a mediana sai de ``np.partition``.
+
+Cada rodada reduz os candidatos por um fator ~sqrt(amostra): três rodadas
+bastam com 10 milhões de pontos. Custo esperado O(n log n), memória O(n).
+"""
+
+import numpy as np
+
+
+AMOSTRA_MIN = 20_000
+AMOSTRA_MAX = 4_000_000
+
+# Até esse número de pares a mediana sai da enumeração direta
+LIMITE_PARES = 2_000_000
+
+# Margem (em desvios padrão da amostra) do intervalo de cada rodada
+MARGEM_PADRAO = 3.0
+
+
+def _niveis(seq):
+    """
+    Merge sort de baixo para cima de ``seq`` (permutação de 0..n-1).
+
+    Em cada nível gera ``(ids, direita, inicio, cont)``: para o elemento da
+    posição ``direita`` (metade direita de um bloco, no arranjo ``ids`` do
+    nível), os ``cont`` elementos da metade esquerda maiores que ele são
+    ``ids[inicio:inicio + cont]``. Cada inversão aparece em um só nível.
+    """
+    n = len(seq)
+    valores = np.asarray(seq, dtype=np.int64)
+    ids = np.arange(n)
+    pos = np.arange(n)
+
+    nivel = 0
+    while (1 << nivel) < n:
+        largura = 1 << nivel
+        chave = pos >> (nivel + 1)
+        chave *= n
+        chave += valores
+        ordem = np.argsort(chave, kind="stable")
+
+        destino = np.empty(n, dtype=np.int64)
+        destino[ordem] = pos
+
+        # Quantos da esquerda passaram à frente = quantos são maiores
+        direita = np.flatnonzero(pos & largura)
+        cont = direita - destino[direita]
+        inicio = (direita >> (nivel + 1) << (nivel + 1)) + largura - cont
+
+        yield ids, direita, inicio, cont
+
+        valores = valores[ordem]
+        ids = ids[ordem]
+        nivel += 1
+
+
+def _inversoes(seq, probabilidade=0.0, rng=None, limite=None):
+    """
+    Conta as inversões de ``seq`` e sorteia cada uma com
+    ``probabilidade`` (1.0 = todas; 0 = só a contagem).
+
+    Returns
+    -------
+    tuple
+        ``(total, esquerda, direita)``, com os índices em ``seq`` dos
+        pares sorteados. Se passarem de ``limite``, a coleta é
+        interrompida e os índices são None.
+    """
+    total = 0
+    coletados = 0
+    esquerda, direita = [], []
+    coletar = probabilidade > 0
+
+    for ids, pos_direita, inicio, cont in _niveis(seq):
+        total += int(cont.sum())
+        if not coletar:
+            continue
+
+        sorteados = cont if probabilidade >= 1 else rng.binomial(cont, probabilidade)
+        com = sorteados > 0
+        sorteados = sorteados[com]
+        quantidade = int(sorteados.sum())
+        if quantidade == 0:
+            continue
+
+        coletados += quantidade
+        if limite is not None and coletados > limite:
+            coletar = False
+            esquerda = direita = None
+            continue
+
+        if probabilidade >= 1:
+            deslocamento = np.arange(quantidade) - np.repeat(np.cumsum(sorteados) - sorteados, sorteados)
+        else:
+            deslocamento = (rng.random(quantidade) * np.repeat(cont[com], sorteados)).astype(np.int64)
+
+        esquerda.append(ids[np.repeat(inicio[com], sorteados) + deslocamento])
+        direita.append(ids[np.repeat(pos_direita[com], sorteados)])
+
+    if not coletar and esquerda is None:
+        return total, None, None
+
+    vazio = np.empty(0, dtype=np.int64)
+    return total, np.concatenate(esquerda or [vazio]), np.concatenate(direita or [vazio])
+
+
+def _ordem(x, y, t, tardio):
+    """
+    Ordem dos pontos (já ordenados por x) por y - t·x. Empates ficam na
+    ordem das posições, ou na inversa com ``tardio=True``. t = ±inf dá o
+    limite da ordem (x crescente ou decrescente, depois y).
+    """
+    n = len(x)
+    if np.isinf(t):
+        posicao = np.arange(n)
+        return np.lexsort((-posicao if tardio else posicao, y, x if t < 0 else -x))
+
+    u = y - t * x
+    if tardio:
+        return n - 1 - np.argsort(u[::-1], kind="stable")
+    return np.argsort(u, kind="stable")
+
+
+def _postos(ordem):
+    postos = np.empty(len(ordem), dtype=np.int64)
+    postos[ordem] = np.arange(len(ordem))
+    return postos
+
+
+def _inclinacoes(x, y, i, j):
+    """Inclinações dos pares (i, j), sem os de mesmo x"""
+    dx = x[j] - x[i]
+    validos = dx != 0
+    return (y[j][validos] - y[i][validos]) / dx[validos]
+
+
+def _selecionar(valores, posicoes):
+    """Valores nas posições pedidas da ordem crescente"""
+    posicoes = [min(max(p, 0), len(valores) - 1) for p in posicoes]
+    parte = np.partition(valores, posicoes)
+    return [float(parte[p]) for p in posicoes]
+
+
+def inclinacao_mediana(x, y, semente=0, amostra=None, margem=MARGEM_PADRAO):
+    """
+    Mediana exata das inclinações entre todos os pares com x diferentes.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Dados; pares com NaN ou infinitos são descartados.
+    semente : int
+        Semente das amostras (o resultado é exato com qualquer semente;
+        só o tempo varia).
+    amostra : int, optional
+        Pares sorteados por rodada; padrão: n, limitado a
+        [AMOSTRA_MIN, AMOSTRA_MAX].
+    margem : float
+        Largura do intervalo de cada rodada em desvios padrão.
+
+    Returns
+    -------
+    tuple
+        ``(inclinacao, info)``; ``info`` tem ``n``, ``pares`` (inclinações
+        definidas) e ``rodadas``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    if len(x) != len(y):
+        raise ValueError("x e y devem ter o mesmo tamanho.")
+
+    validos = np.isfinite(x) & np.isfinite(y)
+    if not validos.all():
+        x, y = x[validos], y[validos]
+
+    # Ordem por x; y decrescente entre x iguais
+    ordem = np.lexsort((-y, x))
+    x, y = x[ordem], y[ordem]
+    n = len(x)
+
+    _, grupos_x = np.unique(x, return_counts=True)
+    mesmo_x = int((grupos_x * (grupos_x - 1) // 2).sum())
+
+    novo = np.ones(n, dtype=bool)
+    novo[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+    grupos_xy = np.diff(np.append(np.flatnonzero(novo), n))
+    identicos = int((grupos_xy * (grupos_xy - 1) // 2).sum())
+
+    pares = n * (n - 1) // 2 - mesmo_x
+    if pares == 0:
+        raise ValueError("Inclinação indefinida: são necessários pelo menos dois valores de x diferentes.")
+
+    alvos = ((pares - 1) // 2, pares // 2)
+    info = {"n": int(n), "pares": int(pares), "rodadas": 0}
+
+    if n * (n - 1) // 2 <= LIMITE_PARES:
+        i, j = np.triu_indices(n, 1)
+        return float(np.mean(_selecionar(_inclinacoes(x, y, i, j), alvos))), info
+
+    rng = np.random.default_rng(semente)
+    m = amostra or int(np.clip(n, AMOSTRA_MIN, AMOSTRA_MAX))
+    limite = max(LIMITE_PARES, 2 * n)
+
+    def abaixo_de(t, inclusive=False):
+        # Inversões da ordem por y - t·x: inclinações < t (<= t com
+        # ``inclusive``), pares de mesmo x com y diferentes (que estão
+        # sempre invertidos) e, com ``inclusive``, os pontos idênticos
+        total, _, _ = _inversoes(_postos(_ordem(x, y, t, inclusive)))
+        return total - (mesmo_x if inclusive else mesmo_x - identicos)
+
+    contagens = {}
+
+    def contagem(t, inclusive=False):
+        # abaixo_de com memória: a seleção por contagem repete limites
+        chave = (float(t), inclusive)
+        if chave not in contagens:
+            contagens[chave] = abaixo_de(t, inclusive)
+        return contagens[chave]
+
+    def entre(baixo, alto, probabilidade, limite=None, abertos=(False, False)):
+        # Pares que trocam de ordem entre baixo e alto: inclinações em
+        # [baixo, alto] (sem os extremos marcados em ``abertos``), mais
+        # os pontos idênticos quando os dois extremos ordenam os empates
+        # de formas opostas. O extremo aberto vem da ordem dos empates:
+        # em y - t·x, t e o float vizinho dão a mesma ordem
+        ordem_baixo = _ordem(x, y, baixo, abertos[0])
+        seq = _postos(_ordem(x, y, alto, not abertos[1]))[ordem_baixo]
+        total, i, j = _inversoes(seq, probabilidade, rng, limite)
+        if i is not None:
+            i, j = ordem_baixo[i], ordem_baixo[j]
+        return total - (identicos if abertos[0] == abertos[1] else 0), i, j
+
+    def mediana():
+        return float(np.mean([valores[alvo] for alvo in alvos])), info
+
+    def resolver(abaixo, pendentes, i, j):
+        # Pendentes a partir dos pares da faixa, todos enumerados
+        posicoes = [alvo - abaixo for alvo in pendentes]
+        valores.update(zip(pendentes, _selecionar(_inclinacoes(x, y, i, j), posicoes)))
+        return mediana()
+
+    valores = {}
+    pendentes = sorted(set(alvos))
+    baixo, alto = -np.inf, np.inf
+    abertos = (False, False)
+    abaixo, faixa = 0, pares
+    candidatos = _inclinacoes(x, y, rng.integers(0, n, m), rng.integers(0, n, m))
+    if len(candidatos) == 0:
+        _, i, j = entre(baixo, alto, min(1.0, m / pares))
+        candidatos = _inclinacoes(x, y, i, j)
+
+    z = margem
+    while True:
+        info["rodadas"] += 1
+        candidatos.sort()
+        k = len(candidatos)
+        if k == 0:
+            _, i, j = entre(baixo, alto, 1.0, abertos=abertos)
+            return resolver(abaixo, pendentes, i, j)
+
+        a = int(np.floor((pendentes[0] - abaixo) / faixa * k - z * np.sqrt(k)))
+        b = int(np.ceil((pendentes[-1] - abaixo) / faixa * k + z * np.sqrt(k)))
+        novo_baixo = candidatos[a] if a >= 0 else baixo
+        novo_alto = candidatos[b] if b < k else alto
+
+        if novo_baixo == baixo and novo_alto == alto:
+            # Sem progresso (muitas inclinações iguais): seleção por contagem
+            # entre os valores distintos da amostra. Cada rodada assim tira
+            # da faixa pelo menos os pares com a inclinação sorteada, então
+            # o laço sempre termina.
+            distintos = np.unique(candidatos)
+            limites = []
+            for alvo in pendentes:
+                # Quantos valores distintos têm no máximo ``alvo`` inclinações abaixo
+                esq, dir = 0, len(distintos)
+                while esq < dir:
+                    meio = (esq + dir) // 2
+                    if contagem(distintos[meio]) <= alvo:
+                        esq = meio + 1
+                    else:
+                        dir = meio
+
+                # O alvo fica no valor distintos[esq - 1] ou logo acima dele,
+                # abaixo de distintos[esq]; os extremos viram abertos
+                if esq > 0:
+                    valor = distintos[esq - 1]
+                    ate_valor = contagem(valor, True)
+                    if alvo < ate_valor:
+                        valores[alvo] = float(valor)
+                        continue
+                    inferior = (valor, True, ate_valor)
+                else:
+                    inferior = (baixo, abertos[0], abaixo)
+
+                if esq < len(distintos):
+                    superior = (distintos[esq], True, contagem(distintos[esq]))
+                else:
+                    superior = (alto, abertos[1], abaixo + faixa)
+                limites.append((inferior, superior))
+
+            pendentes = [alvo for alvo in pendentes if alvo not in valores]
+            if not pendentes:
+                return mediana()
+
+            baixo, aberto_baixo, abaixo = limites[0][0]
+            alto, aberto_alto, fim_faixa = limites[-1][1]
+            abertos = (aberto_baixo, aberto_alto)
+            faixa = fim_faixa - abaixo
+            z = margem
+
+            if faixa <= limite / 2:
+                _, i, j = entre(baixo, alto, 1.0, abertos=abertos)
+                return resolver(abaixo, pendentes, i, j)
+
+            _, i, j = entre(baixo, alto, min(1.0, m / faixa), abertos=abertos)
+            candidatos = _inclinacoes(x, y, i, j)
+            continue
+
+        novo_abaixo = abaixo if novo_baixo == baixo else abaixo_de(novo_baixo)
+        if novo_abaixo > pendentes[0]:
+            z *= 2
+            continue
+
+        estimativa = faixa * (min(b, k) - max(a, 0)) / k
+        enumerar = estimativa <= limite / 2
+        probabilidade = 1.0 if enumerar else m / estimativa
+        novos_abertos = (abertos[0] and novo_baixo == baixo, abertos[1] and novo_alto == alto)
+        nova_faixa, i, j = entre(
+            novo_baixo, novo_alto, probabilidade, limite if enumerar else None, novos_abertos
+        )
+
+        if pendentes[-1] >= novo_abaixo + nova_faixa:
+            z *= 2
+            continue
+
+        baixo, alto, abaixo, faixa = novo_baixo, novo_alto, novo_abaixo, nova_faixa
+        abertos = novos_abertos
+        z = margem
+
+        if baixo == alto:
+            valores.update((alvo, float(baixo)) for alvo in pendentes)
+            return mediana()
+
+        if i is None:
+            # A faixa era maior que a estimativa: amostra sobre a contagem exata
+            _, i, j = entre(baixo, alto, min(1.0, m / faixa), abertos=abertos)
+        elif enumerar:
+            return resolver(abaixo, pendentes, i, j)
+
+        candidatos = _inclinacoes(x, y, i, j)
@@ -0,0 +1,105 @@
+"""
+Previsão em lote a partir de arquivos.
+
+Aplica um modelo treinado (ou um artefato JSON gravado por
+``salvar()``) a um arquivo inteiro sem carregá-lo na memória: a coluna X
+é lida em blocos pelo ``DataLoader``, as previsões são calculadas no
+próprio array do bloco (``prever_inplace``) e cada bloco é gravado no
+destino assim que fica pronto. A memória usada depende só do tamanho do
+bloco, não do arquivo.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import DataLoader, TAMANHO_CHUNK_PADRAO
+from .export import abrir_escritor
+from .models import _ModeloSerializavel
+
+
+COLUNA_PREVISAO = "previsao"
+
+
+def prever_arquivo(modelo, entrada, saida, coluna=None, manter=(),
+                   tamanho_chunk=TAMANHO_CHUNK_PADRAO):
+    """
+    Gera previsões para todas as linhas de ``entrada`` e grava em ``saida``.
+
+    Parameters
+    ----------
+    modelo : RegressionModel, LogLogRegressionModel ou str
+        Modelo treinado ou caminho de um artefato JSON.
+    entrada : str
+        Arquivo com a coluna X (CSV, JSON, XLS ou XLSX).
+    saida : str
+        Destino ``.csv``, ``.csv.gz``, ``.parquet`` ou ``.xlsx``, escrito
+        bloco a bloco.
+    coluna : str, optional
+        Coluna usada como X; por padrão a coluna de treino do modelo.
+    manter : iterable of str
+        Colunas da entrada copiadas para a saída (ex.: identificadores).
+    tamanho_chunk : int
+        Linhas por bloco.
+
+    Returns
+    -------
+    dict
+        ``linhas``, ``previstas``, ``invalidas`` (X ausente ou fora do
+        domínio do modelo, previsão NaN), ``chunks``, ``segundos`` e
+        ``linhas_por_segundo``.
+    """
+    if isinstance(modelo, str):
+        modelo = _ModeloSerializavel.carregar(modelo)
+
+    if modelo.metricas is None:
+        raise ValueError("Modelo não treinado. Execute treinar() primeiro.")
+
+    if tamanho_chunk <= 0:
+        raise ValueError("tamanho_chunk deve ser positivo.")
+
+    coluna = coluna or modelo.col_x
+    manter = [c for c in manter if c != coluna]
+
+    pasta = os.path.dirname(saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    escritor = abrir_escritor(saida)
+    relatorio = {"linhas": 0, "previstas": 0, "invalidas": 0, "chunks": 0}
+    loader = DataLoader(entrada)
+    inicio = time.perf_counter()
+
+    try:
+        for chunk in loader.iterar_brutos([coluna, *manter], tamanho_chunk):
+            for col in [coluna, *manter]:
+                if col not in chunk.columns:
+                    raise ValueError(f"Coluna '{col}' não encontrada no dataset.")
+
+            x = DataLoader.para_numerico(chunk[coluna])
+            previsao = modelo.prever_inplace(x.copy())
+
+            bloco = {col: chunk[col].to_numpy() for col in manter}
+            bloco[coluna] = x
+            bloco[COLUNA_PREVISAO] = previsao
+            escritor.escrever(pd.DataFrame(bloco, columns=[*manter, coluna, COLUNA_PREVISAO]))
+
+            invalidas = int(np.isnan(previsao).sum())
+            relatorio["linhas"] += len(chunk)
+            relatorio["invalidas"] += invalidas
+            relatorio["previstas"] += len(chunk) - invalidas
+            relatorio["chunks"] += 1
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Erro ao processar arquivo: {e}")
+    finally:
+        escritor.fechar()
+
+    segundos = time.perf_counter() - inicio
+    relatorio["segundos"] = segundos
+    relatorio["linhas_por_segundo"] = relatorio["linhas"] / segundos if segundos > 0 else None
+
+    return relatorio
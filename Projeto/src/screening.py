@@ -0,0 +1,151 @@
+"""
+Triagem de todos os pares de colunas numéricas.
+
+Calcula, para cada par ordenado (X, Y), Pearson e as regressões linear e
+log-log usando apenas produtos de matrizes (BLAS): com a matriz de
+valores ``V`` (NaN zerados) e a máscara de válidos ``M``, as somas
+pareadas saem de ``M.T @ M``, ``V.T @ M``, ``(V**2).T @ M`` e
+``V.T @ V``. Cada par usa somente as linhas em que as duas colunas são
+válidas, sem nenhum laço Python por par.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import DataLoader
+
+
+def _colunas_numericas(df, colunas, minimo_validos):
+    """Converte as colunas para float64 (tokens inválidos -> NaN) e descarta as vazias"""
+    if colunas is None:
+        colunas = list(df.columns)
+
+    nomes, arrays = [], []
+    for col in colunas:
+        valores = DataLoader.para_numerico(df[col])
+        if np.count_nonzero(~np.isnan(valores)) >= minimo_validos:
+            nomes.append(col)
+            arrays.append(valores)
+
+    if len(nomes) < 2:
+        raise ValueError("São necessárias pelo menos duas colunas numéricas.")
+
+    return nomes, np.column_stack(arrays)
+
+
+def _somas_pareadas(matriz):
+    """
+    Contagem, médias e momentos centrados para todos os pares (i, j),
+    considerando só as linhas em que i e j são válidos.
+
+    Retorna matrizes p x p onde [i, j] descreve X = coluna i, Y = coluna j.
+    """
+    validos = ~np.isnan(matriz)
+    m = validos.astype(np.float64)
+
+    # Centraliza pela média de cada coluna para estabilidade numérica
+    contagem = validos.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centro = np.where(contagem > 0, np.where(validos, matriz, 0.0).sum(axis=0) / contagem, 0.0)
+    v = np.where(validos, matriz - centro, 0.0)
+
+    n = m.T @ m                 # linhas válidas em ambas
+    soma_x = v.T @ m            # [i, j]: soma de x_i onde j também é válido
+    soma_y = soma_x.T
+    soma_xx = (v * v).T @ m
+    soma_yy = soma_xx.T
+    soma_xy = v.T @ v
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media_x = soma_x / n
+        media_y = soma_y / n
+        sxx = soma_xx - soma_x * media_x
+        syy = soma_yy - soma_y * media_y
+        sxy = soma_xy - soma_x * media_y
+
+    media_x = media_x + centro[:, None]
+    media_y = media_y + centro[None, :]
+
+    return n, media_x, media_y, sxx, syy, sxy
+
+
+def _ajustes(n, media_x, media_y, sxx, syy, sxy, minimo_pares):
+    """Pearson, coeficiente, intercepto e R² para todas as matrizes de pares"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pearson = sxy / np.sqrt(sxx * syy)
+        coef = sxy / sxx
+        intercept = media_y - coef * media_x
+        r2 = pearson ** 2
+
+    insuficiente = (n < minimo_pares) | (sxx <= 0)
+    for matriz in (pearson, coef, intercept, r2):
+        matriz[insuficiente] = np.nan
+
+    return pearson, coef, intercept, r2
+
+
+def matriz_pearson(df, colunas=None, minimo_pares=3):
+    """
+    Matriz de correlação de Pearson pareada (NaN-aware) como DataFrame.
+    """
+    nomes, matriz = _colunas_numericas(df, colunas, minimo_pares)
+    pearson = _ajustes(*_somas_pareadas(matriz), minimo_pares)[0]
+    np.fill_diagonal(pearson, 1.0)
+    return pd.DataFrame(pearson, index=nomes, columns=nomes)
+
+
+def triagem_pares(df, colunas=None, minimo_pares=3, ordenar_por="pearson_abs"):
+    """
+    Pearson e regressões linear e log-log de todos os pares ordenados de
+    colunas numéricas, ranqueados.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados brutos ou limpos; colunas em texto são convertidas como em
+        ``DataLoader.limpar``.
+    colunas : list, optional
+        Restringe a triagem a essas colunas.
+    minimo_pares : int
+        Mínimo de linhas válidas em comum para o par ser avaliado.
+    ordenar_por : str
+        Coluna do resultado usada no ranking (decrescente). O padrão
+        ``pearson_abs`` é |r|; ``r2_loglog`` prioriza leis de potência.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por par (X, Y) com ``n``, ``pearson``, ``coeficiente``,
+        ``intercepto``, ``r2`` e os equivalentes ``*_loglog``.
+    """
+    nomes, matriz = _colunas_numericas(df, colunas, minimo_pares)
+
+    n, *momentos = _somas_pareadas(matriz)
+    pearson, coef, intercept, r2 = _ajustes(n, *momentos, minimo_pares)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log = np.where(matriz > 0, np.log10(np.where(matriz > 0, matriz, 1.0)), np.nan)
+    n_log, *momentos_log = _somas_pareadas(log)
+    _, coef_log, intercept_log, r2_log = _ajustes(n_log, *momentos_log, minimo_pares)
+
+    i, j = np.where(~np.eye(len(nomes), dtype=bool))
+
+    resultado = pd.DataFrame({
+        "coluna_x": np.asarray(nomes, dtype=object)[i],
+        "coluna_y": np.asarray(nomes, dtype=object)[j],
+        "n": n[i, j].astype(np.int64),
+        "pearson": pearson[i, j],
+        "coeficiente": coef[i, j],
+        "intercepto": intercept[i, j],
+        "r2": r2[i, j],
+        "n_loglog": n_log[i, j].astype(np.int64),
+        "coeficiente_loglog": coef_log[i, j],
+        "intercepto_loglog": intercept_log[i, j],
+        "r2_loglog": r2_log[i, j]
+    })
+    resultado["pearson_abs"] = resultado["pearson"].abs()
+
+    if ordenar_por not in resultado.columns:
+        raise ValueError(f"Coluna de ordenação '{ordenar_por}' inválida.")
+
+    return resultado.sort_values(ordenar_por, ascending=False, na_position="last").reset_index(drop=True)
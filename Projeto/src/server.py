@@ -0,0 +1,346 @@
+"""
+Servidor HTTP de previsão (asyncio, somente biblioteca padrão).
+
+Carrega os artefatos JSON gravados por ``salvar()`` e atende previsões
+por HTTP. Requisições concorrentes para o mesmo modelo são agrupadas em
+micro-lotes: um único ``prever_inplace`` vetorizado por lote, em vez de
+uma chamada NumPy por requisição. O lote fecha quando atinge
+``tamanho_lote`` valores ou após ``espera_maxima`` segundos. Uma linha
+de requisição malformada ou um Content-Length inválido recebe 400 e um
+corpo acima de ``corpo_maximo`` bytes, 413, sem que o corpo seja lido.
+NaN e infinitos nas respostas saem como ``null`` (JSON válido).
+
+Rotas:
+    POST /prever/<modelo>   corpo {"x": 12.5} ou {"x": [1, 2, 3]}
+    GET  /modelos           coeficientes e metadados carregados
+    GET  /metricas          latência (p50/p95/p99), vazão e tamanho dos lotes
+"""
+
+import asyncio
+import glob
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from .models import _ModeloSerializavel
+from .sketch import QuantileSketch
+
+
+TAMANHO_LOTE_PADRAO = 4096
+ESPERA_MAXIMA_PADRAO = 0.001  # segundos
+CORPO_MAXIMO_PADRAO = 16 * 1024 * 1024  # bytes
+
+_STATUS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error"
+}
+
+
+class _RequisicaoInvalida(ValueError):
+    """Requisição que não pode ser lida; respondida com ``status`` e a conexão é fechada"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _json_finito(valor):
+    """Troca floats não finitos (NaN, ±inf) por None: JSON não os representa"""
+    if isinstance(valor, dict):
+        return {chave: _json_finito(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_json_finito(v) for v in valor]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def carregar_modelos(caminho):
+    """
+    Lê artefatos de modelo de um arquivo JSON ou de todos os ``*.json``
+    de uma pasta. O nome de cada modelo é o nome do arquivo sem extensão.
+    """
+    if os.path.isdir(caminho):
+        arquivos = sorted(glob.glob(os.path.join(caminho, "*.json")))
+    else:
+        arquivos = [caminho]
+
+    modelos = {}
+    for arquivo in arquivos:
+        nome = os.path.splitext(os.path.basename(arquivo))[0]
+        modelos[nome] = _ModeloSerializavel.carregar(arquivo)
+
+    if not modelos:
+        raise ValueError(f"Nenhum modelo encontrado em '{caminho}'.")
+
+    return modelos
+
+
+class Metricas:
+    """Contadores e distribuição de latência do servidor"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.requisicoes = 0
+        self.erros = 0
+        self.valores = 0
+        self.lotes = 0
+        self.latencia = QuantileSketch()
+
+    def registrar(self, segundos, valores=0, erro=False):
+        self.requisicoes += 1
+        self.valores += valores
+        if erro:
+            self.erros += 1
+        self.latencia.atualizar(np.array([segundos * 1000.0]))
+
+    def resumo(self):
+        decorrido = time.perf_counter() - self.inicio
+        latencia = None
+        if self.requisicoes:
+            p50, p95, p99 = self.latencia.quantis([0.5, 0.95, 0.99])
+            latencia = {"p50": p50, "p95": p95, "p99": p99}
+
+        return {
+            "segundos": decorrido,
+            "requisicoes": self.requisicoes,
+            "erros": self.erros,
+            "valores_previstos": self.valores,
+            "lotes": self.lotes,
+            "valores_por_lote": self.valores / self.lotes if self.lotes else None,
+            "requisicoes_por_segundo": self.requisicoes / decorrido if decorrido > 0 else None,
+            "latencia_ms": latencia
+        }
+
+
+class MicroLote:
+    """
+    Fila de previsões de um modelo. Cada ``prever`` devolve um future que
+    é resolvido quando o lote em que entrou é calculado.
+    """
+
+    def __init__(self, modelo, metricas, tamanho_lote=TAMANHO_LOTE_PADRAO,
+                 espera_maxima=ESPERA_MAXIMA_PADRAO):
+        self.modelo = modelo
+        self.metricas = metricas
+        self.tamanho_lote = tamanho_lote
+        self.espera_maxima = espera_maxima
+        self.fila = asyncio.Queue()
+        self.tarefa = asyncio.get_running_loop().create_task(self._executar())
+
+    async def prever(self, valores):
+        futuro = asyncio.get_running_loop().create_future()
+        await self.fila.put((valores, futuro))
+        return await futuro
+
+    async def _proximo_lote(self):
+        loop = asyncio.get_running_loop()
+        lote = [await self.fila.get()]
+        total = len(lote[0][0])
+        prazo = loop.time() + self.espera_maxima
+
+        while total < self.tamanho_lote:
+            try:
+                item = self.fila.get_nowait()
+            except asyncio.QueueEmpty:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.fila.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+            lote.append(item)
+            total += len(item[0])
+
+        return lote
+
+    async def _executar(self):
+        while True:
+            lote = await self._proximo_lote()
+
+            try:
+                x = np.concatenate([valores for valores, _ in lote])
+                self.modelo.prever_inplace(x)
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            self.metricas.lotes += 1
+            inicio = 0
+            for valores, futuro in lote:
+                if not futuro.done():
+                    futuro.set_result(x[inicio:inicio + len(valores)])
+                inicio += len(valores)
+
+    def fechar(self):
+        self.tarefa.cancel()
+
+
+class ServidorPrevisao:
+    """
+    Servidor HTTP/1.1 mínimo (keep-alive, corpo JSON) sobre
+    ``asyncio.start_server``.
+    """
+
+    def __init__(self, modelos, tamanho_lote=TAMANHO_LOTE_PADRAO, espera_maxima=ESPERA_MAXIMA_PADRAO,
+                 corpo_maximo=CORPO_MAXIMO_PADRAO):
+        if not modelos:
+            raise ValueError("Nenhum modelo para servir.")
+
+        self.modelos = modelos
+        self.tamanho_lote = tamanho_lote
+        self.espera_maxima = espera_maxima
+        self.corpo_maximo = corpo_maximo
+        self.metricas = Metricas()
+        self.lotes = {}
+        self.servidor = None
+
+    async def iniciar(self, host="127.0.0.1", porta=8000):
+        """Abre o socket; ``porta=0`` escolhe uma porta livre. Devolve a porta."""
+        self.lotes = {
+            nome: MicroLote(modelo, self.metricas, self.tamanho_lote, self.espera_maxima)
+            for nome, modelo in self.modelos.items()
+        }
+        self.servidor = await asyncio.start_server(self._conexao, host, porta)
+        return self.servidor.sockets[0].getsockname()[1]
+
+    async def servir(self, host="127.0.0.1", porta=8000):
+        await self.iniciar(host, porta)
+        async with self.servidor:
+            await self.servidor.serve_forever()
+
+    async def fechar(self):
+        for lote in self.lotes.values():
+            lote.fechar()
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+
+    async def _conexao(self, reader, writer):
+        try:
+            while True:
+                try:
+                    requisicao = await self._ler_requisicao(reader, self.corpo_maximo)
+                except _RequisicaoInvalida as e:
+                    # O corpo não foi lido: a conexão não pode ser reaproveitada
+                    await self._escrever(writer, e.status, {"erro": str(e)}, False)
+                    break
+                if requisicao is None:
+                    break
+
+                metodo, alvo, manter, corpo = requisicao
+                inicio = time.perf_counter()
+                status, resposta, valores = await self._responder(metodo, alvo, corpo)
+                await self._escrever(writer, status, resposta, manter)
+
+                if alvo.startswith("/prever"):
+                    self.metricas.registrar(time.perf_counter() - inicio, valores, erro=status != 200)
+
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _escrever(writer, status, resposta, manter):
+        dados = json.dumps(_json_finito(resposta), ensure_ascii=False, allow_nan=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_STATUS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(dados)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + dados
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _ler_linha(reader):
+        try:
+            return await reader.readline()
+        except ValueError:
+            # Linha acima do limite do StreamReader (64 KiB)
+            raise _RequisicaoInvalida(400, "Linha de requisição ou cabeçalho longo demais.")
+
+    @classmethod
+    async def _ler_requisicao(cls, reader, corpo_maximo=CORPO_MAXIMO_PADRAO):
+        linha = await cls._ler_linha(reader)
+        if not linha:
+            return None
+
+        partes = linha.decode("latin-1").split()
+        if len(partes) != 3:
+            raise _RequisicaoInvalida(400, "Linha de requisição inválida.")
+        metodo, alvo, versao = partes
+
+        cabecalhos = {}
+        while True:
+            linha = await cls._ler_linha(reader)
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            chave, _, valor = linha.decode("latin-1").partition(":")
+            cabecalhos[chave.strip().lower()] = valor.strip()
+
+        tamanho = cabecalhos.get("content-length", "0")
+        if not (tamanho.isascii() and tamanho.isdigit()):
+            raise _RequisicaoInvalida(400, f"Content-Length inválido: '{tamanho}'.")
+        tamanho = int(tamanho)
+        if tamanho > corpo_maximo:
+            raise _RequisicaoInvalida(413, f"Corpo maior que o limite de {corpo_maximo} bytes.")
+        corpo = await reader.readexactly(tamanho) if tamanho else b""
+
+        conexao = cabecalhos.get("connection", "").lower()
+        manter = conexao != "close" and (versao == "HTTP/1.1" or conexao == "keep-alive")
+
+        return metodo, alvo, manter, corpo
+
+    async def _responder(self, metodo, alvo, corpo):
+        """Devolve (status, corpo JSON, quantidade de valores previstos)"""
+        if alvo == "/metricas" and metodo == "GET":
+            return 200, self.metricas.resumo(), 0
+
+        if alvo == "/modelos" and metodo == "GET":
+            return 200, {
+                nome: {
+                    "tipo": modelo.TIPO,
+                    "col_x": modelo.col_x,
+                    "col_y": modelo.col_y,
+                    "coeficiente": modelo.metricas["coeficiente"],
+                    "intercepto": modelo.metricas["intercepto"],
+                    "r2": modelo.metricas["r2"]
+                }
+                for nome, modelo in self.modelos.items()
+            }, 0
+
+        if not alvo.startswith("/prever/"):
+            return 404, {"erro": "Rota não encontrada."}, 0
+
+        if metodo != "POST":
+            return 405, {"erro": "Use POST."}, 0
+
+        nome = alvo[len("/prever/"):]
+        if nome not in self.lotes:
+            return 404, {"erro": f"Modelo '{nome}' não encontrado."}, 0
+
+        try:
+            entrada = json.loads(corpo)["x"]
+            escalar = not isinstance(entrada, list)
+            valores = np.array([entrada] if escalar else entrada, dtype=np.float64)
+            if valores.ndim != 1:
+                raise ValueError
+        except (ValueError, TypeError, KeyError):
+            return 400, {"erro": 'Corpo deve ser {"x": número} ou {"x": [números]}.'}, 0
+
+        try:
+            previsao = await self.lotes[nome].prever(valores)
+        except Exception as e:
+            return 500, {"erro": str(e)}, 0
+
+        previsao = previsao.tolist()
+        return 200, {"modelo": nome, "previsao": previsao[0] if escalar else previsao}, len(previsao)
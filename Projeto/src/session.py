@@ -0,0 +1,154 @@
+"""
+Sessão de análise compartilhada.
+
+Guarda X e Y já limpos uma única vez, como arrays float64 contíguos e
+somente leitura, e os entrega por referência ao ``UEVAnalyzer``, aos
+modelos e ao ``Visualizer``. As colunas derivadas (log10 dos pares
+positivos e a razão k) e o ``StatsAccumulator`` são calculados na
+primeira vez em que alguém os pede e reaproveitados por todos.
+
+Nenhuma etapa copia o DataFrame ou chama ``dropna``: o pico de memória
+fica perto do tamanho dos próprios dados (ver benchmarks/bench_memoria.py).
+Como X e Y são visões das colunas do DataFrame limpo, ele não deve ser
+alterado enquanto a sessão estiver em uso.
+"""
+
+from functools import cached_property
+
+import numpy as np
+
+from .accumulator import StatsAccumulator
+
+
+TAMANHO_BLOCO_PADRAO = 1_000_000
+
+
+def _somente_leitura(array):
+    # view(): a trava vale só para a sessão, não para o DataFrame de origem
+    array = np.ascontiguousarray(array, dtype=np.float64).view()
+    array.flags.writeable = False
+    return array
+
+
+class SessaoAnalise:
+    """
+    Parameters
+    ----------
+    x, y : array-like
+        Colunas numéricas de mesmo tamanho. Pares com NaN são descartados
+        (única situação em que há cópia).
+    coluna_x, coluna_y : str
+        Nomes das colunas, usados nos rótulos e validações.
+    owner : array-like, optional
+        Coluna Owner alinhada com x e y.
+    tamanho_bloco : int
+        Tamanho dos blocos nas passadas que geram temporários.
+    """
+
+    def __init__(self, x, y, coluna_x, coluna_y, owner=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        if len(x) != len(y):
+            raise ValueError("x e y devem ter o mesmo tamanho.")
+
+        validos = ~(np.isnan(x) | np.isnan(y))
+        if not validos.all():
+            x, y = x[validos], y[validos]
+            if owner is not None:
+                owner = np.asarray(owner)[validos]
+
+        self.x = _somente_leitura(x)
+        self.y = _somente_leitura(y)
+        self.owner = owner
+        self.coluna_x = coluna_x
+        self.coluna_y = coluna_y
+        self.tamanho_bloco = tamanho_bloco
+
+    @classmethod
+    def de_dataframe(cls, df, coluna_x, coluna_y, col_owner="Owner", **opcoes):
+        """Sessão sobre as colunas de um DataFrame limpo (sem cópia quando já são float64)"""
+        for col in [coluna_x, coluna_y]:
+            if col not in df.columns:
+                raise ValueError(f"Coluna '{col}' não encontrada.")
+
+        owner = df[col_owner].to_numpy() if col_owner in df.columns else None
+        return cls(
+            df[coluna_x].to_numpy(dtype=np.float64, copy=False),
+            df[coluna_y].to_numpy(dtype=np.float64, copy=False),
+            coluna_x,
+            coluna_y,
+            owner=owner,
+            **opcoes
+        )
+
+    @classmethod
+    def de_column_store(cls, store, **opcoes):
+        """Sessão sobre as colunas mapeadas de um ColumnStore (sem cópia: as páginas vêm do disco sob demanda)"""
+        return cls(store.coluna(store.coluna_x), store.coluna(store.coluna_y), store.coluna_x, store.coluna_y, **opcoes)
+
+    # Mesma interface mínima de DataFrame/ColumnStore usada nas validações
+    @property
+    def columns(self):
+        return [self.coluna_x, self.coluna_y]
+
+    @property
+    def empty(self):
+        return len(self.x) == 0
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def nbytes(self):
+        """Memória dos dados base e das colunas derivadas já calculadas"""
+        total = self.x.nbytes + self.y.nbytes
+        for nome in ("log_x", "log_y", "k"):
+            if nome in self.__dict__:
+                total += self.__dict__[nome].nbytes
+        return total
+
+    # ----------------------------
+    # Colunas derivadas (preguiçosas)
+    # ----------------------------
+    @cached_property
+    def positivos(self):
+        """Máscara dos pares com x > 0 e y > 0 (domínio do log-log)"""
+        return (self.x > 0) & (self.y > 0)
+
+    @cached_property
+    def log_x(self):
+        return _somente_leitura(np.log10(self.x[self.positivos]))
+
+    @cached_property
+    def log_y(self):
+        return _somente_leitura(np.log10(self.y[self.positivos]))
+
+    @cached_property
+    def k(self):
+        """Razão y / x dos pares com x != 0"""
+        nao_zero = self.x != 0
+        k = self.y[nao_zero]
+        k /= self.x[nao_zero]
+        return _somente_leitura(k)
+
+    @cached_property
+    def acumulador(self):
+        """Estatísticas suficientes em blocos (temporários limitados ao bloco)"""
+        return StatsAccumulator.de_blocos(self.iterar_blocos())
+
+    def coluna(self, nome):
+        """Array de X, Y (pelo nome) ou 'k'"""
+        if nome == self.coluna_x:
+            return self.x
+        if nome == self.coluna_y:
+            return self.y
+        if nome == "k":
+            return self.k
+        raise ValueError(f"A coluna '{nome}' não faz parte da análise.")
+
+    def iterar_blocos(self, tamanho=None):
+        """Gera pares (x, y) de visões consecutivas, sem cópia"""
+        tamanho = tamanho or self.tamanho_bloco
+        for inicio in range(0, len(self.x), tamanho):
+            yield self.x[inicio:inicio + tamanho], self.y[inicio:inicio + tamanho]
@@ -0,0 +1,219 @@
+"""
+Sketch de quantis mesclável com erro relativo garantido.
+
+``QuantileSketch`` segue a ideia do DDSketch: cada valor vai para um
+bucket logarítmico de largura relativa ``erro_relativo``, de forma que
+qualquer quantil é estimado com erro relativo menor que esse limite.
+Os buckets são contagens inteiras em arrays NumPy, então a inserção é
+vetorizada por bloco e a combinação de sketches (chunks, arquivos,
+processos) é uma simples soma de contagens.
+
+Enquanto o total de valores não passa de ``limite_exato`` o sketch
+guarda os próprios valores e responde quantis exatos.
+"""
+
+import numpy as np
+
+
+ERRO_RELATIVO_PADRAO = 0.01
+LIMITE_EXATO_PADRAO = 100_000
+
+
+class _Buckets:
+    """Contagens densas por índice de bucket, com deslocamento variável"""
+
+    __slots__ = ("inicio", "contagens")
+
+    def __init__(self):
+        self.inicio = 0
+        self.contagens = np.zeros(0, dtype=np.int64)
+
+    def _garantir(self, minimo, maximo):
+        """Amplia o array para cobrir os índices [minimo, maximo]"""
+        if len(self.contagens) == 0:
+            self.inicio = minimo
+            self.contagens = np.zeros(maximo - minimo + 1, dtype=np.int64)
+            return
+
+        fim = self.inicio + len(self.contagens) - 1
+        novo_inicio = min(self.inicio, minimo)
+        novo_fim = max(fim, maximo)
+
+        if novo_inicio == self.inicio and novo_fim == fim:
+            return
+
+        novas = np.zeros(novo_fim - novo_inicio + 1, dtype=np.int64)
+        deslocamento = self.inicio - novo_inicio
+        novas[deslocamento:deslocamento + len(self.contagens)] = self.contagens
+        self.inicio, self.contagens = novo_inicio, novas
+
+    def adicionar(self, indices):
+        if len(indices) == 0:
+            return
+        minimo, maximo = int(indices.min()), int(indices.max())
+        self._garantir(minimo, maximo)
+        base = minimo - self.inicio
+        self.contagens[base:base + maximo - minimo + 1] += np.bincount(indices - minimo)
+
+    def combinar(self, outro):
+        if len(outro.contagens) == 0:
+            return
+        fim = outro.inicio + len(outro.contagens) - 1
+        self._garantir(outro.inicio, fim)
+        base = outro.inicio - self.inicio
+        self.contagens[base:base + len(outro.contagens)] += outro.contagens
+
+    @property
+    def total(self):
+        return int(self.contagens.sum())
+
+
+class QuantileSketch:
+    """
+    Quantis aproximados (erro relativo limitado) ou exatos para dados pequenos.
+
+    Parameters
+    ----------
+    erro_relativo : float
+        Erro relativo máximo dos quantis estimados (ex.: 0.01 = 1%).
+    limite_exato : int
+        Até esse número de valores os quantis são exatos; ao ultrapassar,
+        os valores são convertidos em buckets. Use 0 para sempre aproximar
+        ou ``None`` para sempre manter os valores (modo exato).
+    """
+
+    def __init__(self, erro_relativo=ERRO_RELATIVO_PADRAO, limite_exato=LIMITE_EXATO_PADRAO):
+        if not 0 < erro_relativo < 1:
+            raise ValueError("erro_relativo deve estar entre 0 e 1.")
+
+        self.erro_relativo = erro_relativo
+        self.limite_exato = limite_exato
+        self._gamma = (1 + erro_relativo) / (1 - erro_relativo)
+        self._log_gamma = np.log(self._gamma)
+
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self._valores = []  # modo exato
+        self._exato = True
+        self._positivos = _Buckets()
+        self._negativos = _Buckets()
+        self._zeros = 0
+
+    @property
+    def exato(self):
+        return self._exato
+
+    # ----------------------------
+    # Inserção
+    # ----------------------------
+    def _indices(self, valores):
+        return np.ceil(np.log(valores) / self._log_gamma).astype(np.int64)
+
+    def _inserir_buckets(self, valores):
+        self._positivos.adicionar(self._indices(valores[valores > 0]))
+        self._negativos.adicionar(self._indices(-valores[valores < 0]))
+        self._zeros += int(np.count_nonzero(valores == 0))
+
+    def _converter(self):
+        """Passa do modo exato para buckets"""
+        self._exato = False
+        for valores in self._valores:
+            self._inserir_buckets(valores)
+        self._valores = []
+
+    def atualizar(self, valores):
+        """Incorpora um bloco de valores (NaN e infinitos são ignorados)"""
+        valores = np.asarray(valores, dtype=np.float64)
+        valores = valores[np.isfinite(valores)]
+
+        if len(valores) == 0:
+            return self
+
+        self.n += len(valores)
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+        if self._exato:
+            self._valores.append(np.array(valores))
+            if self.limite_exato is not None and self.n > self.limite_exato:
+                self._converter()
+        else:
+            self._inserir_buckets(valores)
+
+        return self
+
+    def combinar(self, outro):
+        """Mescla outro sketch com o mesmo erro relativo"""
+        if outro.n == 0:
+            return self
+
+        if not np.isclose(outro.erro_relativo, self.erro_relativo):
+            raise ValueError("Sketches com erro relativo diferente não podem ser combinados.")
+
+        self.n += outro.n
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+
+        if outro._exato:
+            if self._exato:
+                self._valores.extend(outro._valores)
+                if self.limite_exato is not None and self.n > self.limite_exato:
+                    self._converter()
+            else:
+                for valores in outro._valores:
+                    self._inserir_buckets(valores)
+            return self
+
+        if self._exato:
+            self._converter()
+
+        self._positivos.combinar(outro._positivos)
+        self._negativos.combinar(outro._negativos)
+        self._zeros += outro._zeros
+        return self
+
+    # ----------------------------
+    # Consulta
+    # ----------------------------
+    def _valor_bucket(self, indice):
+        return 2 * self._gamma ** indice / (self._gamma + 1)
+
+    def quantil(self, q):
+        """Quantil ``q`` (0 a 1); NaN se o sketch estiver vazio"""
+        if not 0 <= q <= 1:
+            raise ValueError("q deve estar entre 0 e 1.")
+
+        if self.n == 0:
+            return float("nan")
+
+        if self._exato:
+            return float(np.quantile(np.concatenate(self._valores), q))
+
+        posicao = q * (self.n - 1)
+
+        # Ordem crescente: negativos (maior índice primeiro), zeros, positivos
+        negativos = self._negativos.contagens[::-1]
+        acumulado = np.cumsum(negativos)
+        if len(acumulado) and posicao < acumulado[-1]:
+            i = int(np.searchsorted(acumulado, posicao, side="right"))
+            indice = self._negativos.inicio + len(negativos) - 1 - i
+            valor = -self._valor_bucket(indice)
+        else:
+            posicao -= acumulado[-1] if len(acumulado) else 0
+            if posicao < self._zeros:
+                valor = 0.0
+            else:
+                posicao -= self._zeros
+                acumulado = np.cumsum(self._positivos.contagens)
+                i = min(int(np.searchsorted(acumulado, posicao, side="right")), len(acumulado) - 1)
+                valor = self._valor_bucket(self._positivos.inicio + i)
+
+        return float(min(max(valor, self.minimo), self.maximo))
+
+    def quantis(self, qs):
+        """Vários quantis de uma vez"""
+        return [self.quantil(q) for q in qs]
+
+    def mediana(self):
+        return self.quantil(0.5)
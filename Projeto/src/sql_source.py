@@ -0,0 +1,502 @@
+"""
+Fonte de dados SQL (SQLite ou qualquer conexão DB-API 2.0).
+
+``FonteSQL`` lê uma tabela ou o resultado de uma consulta sem exportar
+nada para planilhas: só as colunas pedidas (X, Y e Owner) são
+selecionadas e as linhas chegam em lotes de ``fetchmany``, então a
+memória fica limitada ao tamanho do lote. O filtro de Owner vai para o
+``WHERE`` da consulta.
+
+``acumulador`` vai além e calcula no próprio banco as estatísticas
+suficientes (contagem, médias, mínimos e máximos, somas de quadrados e
+co-momentos, em duas passadas para evitar o cancelamento numérico de
+``SUM(x*x) - SUM(x)²/n``), nos espaços linear e log10. O resultado é um
+``StatsAccumulator`` sem quantis, que alimenta Pearson e os modelos
+linear e log-log sem trazer nenhuma linha para o Python; ``medianas``
+completa o resumo com as medianas exatas, também ordenadas no banco.
+
+No SQLite a conversão para número segue a mesma regra do ``DataLoader``
+(texto com espaços, "Not Specified", "N/A" etc.). Em outros bancos X e Y
+devem ser colunas numéricas; a conversão de texto depende do dialeto.
+"""
+
+import math
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+
+from .accumulator import StatsAccumulator, _Momentos
+from .data_loader import DataLoader, VALORES_INVALIDOS, TAMANHO_CHUNK_PADRAO
+
+
+# Arquivos abertos com sqlite3 (.sql: script executado em um banco em memória)
+EXTENSOES_SQL = (".sql", ".db", ".sqlite", ".sqlite3")
+
+_INVALIDOS = frozenset(VALORES_INVALIDOS)
+
+
+def _numero(valor):
+    """Texto -> float com as regras de ``DataLoader.para_numerico`` (None se inválido)"""
+    if valor is None:
+        return None
+    if isinstance(valor, (int, float)):
+        numero = float(valor)
+    else:
+        texto = str(valor).strip()
+        if texto in _INVALIDOS:
+            return None
+        try:
+            numero = float(texto)
+        except ValueError:
+            return None
+    return None if math.isnan(numero) else numero
+
+
+def e_fonte_sql(fonte):
+    """True para ``FonteSQL``, conexões DB-API e arquivos com extensão SQL/SQLite"""
+    if isinstance(fonte, FonteSQL) or hasattr(fonte, "cursor"):
+        return True
+    nome = fonte if isinstance(fonte, str) else getattr(fonte, "name", "")
+    return str(nome).lower().endswith(EXTENSOES_SQL)
+
+
+class _Parametros:
+    """Marcadores no ``paramstyle`` do driver e seus valores, na ordem de uso"""
+
+    def __init__(self, estilo):
+        if estilo not in ("qmark", "numeric", "named", "format", "pyformat"):
+            raise ValueError(f"paramstyle não suportado: '{estilo}'.")
+        self.estilo = estilo
+        self.lista = []
+
+    def __call__(self, valor):
+        self.lista.append(valor)
+        i = len(self.lista)
+        return {
+            "qmark": "?",
+            "numeric": f":{i}",
+            "named": f":p{i}",
+            "format": "%s",
+            "pyformat": f"%(p{i})s"
+        }[self.estilo]
+
+    @property
+    def valores(self):
+        if self.estilo in ("named", "pyformat"):
+            return {f"p{i}": valor for i, valor in enumerate(self.lista, start=1)}
+        return tuple(self.lista)
+
+
+class FonteSQL:
+    """
+    Parameters
+    ----------
+    origem : str, objeto de arquivo ou conexão DB-API
+        Caminho de um banco SQLite (``.db``, ``.sqlite``, ``.sqlite3``),
+        script ``.sql`` (executado em um SQLite em memória), o mesmo em
+        um objeto de arquivo (upload) ou uma conexão já aberta.
+    tabela : str, optional
+        Tabela lida (``esquema.tabela`` é aceito). Sem ela e sem
+        ``consulta``, usa a única tabela do banco SQLite.
+    consulta : str, optional
+        ``SELECT`` usado como fonte no lugar de uma tabela.
+    abrir_cursor : callable, optional
+        ``conexao -> cursor``. Drivers que carregam todo o resultado no
+        cursor padrão precisam de um cursor no servidor, por exemplo
+        ``lambda c: c.cursor(name="analise")`` no psycopg2.
+    paramstyle : str, optional
+        Estilo de parâmetros do driver (padrão: o do módulo da conexão).
+    """
+
+    def __init__(self, origem, tabela=None, consulta=None, abrir_cursor=None, paramstyle=None):
+        if tabela is not None and consulta is not None:
+            raise ValueError("Informe tabela ou consulta, não ambas.")
+
+        self.origem = origem
+        self.tabela = tabela
+        self.consulta = consulta
+        self.abrir_cursor = abrir_cursor
+        self._paramstyle = paramstyle
+        self._conexao = origem if hasattr(origem, "cursor") else None
+        self._colunas = None
+
+        nome = origem if isinstance(origem, str) else getattr(origem, "name", "")
+        self.name = str(nome)
+
+    # ----------------------------
+    # Conexão
+    # ----------------------------
+    def __getstate__(self):
+        # Vai para outros processos só com o caminho; a conexão é reaberta lá
+        if not isinstance(self.origem, str):
+            raise TypeError("FonteSQL só pode ser enviada a outro processo quando aberta por caminho.")
+        estado = self.__dict__.copy()
+        estado["_conexao"] = None
+        return estado
+
+    @property
+    def conexao(self):
+        if self._conexao is None:
+            self._conexao = self._abrir()
+        return self._conexao
+
+    def _abrir(self):
+        if isinstance(self.origem, str):
+            if not os.path.isfile(self.origem):
+                raise ValueError(f"Arquivo não encontrado: {self.origem}")
+            if self.origem.lower().endswith(".sql"):
+                with open(self.origem, encoding="utf-8") as f:
+                    return self._de_script(f.read())
+            # Somente leitura: a análise nunca altera o banco
+            return sqlite3.connect(f"file:{os.path.abspath(self.origem)}?mode=ro", uri=True)
+
+        if hasattr(self.origem, "seek"):
+            self.origem.seek(0)
+        conteudo = self.origem.read()
+
+        if self.name.lower().endswith(".sql"):
+            if isinstance(conteudo, bytes):
+                conteudo = conteudo.decode("utf-8")
+            return self._de_script(conteudo)
+
+        conexao = sqlite3.connect(":memory:")
+        conexao.deserialize(conteudo)
+        return conexao
+
+    @staticmethod
+    def _de_script(script):
+        conexao = sqlite3.connect(":memory:")
+        try:
+            conexao.executescript(script)
+        except sqlite3.Error as e:
+            raise ValueError(f"Erro ao executar o script SQL: {e}")
+        return conexao
+
+    def fechar(self):
+        if self._conexao is not None and self._conexao is not self.origem:
+            self._conexao.close()
+        self._conexao = None
+
+    @property
+    def sqlite(self):
+        return isinstance(self.conexao, sqlite3.Connection)
+
+    def _cursor(self):
+        if self.abrir_cursor is not None:
+            return self.abrir_cursor(self.conexao)
+        return self.conexao.cursor()
+
+    def _parametros(self):
+        estilo = self._paramstyle
+        if estilo is None:
+            modulo = sys.modules.get(type(self.conexao).__module__.split(".")[0])
+            estilo = getattr(modulo, "paramstyle", "qmark")
+        return _Parametros(estilo)
+
+    # ----------------------------
+    # Metadados
+    # ----------------------------
+    def tabelas(self):
+        """Tabelas e views do banco (apenas SQLite)"""
+        if not self.sqlite:
+            raise ValueError("Listagem de tabelas disponível apenas para SQLite; informe a tabela.")
+        linhas = self.conexao.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        return [nome for (nome,) in linhas]
+
+    def _origem_sql(self):
+        """Trecho do FROM: a tabela (entre aspas) ou a consulta como subconsulta"""
+        if self.consulta is not None:
+            return f"({self.consulta.strip().rstrip(';')}) AS fonte"
+
+        tabela = self.tabela
+        if tabela is None:
+            tabelas = self.tabelas()
+            if len(tabelas) != 1:
+                raise ValueError(
+                    "Banco sem tabelas." if not tabelas else
+                    f"O banco tem {len(tabelas)} tabelas ({', '.join(tabelas)}); informe qual analisar."
+                )
+            tabela = tabelas[0]
+
+        return ".".join(_identificador(parte) for parte in tabela.split("."))
+
+    def colunas(self):
+        """Nomes das colunas da fonte (consulta sem linhas)"""
+        if self._colunas is None:
+            cursor = self._cursor()
+            try:
+                cursor.execute(f"SELECT * FROM {self._origem_sql()} WHERE 1 = 0")
+                self._colunas = [descricao[0] for descricao in cursor.description]
+            except Exception as e:
+                raise ValueError(f"Erro ao consultar a fonte SQL: {e}")
+            finally:
+                cursor.close()
+        return self._colunas
+
+    def _exigir(self, *colunas):
+        existentes = self.colunas()
+        for col in colunas:
+            if col not in existentes:
+                raise ValueError(f"Coluna '{col}' não encontrada no dataset.")
+
+    def _valor(self, coluna):
+        """Expressão numérica de uma coluna (NULL quando inválida)"""
+        nome = _identificador(coluna)
+        if not self.sqlite:
+            return nome
+        # A função Python só é chamada para células de texto
+        self.conexao.create_function("numero_analise", 1, _numero, deterministic=True)
+        return (
+            f"CASE WHEN typeof({nome}) IN ('integer', 'real') THEN {nome} "
+            f"WHEN typeof({nome}) = 'text' THEN numero_analise({nome}) END"
+        )
+
+    def _filtro_owner(self, parametros, col_owner, owner):
+        if owner is None:
+            return ""
+        if col_owner not in self.colunas():
+            raise ValueError(f"Coluna '{col_owner}' não encontrada para aplicar o filtro.")
+        # Mesma normalização de DataLoader.linhas_do_owner; um Owner
+        # inválido ("N/A", "") não corresponde a nenhuma linha
+        alvo = DataLoader.normalizar_owner([owner])[0]
+        if pd.isna(alvo):
+            return " WHERE 1 = 0"
+        nome = _identificador(col_owner)
+        if self.sqlite:
+            nome = f"TRIM(CAST({nome} AS TEXT))"
+        return f" WHERE {nome} = {parametros(alvo)}"
+
+    # ----------------------------
+    # Leitura
+    # ----------------------------
+    def lotes(self, colunas=None, tamanho_lote=TAMANHO_CHUNK_PADRAO, owner=None, col_owner="Owner"):
+        """
+        DataFrames de até ``tamanho_lote`` linhas, lidos com ``fetchmany``.
+
+        Parameters
+        ----------
+        colunas : iterable of str, optional
+            Colunas selecionadas; as que não existem na fonte são
+            ignoradas (como ``usecols``). Padrão: todas.
+        owner : str, optional
+            Só as linhas desse Owner (filtro aplicado no banco).
+        """
+        if tamanho_lote <= 0:
+            raise ValueError("tamanho_lote deve ser positivo.")
+
+        nomes = self.colunas()
+        if colunas is not None:
+            nomes = [col for col in nomes if col in set(colunas)]
+        if not nomes:
+            return
+
+        parametros = self._parametros()
+        filtro = self._filtro_owner(parametros, col_owner, owner)
+        selecao = ", ".join(_identificador(col) for col in nomes)
+
+        cursor = self._cursor()
+        try:
+            cursor.execute(f"SELECT {selecao} FROM {self._origem_sql()}{filtro}", parametros.valores)
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas:
+                    break
+                yield pd.DataFrame.from_records(linhas, columns=nomes)
+        finally:
+            cursor.close()
+
+    def ler(self, limite=None, tamanho_lote=TAMANHO_CHUNK_PADRAO):
+        """Todas as colunas em um DataFrame (ou só as ``limite`` primeiras linhas)"""
+        partes = []
+        total = 0
+        for lote in self.lotes(tamanho_lote=tamanho_lote if limite is None else min(limite, tamanho_lote)):
+            partes.append(lote)
+            total += len(lote)
+            if limite is not None and total >= limite:
+                break
+
+        if not partes:
+            return pd.DataFrame(columns=self.colunas())
+        df = pd.concat(partes, ignore_index=True)
+        return df if limite is None else df.head(limite)
+
+    # ----------------------------
+    # Agregados no banco
+    # ----------------------------
+    def acumulador(self, col_x, col_y, owner=None, col_owner="Owner"):
+        """
+        ``StatsAccumulator`` (sem quantis) calculado por agregados SQL.
+
+        Pares com X ou Y inválido são descartados, o espaço log usa só
+        pares positivos e k = y / x só pares com x != 0, como em
+        ``StatsAccumulator.atualizar``. Sem pares válidos, o acumulador
+        volta vazio (``n == 0``).
+
+        Returns
+        -------
+        (StatsAccumulator, dict)
+            O acumulador e as estatísticas de leitura (``linhas_lidas``,
+            ``linhas_descartadas``).
+        """
+        self._exigir(col_x, col_y)
+        positivo = "x > 0 AND y > 0"
+
+        # 1ª passada: contagens, médias e extremos
+        linha = self._agregar(
+            "COUNT(*), COUNT(x), AVG(x), AVG(y), MIN(x), MAX(x), MIN(y), MAX(y), "
+            f"COUNT(CASE WHEN {positivo} THEN 1 END), "
+            f"AVG(CASE WHEN {positivo} THEN LOG10(x) END), AVG(CASE WHEN {positivo} THEN LOG10(y) END), "
+            "COUNT(CASE WHEN x <> 0 THEN 1 END), AVG(CASE WHEN x <> 0 THEN y * 1.0 / x END), "
+            "MIN(CASE WHEN x <> 0 THEN y * 1.0 / x END), MAX(CASE WHEN x <> 0 THEN y * 1.0 / x END)",
+            col_x, col_y, owner, col_owner
+        )
+        (total, n, media_x, media_y, min_x, max_x, min_y, max_y,
+         n_log, media_lx, media_ly, n_k, media_k, min_k, max_k) = linha
+
+        leitura = {"linhas_lidas": int(total), "linhas_descartadas": int(total - n)}
+        if not n:
+            return StatsAccumulator(quantis=False), leitura
+
+        # 2ª passada: somas de quadrados e co-momentos centrados nas médias
+        def centrado(valor, media, condicao=None):
+            termo = f"({valor} - {{}})"
+            medias.append(float(media))
+            return termo if condicao is None else f"CASE WHEN {condicao} THEN {termo} END"
+
+        medias = []
+
+        termos = [
+            (centrado("x", media_x), centrado("x", media_x)),
+            (centrado("y", media_y), centrado("y", media_y)),
+            (centrado("x", media_x), centrado("y", media_y))
+        ]
+        if n_log:
+            lx, ly = "LOG10(x)", "LOG10(y)"
+            termos += [
+                (centrado(lx, media_lx, positivo), centrado(lx, media_lx, positivo)),
+                (centrado(ly, media_ly, positivo), centrado(ly, media_ly, positivo)),
+                (centrado(lx, media_lx, positivo), centrado(ly, media_ly, positivo))
+            ]
+        somas = self._agregar(
+            ", ".join(f"SUM({a} * {b})" for a, b in termos), col_x, col_y, owner, col_owner, medias
+        )
+
+        acumulador = StatsAccumulator(quantis=False)
+        acumulador.linear = _Momentos.de_estado({
+            "n": int(n), "media_x": float(media_x), "media_y": float(media_y),
+            "m2_x": float(somas[0]), "m2_y": float(somas[1]), "c_xy": float(somas[2])
+        })
+        if n_log:
+            acumulador.log = _Momentos.de_estado({
+                "n": int(n_log), "media_x": float(media_lx), "media_y": float(media_ly),
+                "m2_x": float(somas[3]), "m2_y": float(somas[4]), "c_xy": float(somas[5])
+            })
+
+        acumulador.minimo.update(x=float(min_x), y=float(min_y))
+        acumulador.maximo.update(x=float(max_x), y=float(max_y))
+        if n_k:
+            acumulador.minimo["k"] = float(min_k)
+            acumulador.maximo["k"] = float(max_k)
+            acumulador.n_k = int(n_k)
+            acumulador.media_k = float(media_k)
+
+        return acumulador, leitura
+
+    def medianas(self, col_x, col_y, owner=None, col_owner="Owner"):
+        """
+        Medianas exatas de x, y e k = y / x calculadas no banco.
+
+        Cada mediana é uma consulta ordenada que devolve só as uma ou
+        duas linhas centrais (``LIMIT``/``OFFSET``), com os mesmos pares
+        válidos de ``acumulador``. NaN quando não há pares.
+
+        Returns
+        -------
+        dict
+            ``{"x": ..., "y": ..., "k": ...}``
+        """
+        self._exigir(col_x, col_y)
+        n, n_k = self._agregar("COUNT(x), COUNT(CASE WHEN x <> 0 THEN 1 END)", col_x, col_y, owner, col_owner)
+
+        resultado = {}
+        for nome, expressao, condicao, total in (
+            ("x", "x", "x IS NOT NULL", n),
+            ("y", "y", "x IS NOT NULL", n),
+            ("k", "y * 1.0 / x", "x <> 0", n_k)
+        ):
+            if not total:
+                resultado[nome] = math.nan
+                continue
+
+            parametros = self._parametros()
+            dados = self._dados(parametros, col_x, col_y, owner, col_owner)
+            # Ímpar: a linha central; par: as duas do meio
+            linhas = self._consultar(
+                f"SELECT {expressao} AS v FROM ({dados}) AS dados WHERE {condicao} "
+                f"ORDER BY v LIMIT {2 - total % 2} OFFSET {(total - 1) // 2}",
+                parametros,
+                todas=True
+            )
+            resultado[nome] = sum(float(v) for (v,) in linhas) / len(linhas)
+
+        return resultado
+
+    def _dados(self, parametros, col_x, col_y, owner, col_owner):
+        """Subconsulta dos pares (x, y) numéricos da fonte, já filtrados por Owner"""
+        if self.sqlite:
+            self._registrar_log10()
+
+        brutos = (
+            f"SELECT {self._valor(col_x)} AS x, {self._valor(col_y)} AS y "
+            f"FROM {self._origem_sql()}{self._filtro_owner(parametros, col_owner, owner)}"
+        )
+        if self.sqlite:
+            # Impede que o SQLite expanda a subconsulta: sem isso a conversão
+            # é repetida a cada uso de x e y nos agregados
+            brutos += " LIMIT -1 OFFSET 0"
+        # x e y só ficam não nulos juntos: os agregados ignoram o par inteiro
+        return (
+            "SELECT CASE WHEN y IS NULL THEN NULL ELSE x END AS x, "
+            "CASE WHEN x IS NULL THEN NULL ELSE y END AS y "
+            f"FROM ({brutos}) AS brutos"
+        )
+
+    def _agregar(self, selecao, col_x, col_y, owner, col_owner, valores=()):
+        """
+        Uma linha de agregados sobre os pares (x, y) da fonte.
+
+        ``selecao`` pode ter marcadores ``{}``, preenchidos com ``valores``
+        (antes dos parâmetros do filtro, na ordem em que aparecem no SQL).
+        """
+        parametros = self._parametros()
+        selecao = selecao.format(*(parametros(valor) for valor in valores))
+        dados = self._dados(parametros, col_x, col_y, owner, col_owner)
+        return self._consultar(f"SELECT {selecao} FROM ({dados}) AS dados", parametros)
+
+    def _consultar(self, sql, parametros, todas=False):
+        """Executa a consulta e devolve a primeira linha (ou todas)"""
+        cursor = self._cursor()
+        try:
+            cursor.execute(sql, parametros.valores)
+            return cursor.fetchall() if todas else cursor.fetchone()
+        except Exception as e:
+            raise ValueError(f"Erro ao consultar a fonte SQL: {e}")
+        finally:
+            cursor.close()
+
+    def _registrar_log10(self):
+        # SQLite compilado sem as funções matemáticas (anterior a 3.35)
+        try:
+            self.conexao.execute("SELECT LOG10(10)")
+        except sqlite3.OperationalError:
+            self.conexao.create_function("LOG10", 1, math.log10, deterministic=True)
+
+
+def _identificador(nome):
+    """Nome entre aspas duplas (aspas internas duplicadas)"""
+    return '"' + str(nome).replace('"', '""') + '"'
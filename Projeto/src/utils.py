@@ -1,4 +1,3 @@
-from tkinter import Tk, filedialog
 from typing import Optional, List, Tuple
 
 
@@ -22,13 +21,17 @@ def selecionar_arquivo(
         Caminho do arquivo selecionado ou None se cancelado.
     """
 
+    # Importado aqui para não pesar na inicialização de quem não usa a janela
+    from tkinter import Tk, filedialog
+
     if tipos is None:
         tipos = [
             ("Todos os arquivos", "*.*"),
             ("Excel", "*.xlsx *.xls"),
             ("CSV", "*.csv"),
             ("JSON", "*.json"),
-            ("SQL", "*.sql")
+            ("SQL", "*.sql"),
+            ("SQLite", "*.db *.sqlite *.sqlite3")
         ]
 
     root = Tk()
@@ -5,23 +5,45 @@ Responsável por gerar gráficos de dispersão, regressão linear e log-log.
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.colors import LogNorm
+
+from .density import indices_amostra, grade_densidade, MAX_PONTOS_PADRAO
+from .session import SessaoAnalise
+
+
+MODOS_DISPERSAO = ("auto", "completo", "amostra", "densidade")
 
 
 class Visualizer:
     def __init__(self, df, col_x, col_y):
-        self.df = df.copy()
+        # DataFrame (somente leitura) ou SessaoAnalise compartilhada
+        self.sessao = df if isinstance(df, SessaoAnalise) else SessaoAnalise.de_dataframe(df, col_x, col_y)
         self.col_x = col_x
         self.col_y = col_y
 
-    def _calcular_r2(self, y_real, y_pred):
+    def _dispersao(self, ax, x, y, modo, max_pontos):
         """
-        Calcula o coeficiente de determinação (R²)
+        Desenha a nuvem de pontos com custo limitado:
+        todos os pontos, amostra que preserva outliers ou mapa de densidade.
         """
-        ss_res = np.sum((y_real - y_pred) ** 2)
-        ss_tot = np.sum((y_real - np.mean(y_real)) ** 2)
-        return 1 - (ss_res / ss_tot)
+        if modo == "auto":
+            modo = "completo" if len(x) <= max_pontos else "amostra"
+
+        if modo == "densidade":
+            contagem, bordas_x, bordas_y = grade_densidade(x, y)
+            contagem = np.where(contagem > 0, contagem, np.nan)
+            malha = ax.pcolormesh(bordas_x, bordas_y, contagem, norm=LogNorm(), cmap="viridis")
+            ax.figure.colorbar(malha, ax=ax, label="pontos")
+            return
+
+        if modo == "amostra":
+            indices = indices_amostra(x, y, max_pontos)
+            x, y = x[indices], y[indices]
 
-    def plotar(self, salvar=False):
+        ax.scatter(x, y, s=4 if modo == "amostra" else None, alpha=0.5 if modo == "amostra" else None)
+
+    def plotar(self, salvar=False, mostrar=True, caminho="graficos.png", modo="auto",
+               max_pontos=MAX_PONTOS_PADRAO):
         """
         Gera gráficos:
         - Dispersão
@@ -32,35 +54,48 @@ class Visualizer:
         ----------
         salvar : bool
             Se True, salva os gráficos como imagens
+        mostrar : bool
+            Se False, não chama plt.show() e fecha a figura (modo sem tela)
+        caminho : str
+            Arquivo de destino quando salvar=True
+        modo : str
+            Nuvem de pontos: "completo", "amostra" (preserva outliers),
+            "densidade" (mapa de calor) ou "auto" (amostra acima de
+            max_pontos). As retas usam sempre o ajuste com todos os dados.
+        max_pontos : int
+            Pontos desenhados por gráfico nos modos "auto" e "amostra"
         """
+        if modo not in MODOS_DISPERSAO:
+            raise ValueError(f"Modo inválido: '{modo}'. Use {', '.join(MODOS_DISPERSAO)}.")
+
+        x = self.sessao.x
+        y = self.sessao.y
 
-        x = self.df[self.col_x].values
-        y = self.df[self.col_y].values
+        # Ajustes linear e log-log do acumulador da sessão (uma passada, compartilhada)
+        acumulador = self.sessao.acumulador
+        linear = acumulador.regressao_linear()
+        loglog = acumulador.regressao_loglog()
 
-        # Ordena para plotar linha corretamente
-        ordem = np.argsort(x)
-        x_sorted = x[ordem]
-        y_sorted = y[ordem]
+        # As retas só precisam dos extremos de x
+        x_linha = np.array([acumulador.minimo["x"], acumulador.maximo["x"]])
 
         fig, axs = plt.subplots(1, 3, figsize=(18, 5))
 
         # -------------------------
         # 1. DISPERSÃO
         # -------------------------
-        axs[0].scatter(x, y)
+        self._dispersao(axs[0], x, y, modo, max_pontos)
         axs[0].set_title("Dispersão")
         axs[0].set_xlabel(self.col_x)
         axs[0].set_ylabel(self.col_y)
 
         # 2. REGRESSÃO LINEAR
 
-        coef = np.polyfit(x, y, 1)
-        y_pred = np.poly1d(coef)(x)
+        coef = np.array([linear["coeficiente"], linear["intercepto"]])
+        r2 = linear["r2"]
 
-        r2 = self._calcular_r2(y, y_pred)
-
-        axs[1].scatter(x, y)
-        axs[1].plot(x_sorted, np.poly1d(coef)(x_sorted))
+        self._dispersao(axs[1], x, y, modo, max_pontos)
+        axs[1].plot(x_linha, np.poly1d(coef)(x_linha), color="red")
         axs[1].set_title(f"Regressão Linear (R²={r2:.4f})")
         axs[1].set_xlabel(self.col_x)
         axs[1].set_ylabel(self.col_y)
@@ -68,22 +103,17 @@ class Visualizer:
 
         # 3. REGRESSÃO LOG-LOG
 
-        # Filtra valores inválidos (<=0)
-        mask = (x > 0) & (y > 0)
-        log_x = np.log10(x[mask])
-        log_y = np.log10(y[mask])
-
-        coef_log = np.polyfit(log_x, log_y, 1)
-        y_log_pred = np.poly1d(coef_log)(log_x)
+        # Pares positivos em log10 (calculados uma vez pela sessão)
+        log_x = self.sessao.log_x
+        log_y = self.sessao.log_y
 
-        r2_log = self._calcular_r2(log_y, y_log_pred)
+        coef_log = np.array([loglog["coeficiente"], loglog["intercepto"]])
+        r2_log = loglog["r2"]
 
-        # Ordenar para linha ficar correta
-        ordem_log = np.argsort(log_x)
-        log_x_sorted = log_x[ordem_log]
+        log_x_linha = np.array([log_x.min(), log_x.max()])
 
-        axs[2].scatter(log_x, log_y)
-        axs[2].plot(log_x_sorted, np.poly1d(coef_log)(log_x_sorted))
+        self._dispersao(axs[2], log_x, log_y, modo, max_pontos)
+        axs[2].plot(log_x_linha, np.poly1d(coef_log)(log_x_linha), color="red")
         axs[2].set_title(f"Log-Log (R²={r2_log:.4f})")
         axs[2].set_xlabel(f"log10({self.col_x})")
         axs[2].set_ylabel(f"log10({self.col_y})")
@@ -91,9 +121,12 @@ class Visualizer:
         plt.tight_layout()
 
         if salvar:
-            fig.savefig("graficos.png", dpi=300)
+            fig.savefig(caminho, dpi=300)
 
-        plt.show()
+        if mostrar:
+            plt.show()
+        else:
+            plt.close(fig)
 
         return {
             "r2_linear": r2,
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.accumulator import StatsAccumulator
+
+
+def _dados(n=5000, semente=1):
+    rng = np.random.default_rng(semente)
+    x = rng.lognormal(1, 1, n)
+    y = 3 * x + rng.normal(0, 2, n)
+    x[::50] = 0
+    y[::31] = np.nan
+    return x, y
+
+
+def test_combinar_igual_passada_unica_igual_numpy():
+    x, y = _dados()
+
+    unico = StatsAccumulator.de_arrays(x, y)
+    partes = [StatsAccumulator.de_arrays(x[i:i + 777], y[i:i + 777]) for i in range(0, len(x), 777)]
+    combinado = partes[0]
+    for parte in partes[1:]:
+        combinado.combinar(parte)
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    xv, yv = x[validos], y[validos]
+    coef, intercepto = np.polyfit(xv, yv, 1)
+
+    for acumulador in (unico, combinado):
+        assert acumulador.n == len(xv)
+        resumo = acumulador.resumo("x")
+        assert resumo["media"] == pytest.approx(xv.mean(), rel=1e-12)
+        assert (resumo["minimo"], resumo["maximo"]) == (xv.min(), xv.max())
+        assert acumulador.pearson() == pytest.approx(np.corrcoef(xv, yv)[0, 1], rel=1e-12)
+
+        ajuste = acumulador.regressao_linear()
+        assert ajuste["coeficiente"] == pytest.approx(coef, rel=1e-10)
+        assert ajuste["intercepto"] == pytest.approx(intercepto, rel=1e-10)
+
+    assert combinado.resumo("y")["media"] == pytest.approx(unico.resumo("y")["media"], rel=1e-12)
+
+
+def test_espaco_log_e_razao_k():
+    x, y = _dados()
+    acumulador = StatsAccumulator.de_arrays(x, y)
+
+    validos = ~(np.isnan(x) | np.isnan(y))
+    positivos = validos & (x > 0) & (y > 0)
+    coef, _ = np.polyfit(np.log10(x[positivos]), np.log10(y[positivos]), 1)
+    assert acumulador.regressao_loglog()["coeficiente"] == pytest.approx(coef, rel=1e-10)
+
+    nao_zero = validos & (x != 0)
+    k = y[nao_zero] / x[nao_zero]
+    resumo = acumulador.resumo("k")
+    assert resumo["quantidade"] == len(k)
+    assert resumo["media"] == pytest.approx(k.mean(), rel=1e-12)
+    assert resumo["mediana"] == pytest.approx(np.median(k), rel=1e-12)
+
+
+def test_vazio():
+    acumulador = StatsAccumulator(quantis=False)
+    acumulador.atualizar(np.array([np.nan]), np.array([1.0]))
+
+    assert acumulador.n == 0
+    assert np.isnan(acumulador.resumo("x")["media"])
+    assert "mediana" not in acumulador.resumo("x")
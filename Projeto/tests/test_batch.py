@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.accumulator import StatsAccumulator
+from src.batch import analisar_lote, listar_arquivos
+
+
+def _arquivos(pasta, quantidade=3, n=200):
+    rng = np.random.default_rng(0)
+    caminhos, partes = [], []
+    for i in range(quantidade):
+        df = pd.DataFrame({"X": rng.lognormal(size=n), "Y": rng.lognormal(size=n)})
+        caminho = str(pasta / f"parte{i}.csv")
+        df.to_csv(caminho, index=False)
+        caminhos.append(caminho)
+        partes.append(df)
+    return caminhos, pd.concat(partes)
+
+
+def test_global_igual_a_passada_unica(tmp_path):
+    caminhos, todos = _arquivos(tmp_path)
+    (tmp_path / "ignorado.txt").write_text("x")
+
+    resultado = analisar_lote(str(tmp_path), "X", "Y", processos=2, tamanho_chunk=64)
+
+    unico = StatsAccumulator.de_arrays(todos["X"].to_numpy(), todos["Y"].to_numpy()).resultados()
+    assert [r["arquivo"] for r in resultado["arquivos"]] == caminhos
+    assert resultado["global"]["quantidade"] == unico["quantidade"] == 600
+    assert resultado["global"]["pearson"] == pytest.approx(unico["pearson"], rel=1e-12)
+    assert resultado["global"]["regressao_loglog"] == pytest.approx(unico["regressao_loglog"], rel=1e-10)
+    assert resultado["global"]["x"]["mediana"] == pytest.approx(np.median(todos["X"]), rel=1e-12)
+    assert resultado["arquivos"][0]["leitura"]["chunks"] == 4
+
+
+def test_erro_por_arquivo_nao_interrompe_o_lote(tmp_path):
+    caminhos, _ = _arquivos(tmp_path, quantidade=2)
+    pd.DataFrame({"A": [1]}).to_csv(tmp_path / "sem_colunas.csv", index=False)
+
+    resultado = analisar_lote(listar_arquivos(str(tmp_path / "*.csv")), "X", "Y", processos=1)
+
+    erros = [r for r in resultado["arquivos"] if "erro" in r]
+    assert [r["arquivo"] for r in erros] == [str(tmp_path / "sem_colunas.csv")]
+    assert resultado["global"]["quantidade"] == 400
+
+    with pytest.raises(ValueError, match="Nenhum arquivo"):
+        analisar_lote(str(tmp_path / "*.xlsx"), "X", "Y")
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.bootstrap import bootstrap
+from src.ols import ajustar
+
+
+def _dados(n=400, semente=0):
+    rng = np.random.default_rng(semente)
+    x = rng.normal(5, 2, n)
+    return x, 2 * x + 1 + rng.normal(0, 1, n)
+
+
+@pytest.mark.parametrize("metodo", ["percentil", "bca"])
+def test_intervalo_contem_estimativa_pontual(metodo):
+    x, y = _dados()
+
+    resultado = bootstrap(x, y, replicas=500, metodo=metodo, semente=3)
+
+    ajuste = ajustar(x, y)
+    coef = resultado["coeficiente"]
+    assert coef["estimativa"] == pytest.approx(ajuste["coeficiente"], rel=1e-12)
+    assert coef["inferior"] < coef["estimativa"] < coef["superior"]
+    # Erro padrão bootstrap próximo do analítico
+    assert coef["erro_padrao"] == pytest.approx(ajuste["erro_padrao_coeficiente"], rel=0.2)
+    assert resultado["n"] == resultado["m"] == len(x)
+
+
+def test_reproduzivel_e_independente_de_processos():
+    x, y = _dados()
+
+    um = bootstrap(x, y, replicas=300, semente=7)
+    de_novo = bootstrap(x, y, replicas=300, semente=7)
+    paralelo = bootstrap(x, y, replicas=300, semente=7, processos=2)
+
+    assert um == de_novo
+    assert um["pearson"] == pytest.approx(paralelo["pearson"], rel=1e-12)
+
+
+def test_loglog_e_validacoes():
+    x, y = _dados()
+    x[:10] = -1
+
+    resultado = bootstrap(x, y, replicas=50, loglog=True, metodo="percentil", estatisticas=["coeficiente"])
+
+    assert resultado["n"] == np.count_nonzero((x > 0) & (y > 0))
+    assert set(resultado) >= {"coeficiente"} and "pearson" not in resultado
+    with pytest.raises(ValueError, match="Método inválido"):
+        bootstrap(x, y, metodo="normal")
+    with pytest.raises(ValueError, match="insuficientes"):
+        bootstrap([1.0, 2.0], [1.0, 2.0])
@@ -0,0 +1,63 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import CacheDados, hash_fonte
+from src.data_loader import DataLoader
+
+
+def _json_owners(caminho, owners):
+    registros = [{"X": i + 1, "Y": 3 * (i + 1), "Owner": owners[i % len(owners)]} for i in range(70)]
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(registros, f)
+    return str(caminho)
+
+
+@pytest.mark.parametrize("owners", [
+    [3, 1, 2],
+    [1.5, 2.0, 7.25],
+    [1, "A", 2.5, True, None, "1", 1.0]
+])
+def test_owner_do_cache_igual_a_leitura(tmp_path, owners):
+    caminho = _json_owners(tmp_path / "dados.json", owners)
+    cache = CacheDados(str(tmp_path / "cache"))
+
+    falha = DataLoader(caminho, cache=cache).carregar_colunas("X", "Y", tamanho_chunk=50)
+    acerto = DataLoader(caminho, cache=cache).carregar_colunas("X", "Y", tamanho_chunk=50)
+
+    assert cache.falhas == 1 and cache.acertos == 1
+    assert acerto["owner"].dtype == falha["owner"].dtype
+    assert [type(v) for v in acerto["owner"]] == [type(v) for v in falha["owner"]]
+    pd.testing.assert_series_equal(pd.Series(acerto["owner"]), pd.Series(falha["owner"]))
+    np.testing.assert_array_equal(acerto["x"], falha["x"])
+
+
+def test_arquivo_maior_que_o_limite_continua_disponivel(tmp_path):
+    cache = CacheDados(str(tmp_path / "cache"), limite_bytes=10)
+
+    def gerar(caminho):
+        with open(caminho, "wb") as f:
+            f.write(b"x" * 100)
+
+    antigo = cache.obter_arquivo("antiga", "a.bin", gerar)
+    novo = cache.obter_arquivo("nova", "b.bin", gerar)
+
+    assert os.path.isfile(novo) and not os.path.exists(antigo)
+    assert cache.estatisticas()["entradas"] == 1
+
+
+def test_hash_memorizado_ate_o_arquivo_mudar(tmp_path, monkeypatch):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("X,Y\n1,2\n")
+    primeiro = hash_fonte(str(caminho))
+
+    monkeypatch.setattr("builtins.open", None)
+    assert hash_fonte(str(caminho)) == primeiro
+    monkeypatch.undo()
+
+    caminho.write_text("X,Y\n1,3\n")
+    os.utime(caminho, ns=(0, 10 ** 9))
+    assert hash_fonte(str(caminho)) != primeiro
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.column_store import ColumnStore, quantil_blocos
+from src.data_loader import DataLoader
+
+
+def _blocos(n, tamanho=7, falhar=False):
+    for inicio in range(0, n, tamanho):
+        fim = min(inicio + tamanho, n)
+        yield {"x": np.arange(inicio, fim, dtype=float), "y": 2.0 * np.arange(inicio, fim)}
+        if falhar:
+            raise OSError("disco cheio")
+
+
+def test_criar_e_reabrir(tmp_path):
+    store = ColumnStore.criar(str(tmp_path), _blocos(30), "X", "Y", assinatura="a")
+
+    assert len(store) == 30
+    np.testing.assert_array_equal(store.coluna("Y"), 2.0 * np.arange(30))
+    assert ColumnStore.abrir(str(tmp_path), "a").n == 30
+    assert ColumnStore.abrir(str(tmp_path), "b") is None
+
+
+def test_criar_interrompido_nao_deixa_meta_antigo(tmp_path):
+    antigo = ColumnStore.criar(str(tmp_path), _blocos(30), "X", "Y", assinatura="a")
+
+    with pytest.raises(OSError):
+        ColumnStore.criar(str(tmp_path), _blocos(30, falhar=True), "X", "Y", assinatura="b")
+
+    assert ColumnStore.abrir(str(tmp_path)) is None
+    assert sorted(os.listdir(tmp_path)) == ["x.f64", "y.f64"]
+    # O mapeamento já aberto continua com os dados antigos
+    np.testing.assert_array_equal(antigo.coluna("X"), np.arange(30))
+
+
+def test_quantil_blocos_igual_numpy():
+    valores = np.random.default_rng(3).normal(size=5001)
+    valores[::7] = 1.5  # empates
+
+    def blocos():
+        for inicio in range(0, len(valores), 333):
+            yield valores[inicio:inicio + 333]
+
+    for q in (0.0, 0.1, 0.5, 0.77, 1.0):
+        assert quantil_blocos(blocos, q, bins=16, limite_memoria=50) == pytest.approx(np.quantile(valores, q), abs=0)
+
+
+def test_para_column_store_filtra_owner(tmp_path):
+    caminho = str(tmp_path / "dados.csv")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("X,Y,Owner\n" + "".join(f"{i},{2 * i}, {'AB'[i % 2]}\n" for i in range(1, 41)))
+    loader = DataLoader(caminho)
+
+    store = loader.para_column_store("X", "Y", str(tmp_path / "a"), tamanho_chunk=9, owner="B")
+
+    np.testing.assert_array_equal(store.coluna("X"), np.arange(1, 41, 2, dtype=float))
+    with pytest.raises(ValueError, match="Nenhum registro para o Owner 'Z'"):
+        loader.para_column_store("X", "Y", str(tmp_path / "z"), owner="Z")
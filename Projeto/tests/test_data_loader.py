@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from src.data_loader import DataLoader
+
+
+def _csv_owners(caminho, linhas=1000):
+    x = np.arange(1, linhas + 1, dtype=float)
+    pd.DataFrame({
+        "X": x,
+        "Y": 2 * x + 1,
+        "Owner": np.where(np.arange(linhas) % 2 == 0, "A", "B")
+    }).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def test_filtro_owner_em_varios_blocos(tmp_path):
+    caminho = _csv_owners(tmp_path / "owners.csv")
+
+    acumulador = DataLoader(caminho).acumulador("X", "Y", owner="A", tamanho_chunk=100)
+    assert acumulador.n == 500
+
+    blocos = list(DataLoader(caminho).iterar_chunks("X", "Y", tamanho_chunk=100, owner="B"))
+    assert len(blocos) == 10
+    assert sum(len(b["x"]) for b in blocos) == 500
+    assert all((b["owner"] == "B").all() for b in blocos)
+
+
+def test_owner_comparado_igual_em_memoria_blocos_e_sql(tmp_path):
+    import sqlite3
+
+    owners = [" A", "A ", "A", "N/A", " ", 7, None, "7"]
+    df = pd.DataFrame({
+        "X": np.arange(1.0, 81.0),
+        "Y": np.arange(2.0, 162.0, 2.0),
+        "Owner": [owners[i % len(owners)] for i in range(80)]
+    })
+    caminho = str(tmp_path / "dados.csv")
+    df.to_csv(caminho, index=False)
+    banco = str(tmp_path / "dados.sqlite")
+    with sqlite3.connect(banco) as conexao:
+        df.to_sql("dados", conexao, index=False)
+
+    def contagens(owner):
+        memoria = DataLoader(caminho)
+        memoria.carregar()
+        memoria.limpar("X", "Y")
+        try:
+            linhas = len(memoria.filtrar_owner(owner))
+        except ValueError:
+            linhas = 0
+        blocos = sum(len(b["x"]) for b in DataLoader(caminho).iterar_chunks("X", "Y", tamanho_chunk=7, owner=owner))
+        sql = sum(len(b["x"]) for b in DataLoader(banco).iterar_chunks("X", "Y", owner=owner))
+        return linhas, blocos, sql
+
+    assert contagens("A") == (30, 30, 30)
+    assert contagens(" A ") == (30, 30, 30)
+    assert contagens(7) == (20, 20, 20)
+    assert contagens("N/A") == (0, 0, 0)
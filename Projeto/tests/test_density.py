@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.density import grade_densidade, indices_amostra
+
+
+def test_amostra_pequena_devolve_tudo():
+    x = np.arange(10.0)
+    np.testing.assert_array_equal(indices_amostra(x, x, max_pontos=10), np.arange(10))
+
+
+def test_amostra_limita_pontos_e_preserva_extremos():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(size=200_000), [50.0]])
+    y = np.concatenate([rng.normal(size=200_000), [-40.0]])
+
+    indices = indices_amostra(x, y, max_pontos=5000)
+
+    assert len(indices) <= 5000 * 1.1
+    assert np.all(np.diff(indices) > 0)
+    assert {x.argmin(), x.argmax(), y.argmin(), y.argmax()} <= set(indices)
+    np.testing.assert_array_equal(indices, indices_amostra(x, y, max_pontos=5000))
+
+
+def test_grade_conta_todos_os_pontos():
+    rng = np.random.default_rng(1)
+    x, y = rng.lognormal(size=10_000), rng.lognormal(size=10_000)
+
+    contagem, bordas_x, bordas_y = grade_densidade(x, y, bins=50, log=True)
+
+    assert contagem.shape == (50, 50)
+    assert contagem.sum() == len(x)
+    assert bordas_x[0] == pytest.approx(np.log10(x.min()))
+    with pytest.raises(ValueError, match="positivos"):
+        grade_densidade(-x, y, log=True)
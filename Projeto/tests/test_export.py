@@ -0,0 +1,53 @@
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.export import exportar
+
+
+def _df(n=250):
+    return pd.DataFrame({"X": np.arange(n, dtype=float), "Owner": [f"o{i % 3}" for i in range(n)]})
+
+
+@pytest.mark.parametrize("extensao", ["csv", "csv.gz", "parquet", "xlsx"])
+def test_exportar_em_blocos_ida_e_volta(tmp_path, extensao):
+    df = _df()
+    destino = str(tmp_path / "sub" / f"saida.{extensao}")
+
+    assert exportar(df, destino, tamanho_bloco=40) == destino
+
+    if extensao == "parquet":
+        lido = pd.read_parquet(destino)
+    elif extensao == "xlsx":
+        lido = pd.read_excel(destino)
+    else:
+        lido = pd.read_csv(destino)
+    pd.testing.assert_frame_equal(lido, df, check_dtype=False)
+
+
+def test_colunas_selecionadas_e_validacoes(tmp_path):
+    destino = str(tmp_path / "saida.csv")
+
+    exportar(_df(), destino, colunas=["Owner"])
+    assert list(pd.read_csv(destino).columns) == ["Owner"]
+
+    with pytest.raises(ValueError, match="Colunas não encontradas: Y"):
+        exportar(_df(), destino, colunas=["Y"])
+    with pytest.raises(ValueError, match="Formato"):
+        exportar(_df(), str(tmp_path / "saida.txt"))
+
+
+@pytest.mark.parametrize("extensao", ["csv", "csv.gz"])
+def test_exportar_sem_linhas(tmp_path, extensao):
+    destino = str(tmp_path / f"vazio.{extensao}")
+
+    exportar(_df().iloc[:0], destino)
+
+    if extensao == "csv.gz":
+        with gzip.open(destino, "rb") as f:
+            assert f.read() == b""
+    else:
+        assert os.path.getsize(destino) == 0
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.grouping import analisar_grupos
+from src.session import SessaoAnalise
+
+
+def _dados(n=2000, semente=0):
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame({
+        "X": rng.lognormal(1, 1, n),
+        "Y": rng.lognormal(2, 1, n),
+        "Owner": rng.choice(["a", "b", "c", "d"], n, p=[0.5, 0.3, 0.19, 0.01])
+    })
+    df.loc[::17, "X"] = 0
+    df.loc[::23, "Owner"] = None
+    return df
+
+
+def test_igual_groupby_do_pandas():
+    df = _dados()
+
+    tabela = analisar_grupos(df, "X", "Y").set_index("Owner")
+
+    for owner, grupo in df.dropna(subset=["Owner"]).groupby("Owner"):
+        linha = tabela.loc[owner]
+        assert linha["quantidade"] == len(grupo)
+        assert linha["X_mediana"] == pytest.approx(grupo["X"].median(), abs=0)
+        assert linha["Y_minimo"] == grupo["Y"].min()
+        assert linha["Y_media"] == pytest.approx(grupo["Y"].mean(), rel=1e-12)
+        assert linha["pearson"] == pytest.approx(grupo["X"].corr(grupo["Y"]), rel=1e-10)
+
+        coef, intercepto = np.polyfit(grupo["X"], grupo["Y"], 1)
+        assert linha["coeficiente"] == pytest.approx(coef, rel=1e-9)
+        assert linha["intercepto"] == pytest.approx(intercepto, rel=1e-9)
+
+        nao_zero = grupo[grupo["X"] != 0]
+        assert linha["k_mediana"] == pytest.approx((nao_zero["Y"] / nao_zero["X"]).median(), rel=1e-12)
+        assert linha["n_loglog"] == len(nao_zero)
+
+    assert list(tabela["quantidade"]) == sorted(tabela["quantidade"], reverse=True)
+
+
+def test_sessao_igual_dataframe_e_minimo_linhas():
+    df = _dados()
+    sessao = SessaoAnalise.de_dataframe(df, "X", "Y")
+
+    pd.testing.assert_frame_equal(analisar_grupos(sessao, "X", "Y"), analisar_grupos(df, "X", "Y"))
+    assert "d" not in set(analisar_grupos(df, "X", "Y", minimo_linhas=100)["Owner"])
+
+
+def test_coluna_de_grupo_ausente():
+    with pytest.raises(ValueError, match="Owner"):
+        analisar_grupos(pd.DataFrame({"X": [1.0], "Y": [2.0]}), "X", "Y")
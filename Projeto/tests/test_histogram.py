@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.histogram import Histograma
+
+
+def test_contagens_iguais_ao_numpy_na_grade():
+    valores = np.random.default_rng(0).normal(size=50_000)
+    histograma = Histograma(valores, bins_base=1024)
+
+    for bins in (1, 8, 16, 128):
+        contagens, bordas = histograma.contagens(bins)
+        assert len(contagens) == bins
+        np.testing.assert_allclose(bordas, np.linspace(valores.min(), valores.max(), bins + 1))
+        np.testing.assert_array_equal(contagens, np.histogram(valores, bins=bins)[0])
+
+
+def test_zoom_e_escala_log():
+    valores = np.concatenate([np.random.default_rng(1).lognormal(0, 2, 10_000), [0.0, -1.0, np.nan]])
+    histograma = Histograma(valores, escala="log")
+
+    assert histograma.total == 10_000 and histograma.descartados == 3
+    contagens, bordas = histograma.contagens(10)
+    assert contagens.sum() == 10_000
+    assert bordas[0] == pytest.approx(valores[valores > 0].min())
+
+    zoom, bordas_zoom = histograma.contagens(10, intervalo=(1, 10))
+    dentro = valores[(valores >= bordas_zoom[0]) & (valores < bordas_zoom[-1])]
+    assert zoom.sum() == len(dentro)
+
+
+def test_validacoes():
+    with pytest.raises(ValueError, match="Sem valores"):
+        Histograma([np.nan])
+    with pytest.raises(ValueError, match="Escala"):
+        Histograma([1.0], escala="sqrt")
+    with pytest.raises(ValueError, match="fora"):
+        Histograma([1.0, 2.0]).contagens(5, intervalo=(10, 20))
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import main
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Não podem ser importados por ``main.py --stats-only``
+MODULOS_PESADOS = (
+    "src.batch", "src.bootstrap", "src.cache", "src.grouping", "src.models",
+    "src.pipeline", "src.profiling", "src.report", "src.robust", "src.sql_source",
+    "concurrent.futures.process", "sqlite3", "tkinter", "matplotlib", "sklearn"
+)
+
+SCRIPT_FILHO = """
+import json, sys
+sys.path.insert(0, {base!r})
+import main
+main.main({argv!r})
+print("@@" + json.dumps(sorted(m for m in {pesados!r} if m in sys.modules)))
+"""
+
+# Folga do tempo de --stats-only sobre o de só importar numpy e pandas:
+# generosa para não falhar em máquinas lentas, mas pega um import pesado
+# que volte ao caminho de inicialização (matplotlib, sklearn, ...)
+FATOR_TEMPO = 2.0
+FOLGA_SEGUNDOS = 1.5
+
+
+def _executar(codigo):
+    """Executa ``codigo`` em um processo novo; devolve (segundos, stdout)"""
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BASE_DIR
+    ).stdout
+    return time.perf_counter() - inicio, saida
+
+
+def _csv_pequeno(tmp_path):
+    caminho = str(tmp_path / "dados.csv")
+    x = np.arange(1, 101, dtype=float)
+    pd.DataFrame({"X": x, "Y": 3 * x}).to_csv(caminho, index=False)
+    return caminho
+
+
+def test_stats_only_nao_importa_modulos_pesados(tmp_path):
+    argv = [_csv_pequeno(tmp_path), "--x", "X", "--y", "Y", "--stats-only"]
+    _, saida = _executar(SCRIPT_FILHO.format(base=BASE_DIR, argv=argv, pesados=MODULOS_PESADOS))
+
+    linha = next(l for l in saida.splitlines() if l.startswith("@@"))
+    assert json.loads(linha[2:]) == []
+
+
+def test_tempo_de_inicio_do_stats_only(tmp_path):
+    argv = [_csv_pequeno(tmp_path), "--x", "X", "--y", "Y", "--stats-only"]
+    codigo = f"import sys; sys.path.insert(0, {BASE_DIR!r}); import main; main.main({argv!r})"
+
+    # Melhor de duas execuções de cada, para descontar o cache frio do disco
+    base = min(_executar("import numpy, pandas")[0] for _ in range(2))
+    stats_only = min(_executar(codigo)[0] for _ in range(2))
+
+    assert stats_only <= FATOR_TEMPO * base + FOLGA_SEGUNDOS
+
+
+def test_owner_inexistente_interrompe_com_erro(tmp_path, capsys):
+    caminho = str(tmp_path / "dados.csv")
+    x = np.arange(1, 101, dtype=float)
+    pd.DataFrame({"X": x, "Y": 3 * x, "Owner": np.where(x % 2 == 0, "A", "B")}).to_csv(caminho, index=False)
+
+    main.main([caminho, "--x", "X", "--y", "Y", "--owner", "Z", "--stats-only"])
+
+    saida = capsys.readouterr().out
+    assert "Erro ao filtrar Owner: Nenhum registro para o Owner 'Z'." in saida
+    assert "Registros válidos" not in saida
+
+
+def test_analise_por_owner_so_com_grupos(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "n")
+    caminho = str(tmp_path / "dados.csv")
+    x = np.arange(1, 101, dtype=float)
+    pd.DataFrame({"X": x, "Y": 3 * x, "Owner": np.where(x % 2 == 0, "A", "B")}).to_csv(caminho, index=False)
+
+    main.main([caminho, "--x", "X", "--y", "Y", "--stats-only"])
+    assert "Análise por Owner" not in capsys.readouterr().out
+
+    main.main([caminho, "--x", "X", "--y", "Y", "--stats-only", "--grupos"])
+    assert "=== Análise por Owner (20 maiores) ===" in capsys.readouterr().out
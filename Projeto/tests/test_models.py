@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models import LogLogRegressionModel, RegressionModel, TheilSenRegressionModel, _ModeloSerializavel
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _df(n, semente):
+    rng = np.random.default_rng(semente)
+    x = rng.lognormal(1, 0.5, n)
+    return pd.DataFrame({"X": x, "Y": 3 * x ** 1.2 * rng.lognormal(0, 0.1, n)})
+
+
+@pytest.mark.parametrize("classe", [RegressionModel, LogLogRegressionModel])
+def test_atualizar_igual_a_treinar_com_tudo(tmp_path, classe):
+    antigo, novo = _df(500, 0), _df(300, 1)
+    modelo = classe(antigo, "X", "Y")
+    modelo.treinar()
+    modelo.salvar(str(tmp_path / "modelo.json"))
+
+    carregado = _ModeloSerializavel.carregar(str(tmp_path / "modelo.json"))
+    atualizado = carregado.atualizar(novo)
+
+    completo = classe(pd.concat([antigo, novo]), "X", "Y").treinar()
+    assert type(carregado) is classe
+    assert atualizado == pytest.approx(completo, rel=1e-10)
+
+
+def test_esquecimento_igual_a_minimos_quadrados_ponderados():
+    antigo, novo = _df(400, 2), _df(100, 3)
+    modelo = RegressionModel(antigo, "X", "Y")
+    modelo.treinar()
+
+    metricas = modelo.atualizar(novo, esquecimento=0.5)
+
+    pesos = np.r_[np.full(len(antigo), 0.5), np.ones(len(novo))]
+    todos = pd.concat([antigo, novo])
+    coef, intercepto = np.polyfit(todos["X"], todos["Y"], 1, w=np.sqrt(pesos))
+    assert metricas["coeficiente"] == pytest.approx(coef, rel=1e-9)
+    assert metricas["intercepto"] == pytest.approx(intercepto, rel=1e-9)
+    assert metricas["n"] == pytest.approx(0.5 * len(antigo) + len(novo))
+
+
+def test_atualizar_exige_treino_e_dados_validos():
+    modelo = LogLogRegressionModel(_df(50, 4), "X", "Y")
+    with pytest.raises(ValueError, match="treinar"):
+        modelo.atualizar(_df(10, 5))
+
+    modelo.treinar()
+    with pytest.raises(ValueError, match="positivos"):
+        modelo.atualizar(pd.DataFrame({"X": [1.0, -1.0], "Y": [1.0, 1.0]}))
+    with pytest.raises(ValueError, match="esquecimento"):
+        modelo.atualizar(_df(10, 5), esquecimento=0)
+
+
+def test_theilsen_robusto_a_outliers():
+    df = _df(200, 6)
+    df.loc[:9, "Y"] = 1e6
+
+    metricas = TheilSenRegressionModel(df, "X", "Y", loglog=True).treinar()
+
+    assert metricas["coeficiente"] == pytest.approx(1.2, abs=0.05)
+    assert metricas["loglog"] is True
+
+
+def test_cli_atualizar_com_csv_e_sqlite(tmp_path):
+    antigo, novo_csv, novo_sql = _df(300, 7), _df(100, 8), _df(50, 9)
+    modelo = RegressionModel(antigo, "X", "Y")
+    modelo.treinar()
+    artefato = str(tmp_path / "modelo.json")
+    modelo.salvar(artefato)
+
+    csv = str(tmp_path / "novos.csv")
+    novo_csv.to_csv(csv, index=False)
+    banco = str(tmp_path / "novos.sqlite")
+    with sqlite3.connect(banco) as conexao:
+        novo_sql.assign(dia=1).to_sql("pedidos", conexao, index=False)
+        novo_sql.assign(dia=0).to_sql("pedidos", conexao, index=False, if_exists="append")
+
+    comandos = [
+        [csv, "--chunk", "17"],
+        [banco, "--consulta", "SELECT X, Y FROM pedidos WHERE dia = 1"]
+    ]
+    for argumentos in comandos:
+        subprocess.run(
+            [sys.executable, os.path.join(BASE_DIR, "atualizar.py"), artefato, *argumentos],
+            capture_output=True, text=True, check=True, cwd=BASE_DIR
+        )
+
+    final = _ModeloSerializavel.carregar(artefato).metricas
+    completo = RegressionModel(pd.concat([antigo, novo_csv, novo_sql]), "X", "Y").treinar()
+    assert final == pytest.approx(completo, rel=1e-9)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.ols import ajustar, ajustar_loglog
+
+
+def test_ajustar_igual_scipy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(10, 3, 500)
+    y = 1.5 - 0.7 * x + rng.normal(0, 1, 500)
+    y[::9] = np.nan
+
+    ajuste = ajustar(x, y)
+
+    validos = ~np.isnan(y)
+    referencia = stats.linregress(x[validos], y[validos])
+    residuos = y[validos] - (referencia.intercept + referencia.slope * x[validos])
+
+    assert ajuste["n"] == validos.sum()
+    assert ajuste["coeficiente"] == pytest.approx(referencia.slope, rel=1e-12)
+    assert ajuste["intercepto"] == pytest.approx(referencia.intercept, rel=1e-12)
+    assert ajuste["r2"] == pytest.approx(referencia.rvalue ** 2, rel=1e-12)
+    assert ajuste["erro_padrao_coeficiente"] == pytest.approx(referencia.stderr, rel=1e-10)
+    assert ajuste["erro_padrao_intercepto"] == pytest.approx(referencia.intercept_stderr, rel=1e-10)
+    assert ajuste["soma_quadrados_residuos"] == pytest.approx(residuos @ residuos, rel=1e-10)
+
+
+def test_ajustar_loglog_usa_pares_positivos():
+    x = np.array([1.0, 10.0, 100.0, -5.0, 0.0, 1000.0])
+    y = np.array([2.0, 20.0, 200.0, 3.0, 1.0, 2000.0])
+
+    ajuste = ajustar_loglog(x, y)
+
+    assert ajuste["n"] == 4
+    assert ajuste["coeficiente"] == pytest.approx(1.0)
+    assert ajuste["intercepto"] == pytest.approx(np.log10(2))
+    assert ajuste["r2"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("x", [[], [1.0], [2.0, 2.0, 2.0]])
+def test_dados_insuficientes(x):
+    with pytest.raises(ValueError, match="Dados insuficientes"):
+        ajustar(x, np.arange(len(x), dtype=float))
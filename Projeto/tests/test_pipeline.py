@@ -0,0 +1,90 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import executar_analise
+
+MODELOS = ("linear", "loglog", "theilsen", "grupos")
+
+
+def _dados(n=301, semente=0, positivos=False):
+    rng = np.random.default_rng(semente)
+    x = rng.lognormal(2, 1, n).round(3)
+    y = (2.5 * x + rng.normal(0, 3, n)).round(3)
+    if positivos:
+        y = np.abs(y) + 0.5
+    else:
+        x[::17] = 0
+        y[::13] = -1
+    df = pd.DataFrame({
+        "X": x.astype(object),
+        "Y": y.astype(object),
+        "Owner": rng.choice(["A", " B", "C "], n).astype(object)
+    })
+    df.loc[::11, "X"] = "N/A"
+    df.loc[::19, "Y"] = None
+    return df
+
+
+def _fontes(tmp_path, df):
+    csv = str(tmp_path / "dados.csv")
+    df.to_csv(csv, index=False)
+
+    banco = str(tmp_path / "dados.sqlite")
+    with sqlite3.connect(banco) as conexao:
+        df.astype(str).replace({"None": None}).to_sql("pedidos", conexao, index=False)
+    return csv, banco
+
+
+def _comparar(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for chave in a:
+            _comparar(a[chave], b[chave])
+    elif isinstance(a, list):
+        assert len(a) == len(b)
+        for i, j in zip(a, b):
+            _comparar(i, j)
+    elif isinstance(a, float):
+        assert a == pytest.approx(b, rel=1e-9, abs=1e-12, nan_ok=True)
+    else:
+        assert a == b
+
+
+@pytest.mark.parametrize("positivos", [False, True])
+@pytest.mark.parametrize("owner", [None, "B"])
+def test_sql_no_banco_igual_a_memoria(tmp_path, owner, positivos):
+    csv, banco = _fontes(tmp_path, _dados(positivos=positivos))
+
+    memoria = executar_analise(csv, "X", "Y", owner=owner, modelos=MODELOS)
+    sql = executar_analise(banco, "X", "Y", owner=owner, modelos=MODELOS)
+
+    assert "erro" not in sql
+    for chave in ("arquivo", "owner"):
+        memoria.pop(chave), sql.pop(chave)
+    _comparar(memoria, sql)
+
+
+def test_sql_owner_inexistente(tmp_path):
+    _, banco = _fontes(tmp_path, _dados())
+
+    resultado = executar_analise(banco, "X", "Y", owner="Z", modelos=MODELOS)
+
+    assert resultado["erro"] == "Nenhum registro para o Owner 'Z'."
+
+
+@pytest.mark.parametrize("owner", [None, "B"])
+def test_column_store_igual_a_memoria(tmp_path, owner):
+    csv, _ = _fontes(tmp_path, _dados(positivos=True))
+    pasta = str(tmp_path / "colunas")
+
+    memoria = executar_analise(csv, "X", "Y", owner=owner, modelos=MODELOS)
+    store = executar_analise(csv, "X", "Y", owner=owner, modelos=MODELOS, pasta_column_store=pasta)
+    reaberto = executar_analise(csv, "X", "Y", owner=owner, modelos=MODELOS, pasta_column_store=pasta)
+
+    assert "erro" not in store and len(os.listdir(pasta)) == 1
+    _comparar(memoria, store)
+    _comparar(store, reaberto)
@@ -0,0 +1,73 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.profiling import Perfil, salvar_perfil
+
+
+def test_etapas_aninhadas_com_memoria_e_linhas():
+    perfil = Perfil(rotulo="arquivo.csv")
+
+    with perfil.etapa("externa", linhas_entrada=10) as externa:
+        with perfil.etapa("interna"):
+            bloco = np.ones(2_000_000)  # 16 MB
+            del bloco
+        externa.linhas_saida = 4
+
+    interna, externa = perfil.registros
+    assert (interna["etapa"], interna["profundidade"]) == ("interna", 1)
+    assert (externa["linhas_entrada"], externa["linhas_saida"], externa["profundidade"]) == (10, 4, 0)
+    assert interna["pico_mb"] >= 15 and externa["pico_mb"] >= interna["pico_mb"]
+    assert externa["rotulo"] == "arquivo.csv"
+    assert not tracemalloc.is_tracing()  # desligado ao fim da etapa externa
+
+
+def test_so_um_perfil_mede_memoria_por_vez():
+    # Sessões concorrentes (threads do Streamlit) dividem o tracemalloc
+    dono, outro = Perfil(), Perfil()
+
+    with dono.etapa("dono"):
+        with outro.etapa("concorrente"):
+            bloco = np.ones(1_000_000)
+            del bloco
+
+    with outro.etapa("depois"):
+        pass
+
+    assert dono.registros[0]["pico_mb"] >= 7
+    assert outro.registros[0]["pico_mb"] is None
+    assert outro.registros[1]["pico_mb"] is not None
+    assert not tracemalloc.is_tracing()
+
+
+def test_erro_registrado_e_perfil_inativo():
+    perfil = Perfil()
+    with pytest.raises(ValueError):
+        with perfil.etapa("falha"):
+            raise ValueError("sem dados")
+    assert perfil.registros[0]["erro"] == "ValueError: sem dados"
+
+    inativo = Perfil(ativo=False)
+    with inativo.etapa("nada") as etapa:
+        etapa.linhas_saida = 1
+    assert not inativo and inativo.registros == []
+
+
+@pytest.mark.parametrize("formato", ["chrome", "json"])
+def test_salvar_perfil(tmp_path, formato):
+    perfil = Perfil(memoria=False)
+    with perfil.etapa("carregar", linhas_saida=3):
+        pass
+
+    destino = str(tmp_path / "perfil.json")
+    salvar_perfil(perfil.registros, destino, formato)
+
+    with open(destino, encoding="utf-8") as f:
+        conteudo = json.load(f)
+    if formato == "json":
+        assert conteudo["etapas"][0]["linhas_saida"] == 3
+    else:
+        evento = conteudo["traceEvents"][0]
+        assert (evento["name"], evento["ph"], evento["args"]["linhas_saida"]) == ("carregar", "X", 3)
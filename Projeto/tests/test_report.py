@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.report import gerar_relatorios, relatorio_arquivo
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.lognormal(size=300)
+    destino = str(tmp_path / "vendas.csv")
+    pd.DataFrame({"X": x, "Y": 2 * x + rng.lognormal(size=300), "Owner": ["a", "b", "c"] * 100}).to_csv(
+        destino, index=False
+    )
+    return destino
+
+
+def test_relatorio_pdf_e_xlsx(tmp_path, caminho):
+    pasta = str(tmp_path / "relatorios")
+
+    resultado = relatorio_arquivo(caminho, "X", "Y", pasta, formatos=("pdf", "xlsx"), owner="b")
+
+    assert "erro" not in resultado
+    pdf, xlsx = resultado["relatorios"]["pdf"], resultado["relatorios"]["xlsx"]
+    assert os.path.basename(pdf) == "vendas_X_Y_b.pdf"
+    with open(pdf, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+    assert resultado["registros"] == 100
+    assert os.path.isfile(resultado["grafico"])
+    assert len(pd.read_excel(xlsx, sheet_name=None)) >= 1
+
+
+def test_erros(tmp_path, caminho):
+    with pytest.raises(ValueError, match="Formatos"):
+        relatorio_arquivo(caminho, "X", "Y", str(tmp_path), formatos=("docx",))
+
+    resultados = gerar_relatorios([caminho, str(tmp_path / "faltando.csv")], "X", "Y", str(tmp_path), processos=1,
+                                  formatos=("xlsx",))
+    assert "erro" not in resultados[0] and "erro" in resultados[1]
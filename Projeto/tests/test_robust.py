@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src import robust
+
+
+def _mediana_bruta(x, y):
+    i, j = np.triu_indices(len(x), 1)
+    dx = x[j] - x[i]
+    validos = dx != 0
+    inclinacoes = np.sort((y[j][validos] - y[i][validos]) / dx[validos])
+    p = len(inclinacoes)
+    return (inclinacoes[(p - 1) // 2] + inclinacoes[p // 2]) / 2
+
+
+@pytest.fixture(params=["direto", "amostrado"])
+def modo(request, monkeypatch):
+    # "amostrado" força a seleção por amostragem em vez da enumeração direta
+    if request.param == "amostrado":
+        monkeypatch.setattr(robust, "LIMITE_PARES", 10)
+    return request.param
+
+
+def _conferir(x, y, amostra=None):
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    valor, info = robust.inclinacao_mediana(x, y, amostra=amostra)
+    assert valor == _mediana_bruta(x, y)
+    assert info["rodadas"] < 50
+    return info
+
+
+def test_muitos_empates(modo):
+    rng = np.random.default_rng(0)
+    _conferir(rng.integers(0, 10, 300), rng.integers(0, 5, 300), amostra=50)
+
+
+def test_pontos_e_x_repetidos(modo):
+    x = np.repeat([1.0, 2.0, 3.0, 5.0], 40)
+    y = np.tile([0.0, 1.0, 1.0, 7.0], 40)
+    info = _conferir(x, y, amostra=20)
+    # Só contam os pares de x diferentes: 6 combinações de grupos
+    assert info["pares"] == 6 * 40 * 40
+
+
+def test_dois_pontos(modo):
+    info = _conferir([1.0, 3.0], [5.0, 1.0])
+    assert info["pares"] == 1
+
+
+def test_inclinacoes_negativas(modo):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=500)
+    info = _conferir(x, -3 * x + rng.standard_cauchy(500), amostra=100)
+    assert info["n"] == 500
+
+
+def test_descarta_nao_finitos_e_exige_dois_x():
+    valor, info = robust.inclinacao_mediana([1.0, 2.0, np.nan, 3.0, 4.0], [2.0, 4.0, 1.0, np.inf, 8.0])
+    assert (valor, info["n"]) == (2.0, 3)
+
+    with pytest.raises(ValueError, match="Inclinação indefinida"):
+        robust.inclinacao_mediana([2.0] * 10, np.arange(10.0))
+    with pytest.raises(ValueError, match="mesmo tamanho"):
+        robust.inclinacao_mediana([1.0, 2.0], [1.0])
+
+
+def test_fuzz_amostrado(monkeypatch):
+    monkeypatch.setattr(robust, "LIMITE_PARES", 100)
+    rng = np.random.default_rng(2024)
+
+    for _ in range(40):
+        n = int(rng.integers(2, 400))
+        niveis = int(rng.integers(2, 30))
+        x = rng.integers(0, niveis, n).astype(float)
+        y = rng.integers(-niveis, niveis, n).astype(float)
+        if len(np.unique(x)) < 2:
+            continue
+        _conferir(x, y, amostra=int(rng.choice([7, 50, 200])))
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.models import RegressionModel
+from src.scoring import COLUNA_PREVISAO, prever_arquivo
+
+
+def test_prever_arquivo_em_blocos(tmp_path):
+    entrada = str(tmp_path / "entrada.csv")
+    saida = str(tmp_path / "saida" / "previsoes.csv")
+    pd.DataFrame({
+        "Id": [f"p{i}" for i in range(250)],
+        "X": [str(i) if i % 10 else "NA" for i in range(250)],
+        "Outra": np.zeros(250)
+    }).to_csv(entrada, index=False)
+
+    modelo = RegressionModel(None, "X", "Y")
+    modelo.metricas = {"coeficiente": 2.0, "intercepto": 1.0, "r2": 1.0}
+
+    relatorio = prever_arquivo(modelo, entrada, saida, manter=["Id"], tamanho_chunk=100)
+
+    resultado = pd.read_csv(saida)
+    assert list(resultado.columns) == ["Id", "X", COLUNA_PREVISAO]
+    assert relatorio["chunks"] == 3
+    assert relatorio["linhas"] == 250 and relatorio["invalidas"] == 25
+    np.testing.assert_allclose(resultado[COLUNA_PREVISAO], 2 * resultado["X"] + 1)
+    assert resultado["Id"].tolist() == [f"p{i}" for i in range(250)]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ols import ajustar, ajustar_loglog
+from src.screening import matriz_pearson, triagem_pares
+
+
+def _dados(n=300, semente=0):
+    rng = np.random.default_rng(semente)
+    a = rng.lognormal(0, 1, n)
+    df = pd.DataFrame({
+        "A": a,
+        "B": 2 * a ** 1.5 + rng.normal(0, 0.1, n),
+        "C": rng.normal(size=n),
+        "Texto": ["x"] * n
+    })
+    df.loc[::7, "A"] = np.nan
+    df.loc[::11, "C"] = np.nan
+    df["B"] = df["B"].astype(object)
+    df.loc[::13, "B"] = "N/A"
+    return df
+
+
+def test_pares_iguais_ao_ajuste_com_dropna_pareado():
+    df = _dados()
+
+    triagem = triagem_pares(df).set_index(["coluna_x", "coluna_y"])
+
+    assert len(triagem) == 6  # "Texto" é descartada
+    numerico = df[["A", "B", "C"]].apply(pd.to_numeric, errors="coerce")
+    for (cx, cy), linha in triagem.iterrows():
+        pares = numerico[[cx, cy]].dropna()
+        ajuste = ajustar(pares[cx], pares[cy])
+        assert linha["n"] == len(pares)
+        assert linha["coeficiente"] == pytest.approx(ajuste["coeficiente"], rel=1e-9)
+        assert linha["r2"] == pytest.approx(ajuste["r2"], rel=1e-9)
+        assert linha["pearson"] == pytest.approx(pares[cx].corr(pares[cy]), rel=1e-9)
+        if cy != "C" and cx != "C":
+            assert linha["coeficiente_loglog"] == pytest.approx(
+                ajustar_loglog(pares[cx], pares[cy])["coeficiente"], rel=1e-9
+            )
+
+    assert triagem.index[0] in {("A", "B"), ("B", "A")}
+
+
+def test_matriz_pearson_igual_corr_do_pandas():
+    df = _dados()
+    numerico = df[["A", "B", "C"]].apply(pd.to_numeric, errors="coerce")
+
+    pd.testing.assert_frame_equal(matriz_pearson(df), numerico.corr(), rtol=1e-9)
+
+
+def test_ordenacao_invalida():
+    with pytest.raises(ValueError, match="ordenação"):
+        triagem_pares(_dados(), ordenar_por="nada")
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from src.models import LogLogRegressionModel
+from src.server import ServidorPrevisao
+
+
+def _modelo(coeficiente=0.8, r2=0.9):
+    modelo = LogLogRegressionModel(None, "X", "Y")
+    modelo.metricas = {"coeficiente": coeficiente, "intercepto": 0.4, "r2": r2}
+    return modelo
+
+
+async def _enviar(porta, cabecalhos, corpo=b"", linha="POST /prever/m HTTP/1.1"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    writer.write(f"{linha}\r\nHost: teste\r\n{cabecalhos}\r\n".encode("latin-1") + corpo)
+    await writer.drain()
+    resposta = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+
+    cabeca, _, dados = resposta.partition(b"\r\n\r\n")
+    return int(cabeca.split()[1]), json.loads(dados)
+
+
+async def _requisicoes(pedidos, modelo=None):
+    servidor = ServidorPrevisao({"m": modelo or _modelo()}, corpo_maximo=1024)
+    porta = await servidor.iniciar(porta=0)
+    try:
+        return [await _enviar(porta, *pedido) for pedido in pedidos]
+    finally:
+        await servidor.fechar()
+
+
+@pytest.mark.parametrize("cabecalhos, corpo, status", [
+    ("Content-Length: abc\r\n", b"", 400),
+    ("Content-Length: -5\r\n", b"", 400),
+    ("Content-Length: 4096\r\n", b"{}", 413),
+    ("Content-Length: 10\r\nConnection: close\r\n", b'{"x": 2.0}', 200),
+])
+def test_content_length(cabecalhos, corpo, status):
+    (recebido, resposta), = asyncio.run(_requisicoes([(cabecalhos, corpo)]))
+
+    assert recebido == status
+    assert ("erro" in resposta) == (status != 200)
+
+
+def test_linha_de_requisicao_malformada():
+    (status, resposta), = asyncio.run(_requisicoes([("", b"", "POST /prever/m")]))
+
+    assert status == 400
+    assert resposta == {"erro": "Linha de requisição inválida."}
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")
+def test_valores_nao_finitos_viram_null():
+    corpo = b'{"x": [1e300, -1.0, 1.0]}'
+    modelo = _modelo(coeficiente=2.0, r2=float("nan"))
+    (status, previsao), (_, modelos) = asyncio.run(_requisicoes([
+        (f"Content-Length: {len(corpo)}\r\nConnection: close\r\n", corpo),
+        ("Connection: close\r\n", b"", "GET /modelos HTTP/1.1")
+    ], modelo))
+
+    assert status == 200
+    assert previsao["previsao"][:2] == [None, None] and previsao["previsao"][2] > 0
+    assert modelos["m"]["r2"] is None
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.accumulator import StatsAccumulator
+from src.session import SessaoAnalise
+
+
+def test_de_dataframe_sem_copia_e_somente_leitura():
+    df = pd.DataFrame({"X": np.arange(1.0, 11.0), "Y": np.arange(11.0, 21.0), "Owner": list("ab" * 5)})
+
+    sessao = SessaoAnalise.de_dataframe(df, "X", "Y")
+
+    assert np.shares_memory(sessao.x, df["X"].to_numpy())
+    assert not sessao.x.flags.writeable
+    with pytest.raises(ValueError):
+        sessao.x[0] = 99
+
+
+def test_descarta_pares_com_nan_alinhando_owner():
+    x = np.array([1.0, np.nan, 3.0, 4.0, -2.0])
+    y = np.array([2.0, 5.0, np.nan, 8.0, 4.0])
+
+    sessao = SessaoAnalise(x, y, "X", "Y", owner=np.array(["a", "b", "c", "d", "e"]))
+
+    np.testing.assert_array_equal(sessao.x, [1.0, 4.0, -2.0])
+    np.testing.assert_array_equal(sessao.owner, ["a", "d", "e"])
+    np.testing.assert_array_equal(sessao.log_x, np.log10([1.0, 4.0]))
+    np.testing.assert_array_equal(sessao.k, [2.0, 2.0, -2.0])
+
+
+def test_acumulador_em_blocos_igual_passada_unica():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=1001), rng.normal(size=1001)
+
+    sessao = SessaoAnalise(x, y, "X", "Y", tamanho_bloco=100)
+
+    unico = StatsAccumulator.de_arrays(x, y)
+    assert sessao.acumulador.n == unico.n
+    assert sessao.acumulador.pearson() == pytest.approx(unico.pearson(), rel=1e-12)
+    assert sessao.acumulador.regressao_loglog() == pytest.approx(unico.regressao_loglog(), rel=1e-10)
+    assert sessao.coluna("X") is sessao.x
+    with pytest.raises(ValueError):
+        sessao.coluna("Z")
+
+
+def test_analyzer_valida_colunas_de_sessao_vazia():
+    from src.analyzer import UEVAnalyzer
+
+    vazia = SessaoAnalise(np.empty(0), np.empty(0), "X", "Y")
+
+    assert UEVAnalyzer(vazia, "X", "Y").sessao is vazia
+    with pytest.raises(ValueError, match="A coluna 'Z' não existe"):
+        UEVAnalyzer(vazia, "X", "Z")
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.sketch import QuantileSketch
+
+
+def test_quantis_exatos_abaixo_do_limite():
+    valores = np.random.default_rng(0).normal(size=999)
+    sketch = QuantileSketch(limite_exato=1000)
+    sketch.atualizar(valores)
+
+    assert sketch.exato
+    for q in (0, 0.1, 0.5, 0.9, 1):
+        assert sketch.quantil(q) == pytest.approx(np.quantile(valores, q), abs=0)
+
+
+@pytest.mark.parametrize("erro", [0.01, 0.05])
+def test_erro_relativo_dentro_do_limite(erro):
+    rng = np.random.default_rng(1)
+    valores = np.concatenate([rng.lognormal(0, 2, 20_000), -rng.lognormal(0, 1, 5_000), np.zeros(100)])
+    sketch = QuantileSketch(erro_relativo=erro, limite_exato=0)
+    for bloco in np.array_split(valores, 7):
+        sketch.atualizar(bloco)
+
+    assert not sketch.exato
+    ordenados = np.sort(valores)
+    for q in np.linspace(0, 1, 41):
+        estimado = sketch.quantil(q)
+        # O valor de alguma posição vizinha ao quantil está a menos de ``erro`` relativo
+        posicao = q * (len(ordenados) - 1)
+        vizinhos = ordenados[int(np.floor(posicao)):int(np.ceil(posicao)) + 1]
+        assert min(abs(estimado - v) - erro * abs(v) for v in vizinhos) <= 1e-12
+
+
+def test_combinar_igual_insercao_unica():
+    valores = np.random.default_rng(2).exponential(size=30_000)
+    unico = QuantileSketch(limite_exato=1000)
+    unico.atualizar(valores)
+
+    partes = [QuantileSketch(limite_exato=1000) for _ in range(3)]
+    for parte, bloco in zip(partes, np.array_split(valores, 3)):
+        parte.atualizar(bloco)
+    partes[0].combinar(partes[1])
+    partes[0].combinar(partes[2])
+
+    assert partes[0].n == unico.n
+    assert partes[0].quantis([0.1, 0.5, 0.99]) == unico.quantis([0.1, 0.5, 0.99])
@@ -0,0 +1,92 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.accumulator import StatsAccumulator
+from src.data_loader import DataLoader
+from src.sql_source import FonteSQL
+
+LINHAS = [
+    (1, 2.0, "A"), (2, " 4 ", " A"), ("N/A", 5, "B"), (3, None, "A"), (4, 8.5, "B"),
+    ("5", "9", "A "), (0, 1, "B"), (-2, -3.5, "A"), (" Not Specified", 1, "B"), (7, "abc", "A")
+]
+
+
+@pytest.fixture
+def banco(tmp_path):
+    caminho = str(tmp_path / "dados.sqlite")
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute('CREATE TABLE pedidos ("X", "Y", "Owner", "Extra")')
+        conexao.executemany("INSERT INTO pedidos VALUES (?, ?, ?, 'e')", LINHAS)
+        conexao.execute("CREATE TABLE outra (a)")
+    return caminho
+
+
+def _memoria(owner=None):
+    x = DataLoader.para_numerico(pd.Series([l[0] for l in LINHAS], dtype=object))
+    y = DataLoader.para_numerico(pd.Series([l[1] for l in LINHAS], dtype=object))
+    if owner is not None:
+        filtro = np.array([str(l[2]).strip() == owner for l in LINHAS])
+        x, y = x[filtro], y[filtro]
+    validos = ~(np.isnan(x) | np.isnan(y))
+    return x[validos], y[validos]
+
+
+@pytest.mark.parametrize("owner", [None, "A", "B"])
+def test_agregados_e_medianas_no_banco_iguais_a_memoria(banco, owner):
+    fonte = FonteSQL(banco, tabela="pedidos")
+    x, y = _memoria(owner)
+
+    acumulador, leitura = fonte.acumulador("X", "Y", owner=owner)
+    referencia = StatsAccumulator.de_arrays(x, y)
+
+    assert acumulador.n == len(x) and leitura["linhas_lidas"] - leitura["linhas_descartadas"] == len(x)
+    for coluna in ("x", "y", "k"):
+        esperado = referencia.resumo(coluna)
+        obtido = acumulador.resumo(coluna)
+        for chave in ("quantidade", "minimo", "maximo", "media"):
+            assert obtido[chave] == pytest.approx(esperado[chave], rel=1e-12)
+    assert acumulador.regressao_linear() == pytest.approx(referencia.regressao_linear(), rel=1e-9, nan_ok=True)
+    loglog = referencia.resultados()["regressao_loglog"]
+    assert acumulador.resultados()["regressao_loglog"] == (
+        None if loglog is None else pytest.approx(loglog, rel=1e-9, nan_ok=True)
+    )
+
+    medianas = fonte.medianas("X", "Y", owner=owner)
+    k = y[x != 0] / x[x != 0]
+    assert medianas == pytest.approx({"x": np.median(x), "y": np.median(y), "k": np.median(k)}, rel=1e-12)
+
+
+def test_lotes_so_com_as_colunas_e_owner_pedidos(banco):
+    fonte = FonteSQL(banco, tabela="pedidos")
+
+    lotes = list(fonte.lotes(["X", "Owner", "Inexistente"], tamanho_lote=2, owner="A"))
+
+    assert [len(l) for l in lotes] == [2, 2, 2]
+    assert list(lotes[0].columns) == ["X", "Owner"]
+    assert fonte.ler(limite=3)["Extra"].tolist() == ["e"] * 3
+
+
+def test_tabela_obrigatoria_e_colunas_ausentes(banco):
+    with pytest.raises(ValueError, match="2 tabelas"):
+        FonteSQL(banco).colunas()
+    with pytest.raises(ValueError, match="Coluna 'Z'"):
+        FonteSQL(banco, tabela="pedidos").acumulador("X", "Z")
+    with pytest.raises(ValueError, match="Owner"):
+        FonteSQL(banco, consulta="SELECT X, Y FROM pedidos").acumulador("X", "Y", owner="A")
+
+
+def test_consulta_e_script_sql(tmp_path):
+    script = tmp_path / "dados.sql"
+    script.write_text(
+        "CREATE TABLE t (X, Y);\n"
+        + "".join(f"INSERT INTO t VALUES ({i}, {2 * i});\n" for i in range(1, 11))
+    )
+
+    fonte = FonteSQL(str(script), consulta="SELECT * FROM t WHERE X > 5;")
+    acumulador, _ = fonte.acumulador("X", "Y")
+
+    assert acumulador.n == 5
+    assert acumulador.regressao_linear()["coeficiente"] == pytest.approx(2.0)